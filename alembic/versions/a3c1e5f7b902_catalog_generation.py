@@ -0,0 +1,34 @@
+"""Add catalog_generation table
+
+Revision ID: a3c1e5f7b902
+Revises: 35434a546307
+Create Date: 2026-10-19 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c1e5f7b902'
+down_revision: Union[str, Sequence[str], None] = '35434a546307'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    catalog_generation = op.create_table('catalog_generation',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('generation', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Fila única que los workers consultan para detectar cambios del catálogo
+    op.bulk_insert(catalog_generation, [{'id': 1, 'generation': 0}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('catalog_generation')
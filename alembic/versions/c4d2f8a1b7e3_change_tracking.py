@@ -0,0 +1,48 @@
+"""Add updated_at/version to curso and sedes, and catalogo_eliminacion tombstones
+
+Revision ID: c4d2f8a1b7e3
+Revises: a3c1e5f7b902
+Create Date: 2026-10-19 12:40:05.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2f8a1b7e3'
+down_revision: Union[str, Sequence[str], None] = 'a3c1e5f7b902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Las filas existentes quedan con version=0 (anteriores a cualquier generación)
+    for tabla in ('curso', 'sedes'):
+        op.add_column(tabla, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.add_column(tabla, sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+        op.create_index(op.f(f'ix_{tabla}_version'), tabla, ['version'], unique=False)
+
+    op.create_table('catalogo_eliminacion',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entidad', sa.String(), nullable=False),
+    sa.Column('entidad_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('eliminado_en', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_catalogo_eliminacion_version'), 'catalogo_eliminacion', ['version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_catalogo_eliminacion_version'), table_name='catalogo_eliminacion')
+    op.drop_table('catalogo_eliminacion')
+    for tabla in ('sedes', 'curso'):
+        op.drop_index(op.f(f'ix_{tabla}_version'), table_name=tabla)
+        with op.batch_alter_table(tabla) as batch_op:
+            batch_op.drop_column('version')
+            batch_op.drop_column('updated_at')
@@ -0,0 +1,91 @@
+"""Add curso_catalogo denormalized read model
+
+Revision ID: d7e5a2c9f104
+Revises: c4d2f8a1b7e3
+Create Date: 2026-10-19 15:05:42.613207
+
+"""
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e5a2c9f104'
+down_revision: Union[str, Sequence[str], None] = 'c4d2f8a1b7e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalizar(texto):
+    # Igual que saltoestudia.catalogo.normalizar_busqueda (la migración no importa la app)
+    return "".join(c for c in unicodedata.normalize("NFKD", (texto or "").casefold()) if not unicodedata.combining(c))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    curso_catalogo = op.create_table('curso_catalogo',
+    sa.Column('curso_id', sa.Integer(), nullable=False),
+    sa.Column('nombre', sa.String(), nullable=False),
+    sa.Column('nivel', sa.String(), nullable=True),
+    sa.Column('requisitos_ingreso', sa.String(), nullable=True),
+    sa.Column('duracion_numero', sa.String(), nullable=True),
+    sa.Column('duracion_unidad', sa.String(), nullable=True),
+    sa.Column('informacion', sa.String(), nullable=True),
+    sa.Column('institucion_id', sa.Integer(), nullable=True),
+    sa.Column('institucion_nombre', sa.String(), nullable=True),
+    sa.Column('institucion_logo', sa.String(), nullable=True),
+    sa.Column('ciudad_ids', sa.String(), nullable=False),
+    sa.Column('lugar', sa.String(), nullable=False),
+    sa.Column('texto_busqueda', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('curso_id')
+    )
+    op.create_index(op.f('ix_curso_catalogo_nivel'), 'curso_catalogo', ['nivel'], unique=False)
+    op.create_index(op.f('ix_curso_catalogo_institucion_id'), 'curso_catalogo', ['institucion_id'], unique=False)
+    op.create_index(op.f('ix_curso_catalogo_version'), 'curso_catalogo', ['version'], unique=False)
+
+    # Poblar desde los cursos existentes (después: scripts/rebuild_catalog.py)
+    conexion = op.get_bind()
+    ciudades_por_curso = {}
+    for curso_id, ciudad_id, ciudad in conexion.execute(sa.text(
+        "SELECT cc.curso_id, c.id, c.nombre FROM curso_ciudad cc "
+        "JOIN ciudad c ON cc.ciudad_id = c.id ORDER BY c.id"
+    )):
+        ciudades_por_curso.setdefault(curso_id, []).append((ciudad_id, ciudad))
+
+    filas = []
+    for row in conexion.execute(sa.text(
+        "SELECT cu.id, cu.nombre, cu.nivel, cu.requisitos_ingreso, cu.duracion_numero, "
+        "cu.duracion_unidad, cu.informacion, cu.institucion_id, i.nombre, i.logo, cu.version "
+        "FROM curso cu LEFT JOIN instituciones i ON cu.institucion_id = i.id ORDER BY cu.id"
+    )):
+        ciudades = ciudades_por_curso.get(row[0], [])
+        filas.append({
+            'curso_id': row[0],
+            'nombre': row[1],
+            'nivel': row[2],
+            'requisitos_ingreso': row[3],
+            'duracion_numero': row[4],
+            'duracion_unidad': row[5],
+            'informacion': row[6],
+            'institucion_id': row[7],
+            'institucion_nombre': row[8],
+            'institucion_logo': row[9],
+            'ciudad_ids': ',' + ''.join(f'{ciudad_id},' for ciudad_id, _ in ciudades),
+            'lugar': ', '.join(nombre for _, nombre in ciudades),
+            'texto_busqueda': _normalizar(f"{row[1]}\n{row[6] or ''}"),
+            'version': row[10],
+        })
+    if filas:
+        op.bulk_insert(curso_catalogo, filas)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_curso_catalogo_version'), table_name='curso_catalogo')
+    op.drop_index(op.f('ix_curso_catalogo_institucion_id'), table_name='curso_catalogo')
+    op.drop_index(op.f('ix_curso_catalogo_nivel'), table_name='curso_catalogo')
+    op.drop_table('curso_catalogo')
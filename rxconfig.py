@@ -12,6 +12,9 @@ config = rx.Config(
     api_url="http://localhost:8000",
     frontend_port=3000,  # Forzar puerto 3000 explícitamente
     backend_port=8000,   # Forzar puerto 8000 explícitamente
+    # Modo multi-worker: con REDIS_URL el estado de cada sesión vive en Redis
+    # y Reflex levanta varios workers de backend (ver DEPLOYMENT.md)
+    redis_url=os.getenv("REDIS_URL") or None,
     style=theme.STYLESHEET,
     head_components=[
         rx.script(src="/chakra_color_mode_provider.js"),
@@ -0,0 +1,237 @@
+# ================================================================================
+# ENDPOINTS HTTP ADICIONALES - SALTO ESTUDIA
+# ================================================================================
+#
+# Rutas HTTP que no pasan por el websocket de Reflex. La app Starlette de este
+# módulo se pasa a rx.App(api_transformer=...) y Reflex la monta delante de su
+# propio backend, así que comparte puerto (8000) con /_event.
+#
+# ENDPOINTS:
+# - GET /api/export/{entidad}.{formato}
+#     entidad: cursos | instituciones | sedes
+#     formato: csv | json | ndjson
+#     filtros (query string): nivel, requisito, institucion, lugar, q (cursos);
+#                             ciudad (sedes). Mismos valores que en /cursos.
+# - GET /api/autocompletar?q=enfer&k=8
+#     Sugerencias de nombres de cursos e instituciones por prefijo, desde el
+#     índice en memoria del catálogo (ver catalogo.py). No consulta la base.
+# - GET /api/metrics/estado, GET /api/debug/estado
+#     Métricas de tamaño de estado y delta por handler (ver instrumentacion.py).
+#     Responden 404 si INSTRUMENTAR_ESTADO no está activo.
+# - GET /api/metrics/eventos, GET /api/debug/eventos
+#     Histograma de latencia por handler y últimos eventos lentos (ver
+#     perfilado.py). Responden 404 si MEDIR_EVENTOS no está activo.
+# - GET /api/debug/queries
+#     Queries más lentas que QUERY_LENTA_MS con su plan de ejecución (ver
+#     queries_lentas.py). Responde 404 si REGISTRAR_QUERIES_LENTAS no está activo.
+# - GET /api/metrics/cache
+#     Aciertos y fallos del cache del directorio de sedes (ver cache.py).
+# - GET /health/live, GET /health/ready
+#     Proceso vivo (siempre 200) / worker con caches precargados y base
+#     accesible (503 si no). Ambos informan la latencia de la base (ver
+#     salud.py). /health/ready es el healthcheck del proxy.
+#
+# ENDPOINTS DE DIAGNÓSTICO:
+# /api/metrics/* y /api/debug/* exponen nombres de vars, SQL, planes y otros
+# detalles internos, así que no son públicos: sin DIAGNOSTICO_TOKEN responden
+# 404 y con la variable hay que mandar "Authorization: Bearer <token>" (o
+# ?token=<token>); un token incorrecto recibe 401. Además el router público de
+# Traefik no los enruta (docker-compose*.yml): se consultan desde la red interna.
+#
+# La respuesta se genera en streaming (StreamingResponse sobre los generadores
+# de exportacion.py), sin armar el catálogo completo en memoria.
+#
+# UTILIZADO EN:
+# - saltoestudia.py: rx.App(api_transformer=api)
+# ================================================================================
+
+import asyncio
+import functools
+import hmac
+import os
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from .database import AUTOCOMPLETADO_SUGERENCIAS, cache_directorio, obtener_sugerencias
+from .exportacion import FORMATOS_EXPORTACION, exportar
+from .instrumentacion import INSTRUMENTAR_ESTADO, metricas_estado
+from .perfilado import MEDIR_EVENTOS, tiempos_eventos
+from .queries_lentas import REGISTRAR_QUERIES_LENTAS, queries_lentas
+from .salud import estado_listo, latencia_base
+
+# Token para los endpoints de diagnóstico (vacío: esos endpoints no existen)
+DIAGNOSTICO_TOKEN = os.getenv("DIAGNOSTICO_TOKEN", "").strip()
+
+def requiere_token_diagnostico(handler):
+    """
+    Decorador para endpoints de diagnóstico: solo responden con DIAGNOSTICO_TOKEN.
+
+    Args:
+        handler: Endpoint async de Starlette a proteger
+
+    Returns:
+        Endpoint que responde 404 sin token configurado y 401 si el token
+        recibido no coincide
+
+    Utilizado en:
+        - api.py: endpoints /api/metrics/* y /api/debug/*
+    """
+    @functools.wraps(handler)
+    async def protegido(request: Request):
+        if not DIAGNOSTICO_TOKEN:
+            return JSONResponse({"error": "No encontrado"}, status_code=404)
+        autorizacion = request.headers.get("authorization", "")
+        recibido = autorizacion[7:].strip() if autorizacion.lower().startswith("bearer ") else ""
+        recibido = recibido or request.query_params.get("token", "")
+        if not hmac.compare_digest(recibido.encode(), DIAGNOSTICO_TOKEN.encode()):
+            return JSONResponse(
+                {"error": "Token de diagnóstico inválido"},
+                status_code=401,
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return await handler(request)
+    return protegido
+
+async def exportar_catalogo(request: Request):
+    """
+    Descarga una entidad del catálogo en CSV, JSON o NDJSON.
+
+    Ejemplo: /api/export/cursos.csv?nivel=Terciario&lugar=Salto&q=enfermeria
+    """
+    entidad = request.path_params["entidad"]
+    formato = request.path_params["formato"]
+    parametros = request.query_params
+    filtros = {
+        "nivel": parametros.get("nivel", ""),
+        "requisito": parametros.get("requisito", ""),
+        "institucion": parametros.get("institucion", ""),
+        "lugar": parametros.get("lugar", ""),
+        "busqueda": parametros.get("q", parametros.get("busqueda", "")),
+        "ciudad": parametros.get("ciudad", ""),
+    }
+    try:
+        contenido = exportar(entidad, formato, filtros)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=404)
+
+    print(f"[LOG] Exportando {entidad} en {formato} (filtros: { {k: v for k, v in filtros.items() if v} })")
+    return StreamingResponse(
+        contenido,
+        media_type=FORMATOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="saltoestudia-{entidad}.{formato}"'},
+    )
+
+async def autocompletar(request: Request):
+    """
+    Sugerencias para el buscador: nombres de cursos e instituciones que
+    empiezan con las palabras escritas.
+
+    Ejemplo: /api/autocompletar?q=tec%20adm&k=5
+    Respuesta: [{"texto": "Técnico en Administración", "tipo": "curso"}, ...]
+    """
+    texto = request.query_params.get("q", "")
+    try:
+        k = int(request.query_params.get("k", str(AUTOCOMPLETADO_SUGERENCIAS)))
+    except ValueError:
+        k = AUTOCOMPLETADO_SUGERENCIAS
+    k = max(1, min(k, 50))
+    # En un thread: si cambió la generación del catálogo, se reconstruye (con la base)
+    sugerencias = await asyncio.to_thread(obtener_sugerencias, texto, k)
+    return JSONResponse([{"texto": s.texto, "tipo": s.tipo} for s in sugerencias])
+
+@requiere_token_diagnostico
+async def metricas_instrumentacion(request: Request):
+    """Métricas de estado y delta por handler en formato Prometheus."""
+    if not INSTRUMENTAR_ESTADO:
+        return JSONResponse({"error": "Instrumentación desactivada (INSTRUMENTAR_ESTADO=true)"}, status_code=404)
+    return PlainTextResponse(metricas_estado.prometheus(), media_type="text/plain; version=0.0.4")
+
+@requiere_token_diagnostico
+async def reporte_instrumentacion(request: Request):
+    """
+    Reporte de depuración: handlers que más bytes mandan y sesión más pesada.
+
+    Ejemplo: /api/debug/estado?top=20
+    """
+    if not INSTRUMENTAR_ESTADO:
+        return JSONResponse({"error": "Instrumentación desactivada (INSTRUMENTAR_ESTADO=true)"}, status_code=404)
+    try:
+        top = int(request.query_params.get("top", "10"))
+    except ValueError:
+        top = 10
+    return JSONResponse(metricas_estado.reporte(top=top))
+
+@requiere_token_diagnostico
+async def metricas_eventos(request: Request):
+    """Histograma de duración de eventos por handler en formato Prometheus."""
+    if not MEDIR_EVENTOS:
+        return JSONResponse({"error": "Medición de eventos desactivada (MEDIR_EVENTOS=true)"}, status_code=404)
+    return PlainTextResponse(tiempos_eventos.prometheus(), media_type="text/plain; version=0.0.4")
+
+@requiere_token_diagnostico
+async def reporte_eventos(request: Request):
+    """
+    Reporte de depuración: handlers con mayor p95 y últimos eventos lentos.
+
+    Ejemplo: /api/debug/eventos?top=20
+    """
+    if not MEDIR_EVENTOS:
+        return JSONResponse({"error": "Medición de eventos desactivada (MEDIR_EVENTOS=true)"}, status_code=404)
+    try:
+        top = int(request.query_params.get("top", "10"))
+    except ValueError:
+        top = 10
+    return JSONResponse(tiempos_eventos.reporte(top=top))
+
+@requiere_token_diagnostico
+async def reporte_queries_lentas(request: Request):
+    """
+    Reporte de depuración: queries lentas por tiempo total, con su plan.
+
+    Ejemplo: /api/debug/queries?top=20
+    """
+    if not REGISTRAR_QUERIES_LENTAS:
+        return JSONResponse({"error": "Registro de queries lentas desactivado (REGISTRAR_QUERIES_LENTAS=true)"}, status_code=404)
+    try:
+        top = int(request.query_params.get("top", "20"))
+    except ValueError:
+        top = 20
+    return JSONResponse(queries_lentas.reporte(top=top))
+
+@requiere_token_diagnostico
+async def metricas_cache(request: Request):
+    """Aciertos, fallos e invalidaciones del cache del directorio en formato Prometheus."""
+    return PlainTextResponse(cache_directorio.prometheus("saltoestudia_cache_directorio"), media_type="text/plain; version=0.0.4")
+
+async def salud_vivo(request: Request):
+    """
+    Liveness: 200 mientras el proceso responda, aunque la base no esté
+    accesible (reiniciar el worker no lo arregla). Informa la latencia.
+    """
+    base = await asyncio.to_thread(latencia_base)
+    return JSONResponse({"vivo": True, "base": base})
+
+async def salud_listo(request: Request):
+    """
+    Readiness: 200 si los caches están precargados y la base responde, 503 si no.
+
+    Ejemplo de respuesta: {"listo": true, "precarga": {...}, "base": {"ok": true, "latencia_ms": 0.41}}
+    """
+    estado = await asyncio.to_thread(estado_listo)
+    return JSONResponse(estado, status_code=200 if estado["listo"] else 503)
+
+api = Starlette(routes=[
+    Route("/api/export/{entidad}.{formato}", exportar_catalogo, methods=["GET"]),
+    Route("/api/autocompletar", autocompletar, methods=["GET"]),
+    Route("/api/metrics/estado", metricas_instrumentacion, methods=["GET"]),
+    Route("/api/debug/estado", reporte_instrumentacion, methods=["GET"]),
+    Route("/api/metrics/eventos", metricas_eventos, methods=["GET"]),
+    Route("/api/debug/eventos", reporte_eventos, methods=["GET"]),
+    Route("/api/debug/queries", reporte_queries_lentas, methods=["GET"]),
+    Route("/api/metrics/cache", metricas_cache, methods=["GET"]),
+    Route("/health/live", salud_vivo, methods=["GET"]),
+    Route("/health/ready", salud_listo, methods=["GET"]),
+])
@@ -0,0 +1,149 @@
+# ================================================================================
+# CACHE DE CONSULTAS POR ARGUMENTOS (TTL + LRU) - SALTO ESTUDIA
+# ================================================================================
+#
+# Cache compartido por proceso para las consultas del directorio de sedes e
+# instituciones, que se leen en cada carga de /instituciones, cambio de filtro
+# y apertura de diálogo, pero solo cambian cuando un admin edita una sede o un
+# curso.
+#
+# FUNCIONAMIENTO:
+# - Clave: (nombre de la función, argumentos)
+# - Cada entrada vence a los DIRECTORIO_CACHE_TTL_SECONDS
+# - Con más de DIRECTORIO_CACHE_MAX_ENTRADAS se descarta la usada hace más tiempo
+# - invalidar() vacía el cache: lo llaman las escrituras de cursos y sedes al
+#   confirmar la transacción (ver database._incrementar_generacion_catalogo)
+# - Si cambia la generación del catálogo (escritura en otro worker) el cache
+#   también se vacía, igual que el catálogo de cursos
+#
+# Los resultados se comparten entre sesiones: son de solo lectura (se devuelve
+# una copia de la lista, no de cada diccionario). Los resultados vacíos no se
+# guardan, porque las consultas devuelven [] también ante un error de conexión.
+#
+# UTILIZADO EN:
+# - database.py: @cache_directorio.cachear() en las consultas del directorio
+# - api.py: /api/metrics/cache (aciertos y fallos por función, con DIAGNOSTICO_TOKEN)
+# ================================================================================
+
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Optional
+
+DIRECTORIO_CACHE_TTL_SECONDS = float(os.getenv("DIRECTORIO_CACHE_TTL_SECONDS", "300"))
+DIRECTORIO_CACHE_MAX_ENTRADAS = int(os.getenv("DIRECTORIO_CACHE_MAX_ENTRADAS", "256"))
+
+class CacheConsultas:
+    """Cache TTL + LRU de resultados de funciones, con contadores por función."""
+
+    def __init__(self, ttl: float, max_entradas: int, generacion: Optional[Callable[[], int]] = None):
+        """
+        Args:
+            ttl: Segundos de vida de cada entrada (0 desactiva el cache)
+            max_entradas: Máximo de entradas antes de descartar por LRU
+            generacion: Función que devuelve la generación actual de los datos;
+                        si cambia, el cache se vacía
+        """
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self.generacion = generacion
+        self._lock = threading.Lock()
+        self._entradas: "OrderedDict[tuple, tuple]" = OrderedDict()  # clave → (vence_en, valor)
+        self._generacion_cacheada: Optional[int] = None
+        self.aciertos: Dict[str, int] = defaultdict(int)
+        self.fallos: Dict[str, int] = defaultdict(int)
+        self.invalidaciones = 0
+
+    def invalidar(self):
+        """Descarta todas las entradas."""
+        with self._lock:
+            self._entradas.clear()
+            self.invalidaciones += 1
+
+    def _verificar_generacion(self):
+        if self.generacion is None:
+            return
+        generacion = self.generacion()
+        with self._lock:
+            if generacion != self._generacion_cacheada:
+                self._entradas.clear()
+                self._generacion_cacheada = generacion
+                self.invalidaciones += 1
+
+    def obtener(self, clave: tuple, calcular: Callable[[], Any]) -> Any:
+        """Devuelve el valor cacheado para `clave` o lo calcula con `calcular()`."""
+        funcion = clave[0]
+        self._verificar_generacion()
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada[0] > ahora:
+                self._entradas.move_to_end(clave)
+                self.aciertos[funcion] += 1
+                return entrada[1]
+            self.fallos[funcion] += 1
+            invalidaciones = self.invalidaciones
+
+        valor = calcular()
+
+        with self._lock:
+            # Si hubo una invalidación mientras se calculaba, el valor puede
+            # ser anterior a la escritura: devolverlo pero no guardarlo
+            if invalidaciones == self.invalidaciones and self.ttl > 0 and valor:
+                self._entradas[clave] = (ahora + self.ttl, valor)
+                self._entradas.move_to_end(clave)
+                while len(self._entradas) > self.max_entradas:
+                    self._entradas.popitem(last=False)
+        return valor
+
+    def cachear(self):
+        """Decorador: cachea la función por sus argumentos."""
+        def decorador(funcion):
+            firma = inspect.signature(funcion)
+
+            @functools.wraps(funcion)
+            def envoltura(*args, **kwargs):
+                # f("Salto"), f(ciudad_nombre="Salto") y f() / f(None) comparten clave
+                argumentos = firma.bind(*args, **kwargs)
+                argumentos.apply_defaults()
+                clave = (funcion.__name__, tuple(argumentos.arguments.items()))
+                valor = self.obtener(clave, lambda: funcion(*args, **kwargs))
+                return list(valor) if isinstance(valor, list) else valor
+            return envoltura
+        return decorador
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Aciertos, fallos y tamaño actual del cache."""
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "invalidaciones": self.invalidaciones,
+                "funciones": {
+                    funcion: {"aciertos": self.aciertos[funcion], "fallos": self.fallos[funcion]}
+                    for funcion in sorted(set(self.aciertos) | set(self.fallos))
+                },
+            }
+
+    def prometheus(self, nombre: str) -> str:
+        """Contadores en formato de texto de Prometheus."""
+        estadisticas = self.estadisticas()
+        lineas = [
+            f"# HELP {nombre}_aciertos_total Llamadas respondidas desde el cache",
+            f"# TYPE {nombre}_aciertos_total counter",
+        ]
+        lineas += [f'{nombre}_aciertos_total{{funcion="{f}"}} {e["aciertos"]}' for f, e in estadisticas["funciones"].items()]
+        lineas += [
+            f"# HELP {nombre}_fallos_total Llamadas que consultaron la base",
+            f"# TYPE {nombre}_fallos_total counter",
+        ]
+        lineas += [f'{nombre}_fallos_total{{funcion="{f}"}} {e["fallos"]}' for f, e in estadisticas["funciones"].items()]
+        lineas += [
+            f"# TYPE {nombre}_entradas gauge",
+            f"{nombre}_entradas {estadisticas['entradas']}",
+            f"# TYPE {nombre}_invalidaciones_total counter",
+            f"{nombre}_invalidaciones_total {estadisticas['invalidaciones']}",
+        ]
+        return "\n".join(lineas) + "\n"
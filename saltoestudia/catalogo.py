@@ -0,0 +1,447 @@
+# ================================================================================
+# CATÁLOGO DE CURSOS EN MEMORIA (FORMATO COLUMNAR) - SALTO ESTUDIA
+# ================================================================================
+#
+# Representación compacta del catálogo compartido por proceso (ver
+# database.obtener_cursos_catalogo). En lugar de un diccionario de nueve claves
+# por curso, el catálogo guarda una columna por campo:
+#
+# - Campos repetidos (institución, nivel, requisitos, duración) como códigos
+#   enteros en un array, con una tabla de valores por columna
+# - Ciudades como tuplas de códigos enteros; las combinaciones iguales
+#   ("Salto, Virtual") comparten la misma tupla
+# - Nombre e información como listas de str (son únicos por curso)
+#
+# Los filtros comparan códigos enteros y las filas CursoRow (filas.py) se
+# arman solo para las que se van a mostrar (materializar). Las posiciones de
+# orden (ver clave_orden_es) se calculan una vez al construir el catálogo.
+#
+# El catálogo es inmutable una vez construido: aplicar cambios devuelve un
+# catálogo nuevo, así las sesiones que recorren el anterior no se ven afectadas.
+#
+# AUTOCOMPLETADO: cada catálogo arma (la primera vez que se pide) un índice de
+# prefijos sobre los nombres de cursos e instituciones (IndicePrefijos). Como
+# el índice vive en el catálogo, se rehace con cada generación sin invalidación
+# aparte, y las sugerencias no consultan la base.
+#
+# UTILIZADO EN:
+# - database.py: obtener_cursos_catalogo() construye y actualiza el catálogo
+# - state.py: aplicar_filtros() filtra, ordena y materializa
+# ================================================================================
+
+import heapq
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .constants import CursosConstants
+from .filas import CursoRow, Sugerencia
+
+# Columnas por las que se pueden ordenar los resultados de /cursos
+COLUMNAS_ORDEN_CATALOGO = ["nombre", "institucion", "duracion", "nivel"]
+
+def clave_orden_es(texto: Optional[str]) -> Tuple[str, str]:
+    """
+    Clave de orden alfabético en español.
+
+    Ignora mayúsculas y tildes en la comparación principal ("Área" junto a
+    "area") y ubica la ñ como letra propia entre la n y la o ("nutrición" <
+    "ñandú" < "obra"). A igual texto sin tildes, desempata por el original.
+    """
+    texto = (texto or "").strip().casefold().replace("ñ", "n\uffff")
+    sin_tildes = "".join(
+        c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c)
+    )
+    return (sin_tildes, texto)
+
+def normalizar_busqueda(texto: Optional[str]) -> str:
+    """Texto en minúsculas y sin tildes para búsquedas ("Diseño Gráfico" → "diseno grafico")."""
+    return "".join(
+        c for c in unicodedata.normalize("NFKD", (texto or "").casefold()) if not unicodedata.combining(c)
+    )
+
+def duracion_en_meses(numero: Any, unidad: Optional[str]) -> int:
+    """Convierte duracion_numero + duracion_unidad a meses (sin dato: al final)."""
+    try:
+        meses = int(str(numero).strip())
+    except (TypeError, ValueError):
+        return 10 ** 6
+    return meses * 12 if (unidad or "").strip().lower() in ("año", "años") else meses
+
+class Categorias:
+    """Tabla de valores repetidos: cada valor distinto se guarda una vez y se referencia por código."""
+    __slots__ = ("valores", "_codigos")
+
+    def __init__(self, valores: Iterable[Any] = ()):
+        self.valores: List[Any] = []
+        self._codigos: Dict[Any, int] = {}
+        for valor in valores:
+            self.codigo(valor)
+
+    def codigo(self, valor: Any) -> int:
+        """Devuelve el código de `valor`, agregándolo a la tabla si es nuevo."""
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+    def buscar(self, valor: Any) -> Optional[int]:
+        """Código de `valor` sin agregarlo (None si no está)."""
+        return self._codigos.get(valor)
+
+# Palabras de un nombre ya normalizado ("tecnico en informatica" → 3 tokens)
+_TOKEN = re.compile(r"\w+")
+
+def tokens_busqueda(texto: Optional[str]) -> List[str]:
+    """Palabras normalizadas (minúsculas, sin tildes) de un texto."""
+    return _TOKEN.findall(normalizar_busqueda(texto))
+
+# Prefijos de hasta este largo tienen su lista de nombres ya unida: "t" o "2"
+# abarcan cientos de palabras y mezclar todos sus postings no entra en 1 ms
+LARGO_PREFIJO_CORTO = 2
+
+class IndicePrefijos:
+    """
+    Índice de prefijos para autocompletar nombres (arreglo ordenado de tokens).
+
+    Cada nombre se parte en palabras normalizadas; `tokens` es la lista
+    ordenada de palabras distintas y `postings[i]` los nombres que contienen
+    `tokens[i]`. Los nombres se numeran por relevancia (más cursos primero,
+    después alfabético), así cada posting ya está ordenado por relevancia:
+    un prefijo se resuelve con dos bisect (el rango de palabras que empiezan
+    con él) y los k mejores salen de mezclar esos postings, sin recorrer ni
+    ordenar todos los nombres que coinciden. Los prefijos cortos
+    (LARGO_PREFIJO_CORTO) ya tienen sus postings unidos en `cortos`. Un nombre
+    escrito completo va primero aunque sea menos relevante ("Institución 3"
+    antes que "Institución 30").
+    """
+    __slots__ = ("textos", "tipos", "tokens", "postings", "cortos", "_acumulado", "_palabras", "_exactos")
+
+    def __init__(self, entradas: Iterable[Tuple[str, str, int]]):
+        """
+        Args:
+            entradas: (texto, tipo, peso) por nombre; tipo "curso" o
+                      "institucion", peso = cantidad de cursos
+        """
+        ordenadas = sorted(entradas, key=lambda e: (-e[2], clave_orden_es(e[0])))
+        self.textos: List[str] = [texto for texto, _, _ in ordenadas]
+        self.tipos: List[str] = [tipo for _, tipo, _ in ordenadas]
+        tokens_nombre = [tokens_busqueda(t) for t in self.textos]
+        # " tecnico en informatica": cada palabra restante se verifica como
+        # substring " " + palabra, sin recorrer los tokens en Python
+        self._palabras: List[str] = [" " + " ".join(tokens) for tokens in tokens_nombre]
+        self._exactos: Dict[str, List[int]] = {}
+        for numero, palabras in enumerate(self._palabras):
+            self._exactos.setdefault(palabras, []).append(numero)
+
+        por_token: Dict[str, List[int]] = {}
+        por_corto: Dict[str, List[int]] = {}
+        for numero, tokens in enumerate(tokens_nombre):
+            for token in dict.fromkeys(tokens):  # Una vez por nombre, en orden
+                por_token.setdefault(token, []).append(numero)
+            for corto in dict.fromkeys(t[:n] for t in tokens for n in range(1, LARGO_PREFIJO_CORTO + 1)):
+                por_corto.setdefault(corto, []).append(numero)
+        self.tokens: List[str] = sorted(por_token)
+        self.postings: List[array] = [array("I", por_token[t]) for t in self.tokens]
+        self.cortos: Dict[str, array] = {corto: array("I", numeros) for corto, numeros in por_corto.items()}
+        # Suma de postings hasta cada token: tamaño de un rango en O(1)
+        self._acumulado = array("I", [0])
+        for posting in self.postings:
+            self._acumulado.append(self._acumulado[-1] + len(posting))
+
+    def __len__(self) -> int:
+        return len(self.textos)
+
+    def _rango(self, prefijo: str) -> Tuple[int, int]:
+        """Rango [desde, hasta) de `tokens` que empiezan con `prefijo`."""
+        return bisect_left(self.tokens, prefijo), bisect_left(self.tokens, prefijo + "\uffff")
+
+    def _postings_prefijo(self, prefijo: str) -> Tuple[List[array], int]:
+        """Postings a mezclar para `prefijo` y cuántos nombres cubren (cota superior)."""
+        if len(prefijo) <= LARGO_PREFIJO_CORTO:
+            unidos = self.cortos.get(prefijo)
+            return ([unidos], len(unidos)) if unidos is not None else ([], 0)
+        desde, hasta = self._rango(prefijo)
+        return self.postings[desde:hasta], self._acumulado[hasta] - self._acumulado[desde]
+
+    def sugerir(self, texto: str, k: int) -> List[int]:
+        """
+        Números de los k nombres más relevantes que coinciden con `texto`.
+
+        Cada palabra del texto tiene que ser prefijo de alguna palabra del
+        nombre ("tec inf" → "Técnico en Informática"). Los postings a mezclar
+        salen de la palabra con menos coincidencias; las demás se verifican
+        solo sobre los candidatos.
+        """
+        palabras = tokens_busqueda(texto)
+        if not palabras or k <= 0:
+            return []
+        exactos = self._exactos.get(" " + " ".join(palabras), [])[:k]
+        consulta = list(dict.fromkeys(palabras))
+        fuentes = {palabra: self._postings_prefijo(palabra) for palabra in consulta}
+        clave = min(consulta, key=lambda p: fuentes[p][1])
+        resto = [" " + p for p in consulta if p != clave]
+
+        resultado: List[int] = list(exactos)
+        if len(resultado) == k:
+            return resultado
+        anterior = -1
+        # Los postings están ordenados: un nombre repetido sale consecutivo en la mezcla
+        for numero in heapq.merge(*fuentes[clave][0]):
+            if numero == anterior or numero in exactos:
+                continue
+            anterior = numero
+            if resto:
+                nombre = self._palabras[numero]
+                if not all(p in nombre for p in resto):
+                    continue
+            resultado.append(numero)
+            if len(resultado) == k:
+                break
+        return resultado
+
+class CatalogoCursos:
+    """
+    Catálogo de cursos como columnas paralelas (una posición por curso).
+
+    Se construye con agregar() en orden de id y cerrar(); después es de solo
+    lectura. Al estar ordenado por id, un curso se ubica con bisect sobre `ids`
+    sin necesitar un índice aparte.
+    """
+    __slots__ = (
+        "ids", "nombres", "informaciones",
+        "instituciones", "niveles", "requisitos", "duraciones", "ciudades",
+        "tabla_instituciones", "tabla_niveles", "tabla_requisitos",
+        "tabla_duraciones", "tabla_ciudades", "_tuplas_ciudades",
+        "rangos", "texto_busqueda", "inicios_texto", "_indice_prefijos",
+    )
+
+    def __init__(self):
+        self.ids = array("q")
+        self.nombres: List[str] = []
+        self.informaciones: List[Optional[str]] = []
+        self.instituciones = array("I")
+        self.niveles = array("I")
+        self.requisitos = array("I")
+        self.duraciones = array("I")
+        self.ciudades: List[Tuple[int, ...]] = []
+        # Niveles y requisitos conocidos primero: sus códigos quedan en el orden de constants.py
+        self.tabla_instituciones = Categorias()
+        self.tabla_niveles = Categorias(CursosConstants.NIVELES)
+        self.tabla_requisitos = Categorias(CursosConstants.REQUISITOS_INGRESO)
+        self.tabla_duraciones = Categorias()  # (numero, unidad)
+        self.tabla_ciudades = Categorias()
+        self._tuplas_ciudades: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+        self.rangos: Dict[str, array] = {}
+        self.texto_busqueda = b""
+        self.inicios_texto = array("I")
+        self._indice_prefijos: Optional[IndicePrefijos] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # === CONSTRUCCIÓN ===
+
+    def agregar(
+        self,
+        curso_id: int,
+        nombre: str,
+        nivel: Optional[str],
+        requisitos_ingreso: Optional[str],
+        duracion_numero: Any,
+        duracion_unidad: Optional[str],
+        informacion: Optional[str],
+        institucion: Optional[str],
+        ciudades: Sequence[str],
+    ):
+        """Agrega un curso al final del catálogo (solo durante la construcción, ids ascendentes)."""
+        self.ids.append(curso_id)
+        self.nombres.append(nombre)
+        self.informaciones.append(informacion)
+        self.instituciones.append(self.tabla_instituciones.codigo(institucion or "N/A"))
+        self.niveles.append(self.tabla_niveles.codigo(nivel or "N/A"))
+        self.requisitos.append(self.tabla_requisitos.codigo(requisitos_ingreso or "N/A"))
+        self.duraciones.append(self.tabla_duraciones.codigo((duracion_numero, duracion_unidad)))
+        tupla = tuple(self.tabla_ciudades.codigo(ciudad) for ciudad in ciudades)
+        self.ciudades.append(self._tuplas_ciudades.setdefault(tupla, tupla))
+
+    def agregar_fila(self, curso: CursoRow):
+        """Agrega un CursoRow (formato de obtener_cursos(): "lugar" separado por comas)."""
+        lugar = curso.lugar or ""
+        self.agregar(
+            curso.id, curso.nombre, curso.nivel, curso.requisitos_ingreso,
+            curso.duracion_numero, curso.duracion_unidad, curso.informacion,
+            curso.institucion,
+            [] if lugar == "N/A" else [c.strip() for c in lugar.split(",") if c.strip()],
+        )
+
+    def cerrar(self) -> "CatalogoCursos":
+        """Calcula las posiciones de orden y el texto de búsqueda; el catálogo queda listo para leer."""
+        claves_nombre = [clave_orden_es(nombre) for nombre in self.nombres]
+        claves_institucion = [clave_orden_es(i) for i in self.tabla_instituciones.valores]
+        meses = [duracion_en_meses(n, u) for n, u in self.tabla_duraciones.valores]
+        claves = {
+            "nombre": lambda p: claves_nombre[p],
+            "institucion": lambda p: (claves_institucion[self.instituciones[p]], claves_nombre[p]),
+            "duracion": lambda p: (meses[self.duraciones[p]], claves_nombre[p]),
+            # Nivel en orden de formación (Bachillerato → Posgrado), no alfabético
+            "nivel": lambda p: (self.niveles[p], claves_nombre[p]),
+        }
+        for columna, clave in claves.items():
+            rango = array("I", bytes(4 * len(self.ids)))
+            for orden, posicion in enumerate(sorted(range(len(self.ids)), key=clave)):
+                rango[posicion] = orden
+            self.rangos[columna] = rango
+        # Mismo texto que curso_catalogo.texto_busqueda (exportación): sin tildes ni
+        # mayúsculas. Todos los cursos van en un solo bytes UTF-8 separados por
+        # "\0" (casi todo ASCII: un byte por carácter) con el inicio de cada uno y
+        # el fin del último; un str por curso costaría más que el texto mismo
+        # (~50 bytes por objeto)
+        partes = [
+            normalizar_busqueda(f"{nombre}\n{informacion or ''}").encode()
+            for nombre, informacion in zip(self.nombres, self.informaciones)
+        ]
+        inicio = 0
+        for parte in partes:
+            self.inicios_texto.append(inicio)
+            inicio += len(parte) + 1
+        self.inicios_texto.append(inicio)
+        self.texto_busqueda = b"\0".join(partes)
+        return self
+
+    def con_cambios(self, cursos: List[CursoRow], eliminados: Iterable[int]) -> "CatalogoCursos":
+        """
+        Devuelve un catálogo NUEVO con `cursos` agregados/reemplazados y `eliminados` quitados.
+
+        Args:
+            cursos: Cursos nuevos o modificados (cursos_cambiados_desde())
+            eliminados: IDs de cursos borrados
+        """
+        nuevos = {c.id: c for c in cursos}
+        quitar = set(eliminados) | nuevos.keys()
+        catalogo = CatalogoCursos()
+        ids_finales = sorted({i for i in self.ids if i not in quitar} | set(nuevos))
+        for curso_id in ids_finales:
+            if curso_id in nuevos:
+                catalogo.agregar_fila(nuevos[curso_id])
+            else:
+                p = bisect_left(self.ids, curso_id)
+                numero, unidad = self.tabla_duraciones.valores[self.duraciones[p]]
+                catalogo.agregar(
+                    curso_id, self.nombres[p],
+                    self.tabla_niveles.valores[self.niveles[p]],
+                    self.tabla_requisitos.valores[self.requisitos[p]],
+                    numero, unidad, self.informaciones[p],
+                    self.tabla_instituciones.valores[self.instituciones[p]],
+                    [self.tabla_ciudades.valores[c] for c in self.ciudades[p]],
+                )
+        return catalogo.cerrar()
+
+    # === LECTURA ===
+
+    def filtrar(
+        self,
+        nivel: str = "",
+        requisito: str = "",
+        institucion: str = "",
+        lugar: str = "",
+        busqueda: str = "",
+    ) -> List[int]:
+        """
+        Devuelve las posiciones de los cursos que cumplen los filtros de /cursos.
+
+        Los filtros de valor exacto se resuelven a su código una sola vez y se
+        comparan como enteros. Un valor que no existe en el catálogo no
+        coincide con ningún curso. La búsqueda de texto ignora tildes y
+        mayúsculas, igual que la exportación y el autocompletado.
+        """
+        condiciones = []
+        for valor, tabla, columna in (
+            (nivel, self.tabla_niveles, self.niveles),
+            (requisito, self.tabla_requisitos, self.requisitos),
+            (institucion, self.tabla_instituciones, self.instituciones),
+        ):
+            if valor:
+                codigo = tabla.buscar(valor)
+                if codigo is None:
+                    return []
+                condiciones.append((columna, codigo))
+        codigo_lugar = None
+        if lugar:
+            codigo_lugar = self.tabla_ciudades.buscar(lugar)
+            if codigo_lugar is None:
+                return []
+        texto = normalizar_busqueda(busqueda)
+
+        # Una pasada por condición, de la más barata (enteros) a la más cara (texto)
+        posiciones = range(len(self.ids))
+        for columna, codigo in condiciones:
+            posiciones = [p for p in posiciones if columna[p] == codigo]
+        if codigo_lugar is not None:
+            ciudades = self.ciudades
+            posiciones = [p for p in posiciones if codigo_lugar in ciudades[p]]
+        if texto:
+            # find acotado al tramo de cada curso: sin copiar ni crear un str por curso
+            buscado = texto.encode()
+            buscar, inicios = self.texto_busqueda.find, self.inicios_texto
+            posiciones = [p for p in posiciones if buscar(buscado, inicios[p], inicios[p + 1]) != -1]
+        return list(posiciones)
+
+    def ordenar(self, posiciones: List[int], columna: str, descendente: bool = False) -> List[int]:
+        """Ordena posiciones con los rangos precalculados ("" o columna desconocida: sin cambios)."""
+        rango = self.rangos.get(columna)
+        if rango is None:
+            return posiciones
+        return sorted(posiciones, key=rango.__getitem__, reverse=descendente)
+
+    def indice_prefijos(self) -> IndicePrefijos:
+        """
+        Índice de autocompletado de este catálogo (se arma en el primer uso).
+
+        Nombres de curso distintos pesados por cuántos cursos los usan, e
+        instituciones pesadas por su cantidad de cursos. Dos hilos pueden
+        armarlo a la vez: el resultado es el mismo y gana el último.
+        """
+        indice = self._indice_prefijos
+        if indice is None:
+            cursos_por_nombre: Dict[str, int] = {}
+            for nombre in self.nombres:
+                cursos_por_nombre[nombre] = cursos_por_nombre.get(nombre, 0) + 1
+            cursos_por_institucion = [0] * len(self.tabla_instituciones.valores)
+            for codigo in self.instituciones:
+                cursos_por_institucion[codigo] += 1
+            entradas = [(nombre, "curso", n) for nombre, n in cursos_por_nombre.items()]
+            entradas += [
+                (institucion, "institucion", n)
+                for institucion, n in zip(self.tabla_instituciones.valores, cursos_por_institucion)
+                if institucion and institucion != "N/A"
+            ]
+            indice = self._indice_prefijos = IndicePrefijos(entradas)
+        return indice
+
+    def sugerencias(self, texto: str, k: int) -> List[Sugerencia]:
+        """Top-k de nombres de cursos e instituciones que coinciden con `texto` (autocompletado)."""
+        indice = self.indice_prefijos()
+        return [Sugerencia(indice.textos[n], indice.tipos[n]) for n in indice.sugerir(texto, k)]
+
+    def materializar(self, posiciones: Iterable[int]) -> List[CursoRow]:
+        """Arma las filas (formato de obtener_cursos()) solo para las posiciones pedidas."""
+        cursos = []
+        for p in posiciones:
+            numero, unidad = self.tabla_duraciones.valores[self.duraciones[p]]
+            ciudades = self.ciudades[p]
+            cursos.append(CursoRow(
+                self.ids[p],
+                self.nombres[p],
+                self.tabla_niveles.valores[self.niveles[p]],
+                self.tabla_requisitos.valores[self.requisitos[p]],
+                numero,
+                unidad,
+                self.informaciones[p],
+                ", ".join(self.tabla_ciudades.valores[c] for c in ciudades) if ciudades else "N/A",
+                self.tabla_instituciones.valores[self.instituciones[p]],
+            ))
+        return cursos
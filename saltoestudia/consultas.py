@@ -0,0 +1,271 @@
+# ================================================================================
+# CONSULTAS PRECONSTRUIDAS (REGISTRO DE STATEMENTS) - SALTO ESTUDIA
+# ================================================================================
+#
+# Las consultas de lectura más frecuentes se construyen UNA vez al importar el
+# módulo, con parámetros ligados (bindparam) en lugar de valores fijos. En
+# cada llamada solo cambian los parámetros:
+#
+#     session.exec(consultas.SEDES_TARJETAS_POR_CIUDAD, params={"ciudad_nombre": "Salto"})
+#
+# Construir un select(...).join(...).where(...) nuevo en cada llamada obliga a
+# SQLAlchemy a armar el árbol de la consulta y a recalcular su clave de cache
+# antes de encontrar el SQL ya compilado. Un statement reutilizado guarda su
+# clave (memoizada en el objeto), así cada ejecución va directo al cache de
+# compilación del engine. Ver scripts/benchmark_statements.py.
+#
+# CONVENCIONES:
+# - Nombres en MAYÚSCULAS: son constantes, nunca se modifican en el lugar
+#   (.where() devuelve un statement nuevo y perdería el beneficio)
+# - Variantes con y sin filtro derivan de la misma base
+# - Las listas de IDs usan bindparam(expanding=True): un solo statement para
+#   cualquier cantidad de IDs
+#
+# UTILIZADO EN:
+# - database.py: lecturas públicas, panel admin y modelo de lectura del catálogo
+# ================================================================================
+
+from sqlalchemy import BigInteger, bindparam, case, cast, func
+from sqlalchemy.orm import joinedload
+from sqlmodel import select
+
+from .models import (
+    CatalogGeneration,
+    CatalogoEliminacion,
+    Ciudad,
+    Curso,
+    CursoCatalogo,
+    CursoCiudadLink,
+    Institucion,
+    Sede,
+    Usuario,
+)
+
+# ================================================================================
+# GENERACIÓN DEL CATÁLOGO Y CAMBIOS INCREMENTALES
+# ================================================================================
+
+GENERACION_CATALOGO = select(CatalogGeneration.generation).where(CatalogGeneration.id == 1)
+
+# IDs borrados de una entidad ("curso" o "sede") después de una generación
+ELIMINADOS_DESDE = select(CatalogoEliminacion.entidad_id).where(
+    CatalogoEliminacion.entidad == bindparam("entidad"),
+    CatalogoEliminacion.version > bindparam("generacion"),
+)
+
+# ================================================================================
+# MODELO DE LECTURA DEL CATÁLOGO (curso_catalogo)
+# ================================================================================
+
+# Columnas de curso_catalogo en el orden de CatalogoCursos.agregar()
+COLUMNAS_LECTURA_CATALOGO = (
+    CursoCatalogo.curso_id,
+    CursoCatalogo.nombre,
+    CursoCatalogo.nivel,
+    CursoCatalogo.requisitos_ingreso,
+    CursoCatalogo.duracion_numero,
+    CursoCatalogo.duracion_unidad,
+    CursoCatalogo.informacion,
+    CursoCatalogo.institucion_nombre,
+    CursoCatalogo.lugar,
+)
+
+CATALOGO_CURSOS = select(*COLUMNAS_LECTURA_CATALOGO).order_by(CursoCatalogo.curso_id)
+
+CATALOGO_CURSOS_CAMBIADOS = (
+    select(*COLUMNAS_LECTURA_CATALOGO)
+    .where(CursoCatalogo.version > bindparam("generacion"))
+    .order_by(CursoCatalogo.curso_id)
+)
+
+HAY_CURSOS = select(Curso.id).limit(1)
+
+def _filas_catalogo(*condiciones):
+    """
+    Par (ciudades, cursos) con el que se arman las filas de curso_catalogo
+    desde las tablas normalizadas, filtrado por `condiciones` sobre Curso.
+    """
+    ciudades = select(CursoCiudadLink.curso_id, Ciudad.id, Ciudad.nombre).join(
+        Ciudad, CursoCiudadLink.ciudad_id == Ciudad.id
+    )
+    if condiciones:
+        ciudades = ciudades.where(CursoCiudadLink.curso_id.in_(select(Curso.id).where(*condiciones)))
+    cursos = select(
+        Curso.id,
+        Curso.nombre,
+        Curso.nivel,
+        Curso.requisitos_ingreso,
+        Curso.duracion_numero,
+        Curso.duracion_unidad,
+        Curso.informacion,
+        Curso.institucion_id,
+        Institucion.nombre,
+        Institucion.logo,
+        Curso.version,
+    ).join(
+        Institucion, Curso.institucion_id == Institucion.id, isouter=True
+    ).where(*condiciones).order_by(Curso.id)
+    return ciudades.order_by(Ciudad.id), cursos
+
+FILAS_CATALOGO = _filas_catalogo()
+FILAS_CATALOGO_POR_CURSOS = _filas_catalogo(Curso.id.in_(bindparam("curso_ids", expanding=True)))
+FILAS_CATALOGO_POR_INSTITUCION = _filas_catalogo(Curso.institucion_id == bindparam("institucion_id"))
+
+# ================================================================================
+# INSTITUCIONES, CIUDADES Y USUARIOS
+# ================================================================================
+
+INSTITUCIONES = select(Institucion.id, Institucion.nombre, Institucion.logo)
+
+INSTITUCIONES_NOMBRES = select(Institucion.nombre).distinct()
+
+CIUDADES_NOMBRES = select(Ciudad.nombre).distinct()
+
+CIUDAD_ID_POR_NOMBRE = select(Ciudad.id).where(Ciudad.nombre == bindparam("nombre"))
+
+# La institución se carga en la misma query (se usa después de cerrar la sesión)
+USUARIO_POR_CORREO = (
+    select(Usuario)
+    .options(joinedload(Usuario.institucion))
+    .where(Usuario.correo == bindparam("correo"))
+)
+
+# ================================================================================
+# DIRECTORIO DE SEDES (/instituciones)
+# ================================================================================
+
+# Instituciones con cada una de sus sedes y la ciudad de la sede
+_INSTITUCIONES_CON_SEDES = select(
+    Institucion.id,
+    Institucion.nombre,
+    Institucion.logo,
+    Sede.id,
+    Sede.direccion,
+    Sede.telefono,
+    Sede.email,
+    Sede.web,
+    Ciudad.nombre.label("ciudad_nombre"),
+).join(
+    Sede, Institucion.id == Sede.institucion_id
+).join(
+    Ciudad, Sede.ciudad_id == Ciudad.id
+)
+
+INSTITUCIONES_CON_SEDES = _INSTITUCIONES_CON_SEDES
+INSTITUCIONES_CON_SEDES_POR_CIUDAD = _INSTITUCIONES_CON_SEDES.where(
+    Ciudad.nombre == bindparam("ciudad_nombre")
+)
+
+# Tarjetas: las mismas filas sin sedes virtuales
+SEDES_TARJETAS = _INSTITUCIONES_CON_SEDES.where(Ciudad.nombre != "Virtual")
+SEDES_TARJETAS_POR_CIUDAD = SEDES_TARJETAS.where(Ciudad.nombre == bindparam("ciudad_nombre"))
+
+INSTITUCIONES_CON_CURSOS_VIRTUALES = select(
+    Institucion.id,
+    Institucion.nombre,
+    Institucion.logo,
+).join(
+    Curso, Institucion.id == Curso.institucion_id
+).join(
+    CursoCiudadLink, Curso.id == CursoCiudadLink.curso_id
+).join(
+    Ciudad, CursoCiudadLink.ciudad_id == Ciudad.id
+).where(
+    Ciudad.nombre == "Virtual"
+).distinct()
+
+# Sedes físicas (sin "Virtual") con ciudad e institución, en el formato del modal
+_SEDES_FISICAS = select(
+    Sede.id,
+    Sede.direccion,
+    Sede.telefono,
+    Sede.email,
+    Sede.web,
+    Ciudad.nombre.label("ciudad_nombre"),
+    Institucion.nombre.label("institucion_nombre"),
+    Sede.institucion_id,
+).join(
+    Ciudad, Sede.ciudad_id == Ciudad.id
+).join(
+    Institucion, Sede.institucion_id == Institucion.id
+).where(
+    Ciudad.nombre != "Virtual"
+)
+
+SEDES_FISICAS = _SEDES_FISICAS.order_by(Sede.institucion_id, Ciudad.nombre)
+SEDES_FISICAS_POR_INSTITUCION = _SEDES_FISICAS.where(
+    Sede.institucion_id == bindparam("institucion_id")
+).order_by(Ciudad.nombre)
+
+# Ciudades con sede de una institución, incluida "Virtual" (opciones del
+# formulario de cursos del admin)
+CIUDADES_SEDES_POR_INSTITUCION = select(Ciudad.nombre).join(
+    Sede, Sede.ciudad_id == Ciudad.id
+).where(
+    Sede.institucion_id == bindparam("institucion_id")
+).distinct().order_by(Ciudad.nombre)
+
+# ================================================================================
+# PANEL ADMIN: PÁGINA ORDENADA DE CURSOS
+# ================================================================================
+
+# Duración expresada en meses para ordenar ("1 años" va después de "6 meses").
+# Solo se castea cuando duracion_numero son dígitos (ltrim con lista de
+# caracteres existe en SQLite y PostgreSQL): un "1.5" o "" importado haría
+# fallar el CAST en PostgreSQL. Hasta 17 dígitos en BIGINT para que "* 12" no
+# desborde. Igual que duracion_en_meses, sin dato va al final.
+_DURACION_TEXTO = func.trim(Curso.duracion_numero)
+_DURACION_NUMERO = cast(_DURACION_TEXTO, BigInteger)
+_DURACION_EN_MESES = case(
+    (
+        (func.length(_DURACION_TEXTO).between(1, 17))
+        & (func.ltrim(_DURACION_TEXTO, "0123456789") == ""),
+        case(
+            (func.lower(func.trim(Curso.duracion_unidad)).in_(["año", "años"]), _DURACION_NUMERO * 12),
+            else_=_DURACION_NUMERO,
+        ),
+    ),
+    else_=10 ** 6,
+)
+
+# Columnas por las que se puede ordenar la tabla de cursos del admin
+COLUMNAS_ORDEN_ADMIN = {
+    "nombre": Curso.nombre,
+    "nivel": Curso.nivel,
+    "duracion": _DURACION_EN_MESES,
+    "requisitos_ingreso": Curso.requisitos_ingreso,
+}
+
+TOTAL_CURSOS_INSTITUCION = select(func.count(Curso.id)).where(
+    Curso.institucion_id == bindparam("institucion_id")
+)
+
+def _pagina_cursos_institucion(columna):
+    """Página de cursos de una institución ordenada por `columna` (LIMIT/OFFSET ligados)."""
+    return select(
+        Curso.id,
+        Curso.nombre,
+        Curso.nivel,
+        Curso.requisitos_ingreso,
+        Curso.duracion_numero,
+        Curso.duracion_unidad,
+        Curso.informacion,
+        Institucion.nombre,
+    ).join(
+        Institucion, Curso.institucion_id == Institucion.id
+    ).where(
+        Curso.institucion_id == bindparam("institucion_id")
+    ).order_by(
+        columna, Curso.id  # Desempate estable entre páginas
+    ).offset(bindparam("desde")).limit(bindparam("por_pagina"))
+
+# Una variante por (columna, descendente): el ORDER BY no se puede ligar como parámetro
+PAGINA_CURSOS_INSTITUCION = {
+    (orden, descendente): _pagina_cursos_institucion(columna.desc() if descendente else columna.asc())
+    for orden, columna in COLUMNAS_ORDEN_ADMIN.items()
+    for descendente in (False, True)
+}
+
+CIUDADES_DE_CURSOS = select(CursoCiudadLink.curso_id, Ciudad.nombre).join(
+    Ciudad, CursoCiudadLink.ciudad_id == Ciudad.id
+).where(CursoCiudadLink.curso_id.in_(bindparam("curso_ids", expanding=True)))
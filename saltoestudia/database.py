@@ -8,8 +8,11 @@
 # proporcionando una capa de abstracción entre los modelos SQLModel y la UI.
 #
 # ARQUITECTURA:
-# - Engine único compartido entre seed.py y la aplicación Reflex
+# - Engine primario compartido entre seed.py y la aplicación Reflex
+# - Réplica de lectura opcional (DATABASE_READ_URL) para las lecturas públicas
 # - Sesiones de corta duración con patrón context manager
+# - Consultas frecuentes preconstruidas con parámetros ligados (consultas.py)
+# - Filas tipadas para la UI (CursoRow, SedeRow, TarjetaInstitucion en filas.py)
 # - Validaciones usando constants.py antes de persistir
 # - Manejo de errores robusto con logging
 #
@@ -27,14 +30,26 @@
 # ================================================================================
 
 import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 load_dotenv()
 import reflex as rx
 from sqlmodel import create_engine, select, Session
-from sqlalchemy.orm import selectinload
-from typing import List, Optional, Dict, Any
-from .models import Institucion, Curso, Usuario, Ciudad, CursoCiudadLink, Sede
+from sqlalchemy import String, cast, delete, event, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
+from .models import Institucion, Curso, Usuario, Ciudad, CursoCiudadLink, Sede, CatalogGeneration, CatalogoEliminacion, CursoCatalogo
+from . import consultas
+from .consultas import COLUMNAS_LECTURA_CATALOGO as _COLUMNAS_LECTURA_CATALOGO, COLUMNAS_ORDEN_ADMIN
 from .constants import ValidationConstants
+from .catalogo import CatalogoCursos, normalizar_busqueda
+from .filas import CursoRow, SedeRow, Sugerencia, TarjetaInstitucion, serializar_fila
+from .cache import CacheConsultas, DIRECTORIO_CACHE_MAX_ENTRADAS, DIRECTORIO_CACHE_TTL_SECONDS
+from .queries_lentas import REGISTRAR_QUERIES_LENTAS, queries_lentas
 
 # ================================================================================
 # CONFIGURACIÓN DEL ENGINE DE BASE DE DATOS
@@ -68,6 +83,168 @@ def get_database_url():
 DATABASE_URL = get_database_url()
 engine = create_engine(DATABASE_URL)
 
+# === AJUSTES DE SQLITE ===
+# Con los pragmas por defecto, SQLite usa rollback journal: mientras un admin
+# escribe, los lectores esperan (o fallan con "database is locked"). En modo
+# WAL los lectores leen la última versión confirmada sin bloquear al escritor.
+# Se aplican en cada conexión nueva (evento connect) y solo a URLs sqlite://.
+SQLITE_AJUSTES = os.getenv("SQLITE_AJUSTES", "true").lower() == "true"
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))    # Cache de páginas por conexión
+SQLITE_MMAP_SIZE_MB = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))        # 0 desactiva mmap
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))  # Espera ante un lock
+SQLITE_LECTORES_SOLO_LECTURA = os.getenv("SQLITE_LECTORES_SOLO_LECTURA", "true").lower() == "true"
+
+def _es_sqlite_en_archivo(url) -> bool:
+    """True si la URL es una base SQLite en archivo (no :memory:)."""
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+def ajustar_sqlite(engine_sqlite, solo_lectura: bool = False):
+    """
+    Registra los pragmas de producción en cada conexión nueva de `engine_sqlite`.
+    
+    - journal_mode=WAL: lectores concurrentes con un escritor (persiste en el archivo)
+    - synchronous=NORMAL: en WAL no pierde integridad ante un corte, solo
+      puede perder las últimas transacciones confirmadas
+    - cache_size, mmap_size: más páginas en memoria, menos lecturas al disco
+    - busy_timeout: esperar el lock en lugar de fallar enseguida
+    - temp_store=MEMORY: tablas temporales de ORDER BY/DISTINCT en memoria
+    
+    Args:
+        engine_sqlite: Engine con URL sqlite://
+        solo_lectura: Conexión de lectura (mode=ro): no cambia journal_mode
+    """
+    def _aplicar_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+            if not solo_lectura:
+                cursor.execute("PRAGMA journal_mode = WAL")
+            cursor.execute("PRAGMA synchronous = NORMAL")
+            cursor.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}")
+            cursor.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE_MB * 1024 * 1024}")
+            cursor.execute("PRAGMA temp_store = MEMORY")
+        finally:
+            cursor.close()
+
+    if not event.contains(engine_sqlite, "connect", _aplicar_pragmas):
+        event.listen(engine_sqlite, "connect", _aplicar_pragmas)
+
+def crear_engine_lectura_sqlite(engine_sqlite):
+    """
+    Engine de solo lectura sobre el mismo archivo SQLite (URI mode=ro).
+    
+    Las lecturas públicas usan conexiones propias que no pueden escribir, así
+    un error de código no puede modificar la base desde una lectura y el pool
+    de lectores no compite con el del escritor. En WAL ven cada escritura
+    apenas se confirma, sin retraso como una réplica.
+    """
+    ruta = os.path.abspath(engine_sqlite.url.database)
+    url = engine_sqlite.url.set(database=f"file:{ruta}", query={"mode": "ro", "uri": "true"})
+    lectura = create_engine(url)
+    ajustar_sqlite(lectura, solo_lectura=True)
+    return lectura
+
+sqlite_read_engine = None
+if SQLITE_AJUSTES and _es_sqlite_en_archivo(engine.url):
+    ajustar_sqlite(engine)
+    if SQLITE_LECTORES_SOLO_LECTURA:
+        sqlite_read_engine = crear_engine_lectura_sqlite(engine)
+    print(f"[LOG] SQLite en modo WAL (cache {SQLITE_CACHE_SIZE_KB} KB, mmap {SQLITE_MMAP_SIZE_MB} MB, "
+          f"lectores {'de solo lectura' if sqlite_read_engine is not None else 'en el engine primario'})")
+
+# Registro opcional de queries lentas con su plan (ver queries_lentas.py)
+if REGISTRAR_QUERIES_LENTAS:
+    queries_lentas.instalar(engine)
+    if sqlite_read_engine is not None:
+        queries_lentas.instalar(sqlite_read_engine)
+
+# === ENGINE DE LECTURA (RÉPLICA OPCIONAL) ===
+# Si se define DATABASE_READ_URL, las lecturas públicas (buscador, galería de
+# instituciones, filtros) se envían a la réplica y el engine primario queda
+# reservado para escrituras y lecturas del panel admin (read-after-write).
+# Sin DATABASE_READ_URL todo sigue pasando por el engine primario (o por
+# sqlite_read_engine, las conexiones de solo lectura del mismo archivo SQLite).
+def get_read_database_url():
+    """Obtiene la URL de la réplica de lectura, o None si no está configurada."""
+    read_url = os.getenv("DATABASE_READ_URL", "").strip()
+    if not read_url or read_url == DATABASE_URL:
+        return None
+    return read_url
+
+DATABASE_READ_URL = get_read_database_url()
+read_engine = create_engine(DATABASE_READ_URL, pool_pre_ping=True) if DATABASE_READ_URL else None
+if read_engine is not None and SQLITE_AJUSTES and _es_sqlite_en_archivo(read_engine.url):
+    ajustar_sqlite(read_engine)
+if read_engine is not None and REGISTRAR_QUERIES_LENTAS:
+    queries_lentas.instalar(read_engine)
+
+# Cada cuántos segundos se vuelve a verificar la réplica, y cuánto tiempo se
+# usa la primaria después de detectar que la réplica está caída
+REPLICA_CHECK_SECONDS = float(os.getenv("DATABASE_READ_CHECK_SECONDS", "10"))
+REPLICA_RETRY_SECONDS = float(os.getenv("DATABASE_READ_RETRY_SECONDS", "30"))
+
+_replica_verificada_en = 0.0   # Último chequeo exitoso de la réplica
+_replica_caida_hasta = 0.0     # Mientras monotonic() < este valor se usa la primaria
+
+def _marcar_replica_caida(error: Exception):
+    """Marca la réplica como no disponible durante REPLICA_RETRY_SECONDS."""
+    global _replica_caida_hasta, _replica_verificada_en
+    _replica_caida_hasta = time.monotonic() + REPLICA_RETRY_SECONDS
+    _replica_verificada_en = 0.0
+    print(f"[ERROR] Réplica de lectura no disponible, usando primaria por {REPLICA_RETRY_SECONDS:.0f}s: {error}")
+
+def get_read_engine():
+    """
+    Devuelve el engine a usar para lecturas públicas.
+    
+    - Sin réplica configurada: el engine primario (SQLite: sus lectores de solo lectura)
+    - Réplica marcada como caída: el engine primario hasta que venza el plazo
+    - Réplica sin verificar recientemente: hace un SELECT 1 barato y decide
+    
+    Returns:
+        Engine: read_engine si la réplica responde, engine en caso contrario
+                (sqlite_read_engine si no hay réplica y la base es SQLite)
+    """
+    global _replica_verificada_en
+    if read_engine is None:
+        return sqlite_read_engine if sqlite_read_engine is not None else engine
+
+    ahora = time.monotonic()
+    if ahora < _replica_caida_hasta:
+        return engine
+    if ahora - _replica_verificada_en < REPLICA_CHECK_SECONDS:
+        return read_engine
+
+    try:
+        with read_engine.connect() as conn:
+            conn.exec_driver_sql("SELECT 1")
+        _replica_verificada_en = ahora
+        return read_engine
+    except Exception as e:
+        _marcar_replica_caida(e)
+        return engine
+
+@contextmanager
+def read_session():
+    """
+    Sesión para lecturas públicas, enrutada a la réplica si está disponible.
+    
+    Si la réplica falla a mitad de una consulta se marca como caída, de modo
+    que las siguientes lecturas vayan directamente a la primaria.
+    
+    Uso:
+        with read_session() as session:
+            session.exec(select(...))
+    """
+    target = get_read_engine()
+    with Session(target) as session:
+        try:
+            yield session
+        except DBAPIError as e:
+            if target is read_engine:
+                _marcar_replica_caida(e)
+            raise
+
 def get_session():
     """
     Generador de sesiones de base de datos.
@@ -90,6 +267,241 @@ def get_session():
     with Session(engine) as session:
         yield session
 
+# ================================================================================
+# GENERACIÓN DEL CATÁLOGO - INVALIDACIÓN DE CACHES ENTRE WORKERS
+# ================================================================================
+#
+# Cada escritura de cursos o sedes incrementa catalog_generation.generation en
+# la MISMA transacción que la escritura. Los workers comparan ese entero con el
+# que tenían al cargar sus caches: si cambió, recargan. La consulta es un
+# SELECT por clave primaria y además se limita a una cada
+# CATALOG_GENERATION_POLL_SECONDS por proceso.
+
+CATALOG_GENERATION_POLL_SECONDS = float(os.getenv("CATALOG_GENERATION_POLL_SECONDS", "2"))
+
+_generacion_catalogo = 0              # Último valor leído por este proceso
+_generacion_leida_en = float("-inf")  # monotonic() de la última lectura
+
+def _incrementar_generacion_catalogo(session: Session) -> int:
+    """
+    Incrementa la generación del catálogo dentro de la transacción recibida.
+    
+    Debe llamarse antes del commit de toda escritura de cursos o sedes, para
+    que el cambio de datos y el de generación se confirmen (o se descarten)
+    juntos. El UPDATE bloquea la fila hasta el commit, así dos escrituras
+    concurrentes obtienen generaciones distintas.
+    
+    Args:
+        session: Sesión de la escritura en curso (sin confirmar)
+    
+    Returns:
+        int: Nueva generación (se guarda como `version` de lo escrito)
+    """
+    global _generacion_leida_en
+    result = session.exec(
+        update(CatalogGeneration)
+        .where(CatalogGeneration.id == 1)
+        .values(generation=CatalogGeneration.generation + 1)
+    )
+    # Forzar que este proceso relea la generación en la próxima consulta
+    _generacion_leida_en = float("-inf")
+    # Vaciar el cache del directorio cuando la escritura se confirme
+    event.listen(session, "after_commit", _invalidar_cache_directorio, once=True)
+    if result.rowcount == 0:
+        # Base creada con create_all() sin la migración: crear la fila única
+        session.add(CatalogGeneration(id=1, generation=1))
+        return 1
+    return session.exec(consultas.GENERACION_CATALOGO).one()
+
+def _marcar_version(generacion: int, *registros):
+    """Estampa updated_at y version en cursos o sedes que se están escribiendo."""
+    ahora = datetime.now(timezone.utc)
+    for registro in registros:
+        registro.updated_at = ahora
+        registro.version = generacion
+
+def _registrar_eliminacion(session: Session, generacion: int, entidad: str, entidad_id: int):
+    """Deja el tombstone de un curso o sede borrado en la transacción recibida."""
+    session.add(CatalogoEliminacion(
+        entidad=entidad,
+        entidad_id=entidad_id,
+        version=generacion,
+        eliminado_en=datetime.now(timezone.utc),
+    ))
+
+def obtener_generacion_catalogo() -> int:
+    """
+    Obtiene la generación actual del catálogo.
+    
+    Se lee desde la misma base que las lecturas públicas (réplica si está
+    disponible), así la generación siempre corresponde a los datos que se van
+    a cachear. El valor se reutiliza durante CATALOG_GENERATION_POLL_SECONDS
+    para que consultarla en cada evento no cueste una query.
+    
+    Returns:
+        int: Generación actual (0 si la tabla aún no tiene fila)
+    
+    Utilizado en:
+        - state.py: _invalidar_cache_si_cambio_catalogo()
+    """
+    global _generacion_catalogo, _generacion_leida_en
+    ahora = time.monotonic()
+    if ahora - _generacion_leida_en < CATALOG_GENERATION_POLL_SECONDS:
+        return _generacion_catalogo
+    try:
+        with read_session() as session:
+            generacion = session.exec(consultas.GENERACION_CATALOGO).first()
+        _generacion_catalogo = generacion or 0
+        _generacion_leida_en = ahora
+    except Exception as e:
+        print(f"[ERROR] Error al obtener generación del catálogo: {e}")
+    return _generacion_catalogo
+
+# === CACHE DEL DIRECTORIO DE SEDES E INSTITUCIONES ===
+# Resultados de obtener_sedes_como_tarjetas(), obtener_instituciones_con_cursos_virtuales(),
+# obtener_sedes_fisicas_indexadas(), obtener_instituciones_con_sedes_por_ciudad()
+# y las listas de nombres de los filtros, por argumentos (ver cache.py). Se
+# vacía al confirmar cualquier escritura de cursos o sedes de este worker y
+# cuando cambia la generación del catálogo.
+cache_directorio = CacheConsultas(
+    ttl=DIRECTORIO_CACHE_TTL_SECONDS,
+    max_entradas=DIRECTORIO_CACHE_MAX_ENTRADAS,
+    generacion=obtener_generacion_catalogo,
+)
+
+def _invalidar_cache_directorio(session: Session):
+    """Listener after_commit de las escrituras de cursos y sedes."""
+    cache_directorio.invalidar()
+
+# ================================================================================
+# MODELO DE LECTURA DEL CATÁLOGO (curso_catalogo)
+# ================================================================================
+#
+# curso_catalogo guarda cada curso ya unido con su institución y sus ciudades
+# (ver models.CursoCatalogo). Las escrituras de cursos lo actualizan dentro de
+# su propia transacción con _sincronizar_curso_catalogo(), así el catálogo
+# público y la exportación leen una sola tabla, sin joins ni agrupar ciudades.
+#
+# reconstruir_curso_catalogo() lo regenera completo: lo usan seed.py y
+# scripts/rebuild_catalog.py (después de cambios hechos fuera de la
+# aplicación, como renombrar una institución o su logo).
+
+def _filas_curso_catalogo(
+    session: Session,
+    consultas_filas: Tuple = consultas.FILAS_CATALOGO,
+    **parametros,
+) -> List[Dict[str, Any]]:
+    """
+    Arma las filas de curso_catalogo desde las tablas normalizadas (dos queries).
+    
+    Args:
+        session: Sesión abierta (ve las escrituras sin confirmar de la transacción)
+        consultas_filas: Par (ciudades, cursos) de consultas.py: FILAS_CATALOGO
+                         (todos los cursos), FILAS_CATALOGO_POR_CURSOS (curso_ids=...)
+                         o FILAS_CATALOGO_POR_INSTITUCION (institucion_id=...)
+        parametros: Valores de los parámetros ligados de esas consultas
+    
+    Returns:
+        List[Dict]: Filas con las columnas de CursoCatalogo, ordenadas por curso_id
+    """
+    consulta_ciudades, consulta_cursos = consultas_filas
+    ciudades_por_curso: Dict[int, List[Tuple[int, str]]] = {}
+    for curso_id, ciudad_id, ciudad in session.exec(consulta_ciudades, params=parametros):
+        ciudades_por_curso.setdefault(curso_id, []).append((ciudad_id, ciudad))
+
+    filas = []
+    for row in session.exec(consulta_cursos, params=parametros):
+        ciudades = ciudades_por_curso.get(row[0], [])
+        filas.append({
+            "curso_id": row[0],
+            "nombre": row[1],
+            "nivel": row[2],
+            "requisitos_ingreso": row[3],
+            "duracion_numero": row[4],
+            "duracion_unidad": row[5],
+            "informacion": row[6],
+            "institucion_id": row[7],
+            "institucion_nombre": row[8],
+            "institucion_logo": row[9],
+            "ciudad_ids": "," + "".join(f"{ciudad_id}," for ciudad_id, _ in ciudades),
+            "lugar": ", ".join(nombre for _, nombre in ciudades),
+            "texto_busqueda": normalizar_busqueda(f"{row[1]}\n{row[6] or ''}"),
+            "version": row[10],
+        })
+    return filas
+
+def _sincronizar_curso_catalogo(session: Session, curso_ids: Iterable[int]):
+    """
+    Reescribe las filas de curso_catalogo de `curso_ids` dentro de la transacción recibida.
+    
+    Debe llamarse después de _marcar_version() y antes del commit, para que la
+    fila copie la versión nueva y se confirme (o se descarte) junto con el
+    curso. Los cursos que ya no existen quedan solo borrados.
+    
+    Utilizado en:
+        - agregar_curso(), modificar_curso(), eliminar_curso() y _insertar_lote_cursos()
+    """
+    curso_ids = list(curso_ids)
+    session.exec(delete(CursoCatalogo).where(CursoCatalogo.curso_id.in_(curso_ids)))
+    filas = _filas_curso_catalogo(session, consultas.FILAS_CATALOGO_POR_CURSOS, curso_ids=curso_ids)
+    if filas:
+        session.connection().execute(insert(CursoCatalogo.__table__), filas)
+
+def reconstruir_curso_catalogo() -> int:
+    """
+    Regenera curso_catalogo completo desde las tablas normalizadas.
+    
+    Todo ocurre en una transacción que además incrementa la generación del
+    catálogo y estampa esa generación en cada fila, así los workers vuelven a
+    leer el catálogo entero.
+    
+    Returns:
+        int: Cantidad de cursos escritos
+    
+    Utilizado en:
+        - seed.py: al terminar de poblar la base
+        - scripts/rebuild_catalog.py
+    """
+    with Session(engine) as session:
+        generacion = _incrementar_generacion_catalogo(session)
+        session.exec(delete(CursoCatalogo))
+        filas = _filas_curso_catalogo(session)
+        for fila in filas:
+            fila["version"] = generacion
+        if filas:
+            session.connection().execute(insert(CursoCatalogo.__table__), filas)
+        session.commit()
+    print(f"[LOG] curso_catalogo reconstruido: {len(filas)} cursos (generación {generacion})")
+    return len(filas)
+
+def _curso_desde_catalogo(row) -> CursoRow:
+    """Fila de _COLUMNAS_LECTURA_CATALOGO con el formato de obtener_cursos()."""
+    return CursoRow(
+        row[0],
+        row[1],
+        row[2] or "N/A",
+        row[3] or "N/A",
+        row[4],
+        row[5],
+        row[6],
+        row[8] or "N/A",
+        row[7] or "N/A",
+    )
+
+def _curso_desde_fila_catalogo(fila: Dict[str, Any]) -> CursoRow:
+    """Fila de _filas_curso_catalogo() con el formato de obtener_cursos()."""
+    return CursoRow(
+        fila["curso_id"],
+        fila["nombre"],
+        fila["nivel"] or "N/A",
+        fila["requisitos_ingreso"] or "N/A",
+        fila["duracion_numero"],
+        fila["duracion_unidad"],
+        fila["informacion"],
+        fila["lugar"] or "N/A",
+        fila["institucion_nombre"] or "N/A",
+    )
+
 # ================================================================================
 # OPERACIONES DE LECTURA - INSTITUCIONES
 # ================================================================================
@@ -117,8 +529,7 @@ def obtener_instituciones() -> List[Dict[str, Any]]:
         ]
     
     Utilizado en:
-        - state.py: cargar_instituciones() para la galería
-        - pages/instituciones.py: Mostrar tarjetas de instituciones
+        - scripts/query_budget.py (presupuesto de queries)
         - Inicialización de datos para filtros
     
     Optimizaciones:
@@ -127,16 +538,11 @@ def obtener_instituciones() -> List[Dict[str, Any]]:
         - Fallback automático para logos faltantes
     """
     try:
-        with Session(engine) as session:
+        with read_session() as session:
             # === QUERY OPTIMIZADA ===
             # Selección directa de campos sin eager loading problemático
             # Evita cargar relaciones innecesarias que pueden causar recursión
-            query = select(
-                Institucion.id,
-                Institucion.nombre,
-                Institucion.logo
-            )
-            result = session.exec(query).all()
+            result = session.exec(consultas.INSTITUCIONES).all()
             
             # === CONSTRUCCIÓN DE RESPUESTA ===
             # Construcción manual para control total sobre el formato
@@ -154,6 +560,7 @@ def obtener_instituciones() -> List[Dict[str, Any]]:
         # Retorno seguro en caso de error - evita crashes de la UI
         return []
 
+@cache_directorio.cachear()
 def obtener_instituciones_con_sedes_por_ciudad(ciudad_nombre: str = None) -> List[Dict[str, Any]]:
     """
     Obtiene instituciones con sus sedes filtradas por ciudad.
@@ -188,45 +595,14 @@ def obtener_instituciones_con_sedes_por_ciudad(ciudad_nombre: str = None) -> Lis
         ]
     """
     try:
-        with Session(engine) as session:
+        with read_session() as session:
+            # Con y sin filtro de ciudad: la misma consulta base (consultas.py)
             if ciudad_nombre:
-                # Query con filtro por ciudad
-                query = select(
-                    Institucion.id,
-                    Institucion.nombre,
-                    Institucion.logo,
-                    Sede.id,
-                    Sede.direccion,
-                    Sede.telefono,
-                    Sede.email,
-                    Sede.web,
-                    Ciudad.nombre.label("ciudad_nombre")
-                ).join(
-                    Sede, Institucion.id == Sede.institucion_id
-                ).join(
-                    Ciudad, Sede.ciudad_id == Ciudad.id
-                ).where(
-                    Ciudad.nombre == ciudad_nombre
-                )
+                query = consultas.INSTITUCIONES_CON_SEDES_POR_CIUDAD
             else:
-                # Query sin filtro - todas las instituciones con sedes
-                query = select(
-                    Institucion.id,
-                    Institucion.nombre,
-                    Institucion.logo,
-                    Sede.id,
-                    Sede.direccion,
-                    Sede.telefono,
-                    Sede.email,
-                    Sede.web,
-                    Ciudad.nombre.label("ciudad_nombre")
-                ).join(
-                    Sede, Institucion.id == Sede.institucion_id
-                ).join(
-                    Ciudad, Sede.ciudad_id == Ciudad.id
-                )
+                query = consultas.INSTITUCIONES_CON_SEDES
             
-            result = session.exec(query).all()
+            result = session.exec(query, params={"ciudad_nombre": ciudad_nombre}).all()
             
             # Agrupar por institución
             instituciones_dict = {}
@@ -265,6 +641,7 @@ def obtener_instituciones_con_sedes_por_ciudad(ciudad_nombre: str = None) -> Lis
         print(f"[ERROR] Error al obtener instituciones con sedes: {e}")
         return []
 
+@cache_directorio.cachear()
 def obtener_instituciones_nombres() -> List[str]:
     """
     Obtiene solo los nombres de las instituciones para filtros y dropdowns.
@@ -285,12 +662,13 @@ def obtener_instituciones_nombres() -> List[str]:
     Optimización:
         - Solo carga el campo 'nombre', no toda la entidad
         - Usa DISTINCT para evitar duplicados (aunque no debería haberlos)
+        - Cacheada por proceso (cache_directorio): las sesiones nuevas no
+          consultan la base
     """
     try:
-        with Session(engine) as session:
+        with read_session() as session:
             # Query minimalista - solo nombres únicos
-            query = select(Institucion.nombre).distinct()
-            results = session.exec(query).all()
+            results = session.exec(consultas.INSTITUCIONES_NOMBRES).all()
             return [r for r in results]  # Conversión a lista simple
     except Exception as e:
         print(f"[ERROR] Error al obtener nombres de instituciones: {e}")
@@ -300,95 +678,277 @@ def obtener_instituciones_nombres() -> List[str]:
 # OPERACIONES DE LECTURA - CURSOS
 # ================================================================================
 
-def obtener_cursos() -> List[Dict[str, Any]]:
+def obtener_cursos() -> List[CursoRow]:
     """
     Obtiene todos los cursos del sistema con información de la institución y ciudades.
     
-    OPTIMIZADO: Elimina patrón N+1 usando JOIN para mejor performance en primera carga.
-    Una sola query en lugar de N+1 queries separadas.
+    Siempre dos queries sin importar la cantidad de cursos (ver
+    _filas_curso_catalogo): los cursos con su institución y, aparte, todas las
+    ciudades de todos los cursos. El presupuesto está verificado en
+    scripts/query_budget.py.
     
     Returns:
-        List[Dict]: Lista de cursos con datos relacionados
+        List[CursoRow]: Lista de cursos con datos relacionados, ordenada por id
     
     Estructura de retorno:
         [
-            {
-                "id": 1,
-                "nombre": "Licenciatura en Informática",
-                "nivel": "Universitario",
-                "requisitos_ingreso": "Bachillerato",
-                "duracion_numero": "4",
-                "duracion_unidad": "años",
-                "informacion": "Programa con fuerte énfasis...",
-                "institucion": "UDELAR – CENUR LN",
-                "lugar": "Salto, Paysandú"  # Ciudades separadas por coma
-            },
+            CursoRow(
+                id=1,
+                nombre="Licenciatura en Informática",
+                nivel="Universitario",
+                requisitos_ingreso="Bachillerato",
+                duracion_numero="4",
+                duracion_unidad="años",
+                informacion="Programa con fuerte énfasis...",
+                lugar="Salto, Paysandú",  # Ciudades separadas por coma
+                institucion="UDELAR – CENUR LN",
+            ),
             ...
         ]
     
     Utilizado en:
-        - state.py: cargar_cursos() para el buscador público
-        - pages/cursos.py: Datos para AG Grid y tabla
-        - Filtros y búsquedas en tiempo real
-    
-    OPTIMIZACIÓN COLD START:
-        - Una sola query con JOIN elimina N+1 pattern
-        - Incluye ciudades relacionadas en la misma query
-        - Mantiene compatibilidad con código existente
+        - Referencia del formato de curso que devuelven el catálogo
+          (CatalogoCursos.materializar) y el panel admin
+        - scripts/query_budget.py
     """
     try:
-        with Session(engine) as session:
-            print("[PERFORMANCE] obtener_cursos() - Iniciando query optimizada con JOIN")
-            
-            # === QUERY OPTIMIZADA CON JOIN PARA CURSOS, INSTITUCIONES Y CIUDADES ===
-            # Obtener cursos con sus instituciones y ciudades relacionadas
-            query = select(
-                Curso.id,
-                Curso.nombre,
-                Curso.nivel,
-                Curso.requisitos_ingreso,
-                Curso.duracion_numero,
-                Curso.duracion_unidad,
-                Curso.informacion,
-                Institucion.nombre.label('institucion_nombre')
-            ).join(Institucion, Curso.institucion_id == Institucion.id, isouter=True)
-            
-            result = session.exec(query).all()
-            
-            # === CONSTRUCCIÓN OPTIMIZADA CON CIUDADES ===
-            cursos_list = []
-            for row in result:
-                curso_id = row[0]
-                
-                # Obtener ciudades para este curso específico
-                ciudades_query = select(Ciudad.nombre).join(
-                    CursoCiudadLink, Ciudad.id == CursoCiudadLink.ciudad_id
-                ).where(CursoCiudadLink.curso_id == curso_id)
-                
-                ciudades_result = session.exec(ciudades_query).all()
-                # CORRECCIÓN: asegurar que siempre se toma el string completo
-                ciudades_nombres = [str(ciudad[0]) if isinstance(ciudad, tuple) else str(ciudad) for ciudad in ciudades_result]
-                lugar_str = ", ".join(ciudades_nombres) if ciudades_nombres else "N/A"
-                
-                cursos_list.append({
-                    "id": curso_id,
-                    "nombre": row[1],
-                    "nivel": row[2] or "N/A",                    # Fallback para datos faltantes
-                    "requisitos_ingreso": row[3] or "N/A",
-                    "duracion_numero": row[4],
-                    "duracion_unidad": row[5],
-                    "informacion": row[6],
-                    "lugar": lugar_str,  # Ciudades separadas por coma
-                    "institucion": row[7] or "N/A",  # Nombre de institución desde JOIN
-                })
-            
-            print(f"[PERFORMANCE] obtener_cursos() - ✅ OPTIMIZADO: {len(cursos_list)} cursos en 1 query (vs 12 queries antes)")
-            return cursos_list
+        with read_session() as session:
+            filas = _filas_curso_catalogo(session)
+        cursos_list = [_curso_desde_fila_catalogo(fila) for fila in filas]
+        print(f"[PERFORMANCE] obtener_cursos() - {len(cursos_list)} cursos en 2 queries")
+        return cursos_list
     except Exception as e:
         print(f"[ERROR] Error al obtener cursos: {e}")
         return []  # Retorno seguro
 
-def obtener_cursos_por_institucion(institucion_id: int) -> List[Dict[str, Any]]:
+# === CAMBIOS INCREMENTALES ===
+# Cada curso y sede guarda en `version` la generación del catálogo de su última
+# escritura, y los borrados quedan en catalogo_eliminacion. Con eso, quien
+# tenga el catálogo de la generación N puede pedir solo lo que cambió desde N.
+
+def cursos_cambiados_desde(generacion: int) -> Optional[Dict[str, Any]]:
+    """
+    Obtiene los cursos creados, editados o borrados después de una generación.
+    
+    La generación actual se lee ANTES que los cambios: si entra una escritura
+    en el medio, el curso aparece igual y vuelve a aparecer en la próxima
+    consulta (aplicar un cambio dos veces no tiene efecto).
+    
+    Args:
+        generacion: Generación del catálogo que ya tiene el llamador
+    
+    Returns:
+        Dict: {
+            "generacion": generación actual,
+            "cursos": CursoRow con version > generacion (como obtener_cursos()),
+            "eliminados": ids de cursos borrados después de generacion,
+        }
+        None si hubo un error (el llamador debe recargar todo)
+    
+    Utilizado en:
+        - obtener_cursos_catalogo(): actualización del catálogo compartido
+    """
+    try:
+        with read_session() as session:
+            actual = session.exec(consultas.GENERACION_CATALOGO).first() or 0
+
+            # Un recorrido de curso_catalogo por su índice de version
+            filas = session.exec(
+                consultas.CATALOGO_CURSOS_CAMBIADOS, params={"generacion": generacion}
+            ).all()
+
+            eliminados = session.exec(
+                consultas.ELIMINADOS_DESDE, params={"entidad": "curso", "generacion": generacion}
+            ).all()
+
+        cursos = [_curso_desde_catalogo(row) for row in filas]
+        return {"generacion": actual, "cursos": cursos, "eliminados": sorted(set(eliminados))}
+    except Exception as e:
+        print(f"[ERROR] Error al obtener cursos cambiados desde generación {generacion}: {e}")
+        return None
+
+def sedes_cambiadas_desde(generacion: int) -> Optional[Dict[str, Any]]:
+    """
+    Obtiene las sedes creadas, editadas o borradas después de una generación.
+    
+    Args:
+        generacion: Generación del catálogo que ya tiene el llamador
+    
+    Returns:
+        Dict: {"generacion", "sedes", "eliminados"} con la misma estructura de
+        sede que iterar_sedes_exportacion(). None si hubo un error.
+    """
+    try:
+        with read_session() as session:
+            actual = session.exec(consultas.GENERACION_CATALOGO).first() or 0
+
+            filas = session.exec(
+                select(
+                    Sede.id,
+                    Sede.institucion_id,
+                    Institucion.nombre,
+                    Ciudad.nombre,
+                    Sede.direccion,
+                    Sede.telefono,
+                    Sede.email,
+                    Sede.web,
+                ).join(
+                    Institucion, Sede.institucion_id == Institucion.id
+                ).join(
+                    Ciudad, Sede.ciudad_id == Ciudad.id
+                ).where(Sede.version > generacion).order_by(Sede.id)
+            ).all()
+
+            eliminados = session.exec(
+                consultas.ELIMINADOS_DESDE, params={"entidad": "sede", "generacion": generacion}
+            ).all()
+
+        sedes = [
+            {
+                "id": row[0],
+                "institucion_id": row[1],
+                "institucion": row[2],
+                "ciudad": row[3],
+                "direccion": row[4],
+                "telefono": row[5],
+                "email": row[6],
+                "web": row[7],
+            }
+            for row in filas
+        ]
+        return {"generacion": actual, "sedes": sedes, "eliminados": sorted(set(eliminados))}
+    except Exception as e:
+        print(f"[ERROR] Error al obtener sedes cambiadas desde generación {generacion}: {e}")
+        return None
+
+# === CATÁLOGO COMPARTIDO POR PROCESO ===
+# Una sola copia del catálogo de cursos por worker, compartida por todas las
+# sesiones. Se recarga cuando cambia la generación del catálogo (ver
+# catalog_generation), así varios workers cachean sin quedar desincronizados y
+# el State de cada sesión no necesita guardar el catálogo completo (lo que
+# mantiene chico el estado serializado en Redis en modo multi-worker).
+_catalogo_cursos = CatalogoCursos().cerrar()
+_catalogo_cursos_generacion = -1
+_catalogo_lock = threading.Lock()
+
+def _cargar_catalogo_cursos() -> Optional[CatalogoCursos]:
+    """
+    Construye el catálogo columnar completo con un recorrido de curso_catalogo.
+    
+    Las filas se vuelcan directamente en las columnas de CatalogoCursos, sin
+    armar un diccionario por curso. Si curso_catalogo está vacío pero hay
+    cursos (base sin reconstruir), se arma desde las tablas normalizadas.
+    
+    Returns:
+        Optional[CatalogoCursos]: Catálogo cargado, o None si falló la lectura
+        (un catálogo vacío significa que de verdad no hay cursos)
+    """
+    try:
+        with read_session() as session:
+            catalogo = CatalogoCursos()
+            for row in session.exec(consultas.CATALOGO_CURSOS):
+                catalogo.agregar(*row[:8], row[8].split(", ") if row[8] else ())
+
+            if not len(catalogo) and session.exec(consultas.HAY_CURSOS).first() is not None:
+                print("[ERROR] curso_catalogo está vacío: ejecutar python scripts/rebuild_catalog.py")
+                for fila in _filas_curso_catalogo(session):
+                    catalogo.agregar(
+                        fila["curso_id"], fila["nombre"], fila["nivel"], fila["requisitos_ingreso"],
+                        fila["duracion_numero"], fila["duracion_unidad"], fila["informacion"],
+                        fila["institucion_nombre"], fila["lugar"].split(", ") if fila["lugar"] else (),
+                    )
+        return catalogo.cerrar()
+    except Exception as e:
+        print(f"[ERROR] Error al cargar el catálogo de cursos: {e}")
+        return None
+
+def obtener_cursos_catalogo() -> CatalogoCursos:
+    """
+    Obtiene el catálogo completo de cursos desde el cache compartido del proceso.
+    
+    El catálogo es columnar (ver catalogo.py): se filtra con filtrar(), se
+    ordena con ordenar() y se convierte a filas CursoRow (formato de
+    obtener_cursos()) solo para las filas a mostrar con materializar(). Es
+    compartido entre sesiones y de solo lectura.
+    
+    Returns:
+        CatalogoCursos: Catálogo completo de la generación actual
+    
+    Utilizado en:
+        - state.py: cargar_cursos() y aplicar_filtros()
+    """
+    global _catalogo_cursos, _catalogo_cursos_generacion
+    generacion = obtener_generacion_catalogo()
+    if generacion == _catalogo_cursos_generacion:
+        return _catalogo_cursos
+
+    with _catalogo_lock:
+        # Otro hilo pudo haber recargado mientras esperábamos el lock
+        if generacion != _catalogo_cursos_generacion:
+            # Delta solo si la generación avanzó (si retrocedió, la base se recreó)
+            incremental = 0 <= _catalogo_cursos_generacion < generacion
+            cambios = cursos_cambiados_desde(_catalogo_cursos_generacion) if incremental else None
+            if cambios is not None and cambios["generacion"] >= generacion:
+                # Aplicar solo el delta sobre un catálogo NUEVO (las sesiones
+                # pueden estar recorriendo el anterior)
+                catalogo = _catalogo_cursos.con_cambios(cambios["cursos"], cambios["eliminados"])
+                print(f"[PERFORMANCE] Catálogo compartido actualizado: {len(cambios['cursos'])} cambiados, "
+                      f"{len(cambios['eliminados'])} eliminados (generación {generacion})")
+            else:
+                catalogo = _cargar_catalogo_cursos()
+                if catalogo is None:
+                    # Error de lectura: seguir sirviendo el último catálogo bueno
+                    # y no fijar la generación, así se reintenta en la próxima llamada
+                    print(f"[ERROR] Se mantiene el catálogo anterior ({len(_catalogo_cursos)} cursos)")
+                    return _catalogo_cursos
+                print(f"[PERFORMANCE] Catálogo compartido recargado: {len(catalogo)} cursos (generación {generacion})")
+            _catalogo_cursos = catalogo
+            _catalogo_cursos_generacion = generacion
+        return _catalogo_cursos
+
+def catalogo_cursos_cargado() -> bool:
+    """
+    Indica si el catálogo compartido viene de una carga exitosa.
+
+    obtener_cursos_catalogo() devuelve el último catálogo bueno (o uno vacío
+    al arrancar) cuando la lectura falla: esto distingue "sin cursos" de
+    "no se pudo leer".
+
+    Utilizado en:
+        - salud.py: paso catalogo_cursos de la precarga
+    """
+    return _catalogo_cursos_generacion >= 0
+
+# === AUTOCOMPLETADO ===
+# Sugerencias por prefijo sobre nombres de cursos e instituciones. El índice
+# (catalogo.IndicePrefijos) vive en el catálogo compartido, así que se rehace
+# con cada generación y cada consulta se resuelve en memoria.
+AUTOCOMPLETADO_SUGERENCIAS = int(os.getenv("AUTOCOMPLETADO_SUGERENCIAS", "8"))
+
+def obtener_sugerencias(texto: str, k: int = AUTOCOMPLETADO_SUGERENCIAS) -> List[Sugerencia]:
+    """
+    Obtiene las k sugerencias más relevantes para lo que se lleva escrito.
+    
+    Cada palabra escrita tiene que ser prefijo de una palabra del nombre, sin
+    importar mayúsculas ni tildes ("tec inf" → "Técnico en Informática").
+    Primero el nombre escrito completo, después por cantidad de cursos y en
+    orden alfabético. No consulta la base (salvo la verificación periódica de
+    la generación del catálogo).
+    
+    Args:
+        texto: Texto de la búsqueda tal como lo escribió el usuario
+        k: Cantidad máxima de sugerencias
+    
+    Returns:
+        List[Sugerencia]: Nombres con su tipo ("curso" o "institucion")
+    
+    Utilizado en:
+        - state.py: actualizar_busqueda_texto() (una vez por tecla)
+        - api.py: GET /api/autocompletar
+    """
+    return obtener_cursos_catalogo().sugerencias(texto, k)
+
+def obtener_cursos_por_institucion(institucion_id: int) -> List[CursoRow]:
     """
     Obtiene todos los cursos de una institución específica con sus ciudades.
     
@@ -400,8 +960,8 @@ def obtener_cursos_por_institucion(institucion_id: int) -> List[Dict[str, Any]]:
         institucion_id: ID de la institución cuyos cursos se quieren obtener
     
     Returns:
-        List[Dict]: Lista de cursos de la institución especificada
-                   Retorna lista vacía si la institución no existe
+        List[CursoRow]: Lista de cursos de la institución especificada
+                        Retorna lista vacía si la institución no existe
     
     Utilizado en:
         - state.py: cargar_cursos_admin() para el panel administrativo
@@ -423,37 +983,15 @@ def obtener_cursos_por_institucion(institucion_id: int) -> List[Dict[str, Any]]:
                 print(f"[LOG] Institución no encontrada con ID: {institucion_id}")
                 return []
 
-            # === QUERY FILTRADA ===
-            # Obtener solo cursos de la institución específica
-            cursos_db = session.exec(
-                select(Curso).where(Curso.institucion_id == institucion_id)
-            ).all()
-            
-            # === CONSTRUCCIÓN DE RESPUESTA CON CIUDADES ===
-            cursos_list = []
-            for curso in cursos_db:
-                # Obtener ciudades para este curso específico
-                ciudades_query = select(Ciudad.nombre).join(
-                    CursoCiudadLink, Ciudad.id == CursoCiudadLink.ciudad_id
-                ).where(CursoCiudadLink.curso_id == curso.id)
-                
-                ciudades_result = session.exec(ciudades_query).all()
-                # BUG FIX: ciudades_result es lista de tuplas (('Salto',),), no strings. Antes se hacía ciudad[0], lo que daba solo la inicial si era string.
-                # Ahora, siempre tomamos el string completo:
-                ciudades_nombres = [str(ciudad[0]) if isinstance(ciudad, tuple) else str(ciudad) for ciudad in ciudades_result]
-                lugar_str = ", ".join(ciudades_nombres) if ciudades_nombres else "N/A"
-                
-                cursos_list.append({
-                    "id": curso.id,
-                    "nombre": curso.nombre,
-                    "nivel": curso.nivel or "N/A",
-                    "requisitos_ingreso": curso.requisitos_ingreso or "N/A",
-                    "duracion_numero": curso.duracion_numero,
-                    "duracion_unidad": curso.duracion_unidad,
-                    "informacion": curso.informacion,
-                    "lugar": lugar_str,  # Ciudades separadas por coma
-                    "institucion": institucion.nombre,  # Ya verificamos que existe
-                })
+            # === CURSOS Y CIUDADES EN DOS QUERIES ===
+            # Las ciudades de todos los cursos de la institución van en una
+            # sola query (no una por curso)
+            cursos_list = [
+                _curso_desde_fila_catalogo(fila)
+                for fila in _filas_curso_catalogo(
+                    session, consultas.FILAS_CATALOGO_POR_INSTITUCION, institucion_id=institucion_id
+                )
+            ]
             
             print(f"[LOG] Cursos obtenidos para institución {institucion.nombre} (ID: {institucion_id}): {len(cursos_list)}")
             return cursos_list
@@ -461,6 +999,82 @@ def obtener_cursos_por_institucion(institucion_id: int) -> List[Dict[str, Any]]:
         print(f"[ERROR] Error al obtener cursos por institución: {e}")
         return []
 
+# === PANEL ADMIN: PÁGINA ORDENADA ===
+# Columnas de orden en consultas.COLUMNAS_ORDEN_ADMIN (una consulta preconstruida por orden)
+ADMIN_CURSOS_POR_PAGINA = int(os.getenv("ADMIN_CURSOS_POR_PAGINA", "25"))
+
+def obtener_pagina_cursos_institucion(
+    institucion_id: int,
+    orden: str = "nombre",
+    descendente: bool = False,
+    pagina: int = 1,
+    por_pagina: int = ADMIN_CURSOS_POR_PAGINA,
+) -> Dict[str, Any]:
+    """
+    Obtiene una página de los cursos de una institución, ordenada en la base.
+    
+    El orden y el LIMIT/OFFSET se resuelven en SQL y las ciudades se traen en
+    una sola query para los cursos de la página, así el costo (y lo que se
+    envía al navegador) depende del tamaño de página y no de cuántos cursos
+    tenga la institución.
+    
+    Args:
+        institucion_id: ID de la institución del admin
+        orden: Clave de COLUMNAS_ORDEN_ADMIN (las desconocidas usan "nombre")
+        descendente: Orden descendente
+        pagina: Número de página (desde 1)
+        por_pagina: Cursos por página
+    
+    Returns:
+        Dict: {"cursos": [CursoRow, ...], "total": int} con cursos en el
+        formato de obtener_cursos_por_institucion()
+    
+    Utilizado en:
+        - state.py: cargar_cursos_admin() y los handlers de orden/paginación
+    """
+    try:
+        with Session(engine) as session:
+            total = session.exec(
+                consultas.TOTAL_CURSOS_INSTITUCION, params={"institucion_id": institucion_id}
+            ).one()
+
+            if orden not in COLUMNAS_ORDEN_ADMIN:
+                orden = "nombre"
+            filas = session.exec(
+                consultas.PAGINA_CURSOS_INSTITUCION[(orden, bool(descendente))],
+                params={
+                    "institucion_id": institucion_id,
+                    "desde": (max(pagina, 1) - 1) * por_pagina,
+                    "por_pagina": por_pagina,
+                },
+            ).all()
+
+            ciudades_por_curso: Dict[int, List[str]] = {}
+            if filas:
+                for curso_id, ciudad in session.exec(
+                    consultas.CIUDADES_DE_CURSOS, params={"curso_ids": [row[0] for row in filas]}
+                ):
+                    ciudades_por_curso.setdefault(curso_id, []).append(ciudad)
+
+        cursos = [
+            CursoRow(
+                row[0],
+                row[1],
+                row[2] or "N/A",
+                row[3] or "N/A",
+                row[4],
+                row[5],
+                row[6],
+                ", ".join(ciudades_por_curso.get(row[0], [])) or "N/A",
+                row[7],
+            )
+            for row in filas
+        ]
+        return {"cursos": cursos, "total": total}
+    except Exception as e:
+        print(f"[ERROR] Error al obtener página de cursos de institución {institucion_id}: {e}")
+        return {"cursos": [], "total": 0}
+
 # ================================================================================
 # FUNCIONES DE COMPATIBILIDAD - CONSTANTES DINÁMICAS
 # ================================================================================
@@ -508,6 +1122,7 @@ def obtener_requisitos() -> List[str]:
         # Fallback hardcodeado
         return ["Ciclo básico", "Bachillerato", "Terciario"]
 
+@cache_directorio.cachear()
 def obtener_ciudades_nombres() -> List[str]:
     """
     Obtiene solo los nombres de las ciudades para filtros y dropdowns.
@@ -528,12 +1143,13 @@ def obtener_ciudades_nombres() -> List[str]:
     Optimización:
         - Solo carga el campo 'nombre', no toda la entidad
         - Usa DISTINCT para evitar duplicados (aunque no debería haberlos)
+        - Cacheada por proceso (cache_directorio): las sesiones nuevas no
+          consultan la base
     """
     try:
-        with Session(engine) as session:
+        with read_session() as session:
             # Query minimalista - solo nombres únicos
-            query = select(Ciudad.nombre).distinct()
-            results = session.exec(query).all()
+            results = session.exec(consultas.CIUDADES_NOMBRES).all()
             return [r for r in results]  # Conversión a lista simple
     except Exception as e:
         print(f"[ERROR] Error al obtener nombres de ciudades: {e}")
@@ -574,7 +1190,7 @@ def obtener_usuario_por_correo(correo: str) -> Optional[Usuario]:
     Obtiene un usuario por su correo electrónico con carga eager de institución.
     
     Esta función es CRÍTICA para el sistema de autenticación. Utiliza
-    selectinload para cargar la institución del usuario en la misma query,
+    joinedload para cargar la institución del usuario en la misma query,
     evitando el error DetachedInstanceError que ocurre cuando se accede
     a relaciones después de cerrar la sesión.
     
@@ -590,7 +1206,8 @@ def obtener_usuario_por_correo(correo: str) -> Optional[Usuario]:
         - Verificación de existencia de usuarios
     
     Patrón crítico:
-        - selectinload(Usuario.institucion) carga la relación en la misma query
+        - joinedload(Usuario.institucion) carga la relación en la misma query
+          (LEFT OUTER JOIN; selectinload haría una segunda query)
         - Evita lazy loading que fallaría después del cierre de sesión
         - Permite acceso a usuario.institucion.nombre fuera de la sesión
     
@@ -601,19 +1218,124 @@ def obtener_usuario_por_correo(correo: str) -> Optional[Usuario]:
     try:
         with Session(engine) as session:
             # === QUERY CON EAGER LOADING ===
-            # selectinload es CRÍTICO para cargar la relación institución
-            # en la misma query y evitar DetachedInstanceError
-            statement = select(Usuario).options(selectinload(Usuario.institucion)).where(Usuario.correo == correo)
-            usuario = session.exec(statement).one_or_none()
+            # consultas.USUARIO_POR_CORREO usa joinedload: CRÍTICO para cargar
+            # la relación institución en la misma query y evitar DetachedInstanceError
+            usuario = session.exec(consultas.USUARIO_POR_CORREO, params={"correo": correo}).one_or_none()
             return usuario
     except Exception as e:
         print(f"[ERROR] Error al obtener usuario por correo: {e}")
         return None
 
+# ================================================================================
+# SINCRONIZACIÓN DE RELACIONES MANY-TO-MANY
+# ================================================================================
+#
+# En lugar de borrar todos los links de una entidad y volver a insertarlos,
+# se compara el conjunto actual con el pedido y solo se tocan las diferencias:
+# un DELETE para los que sobran y un INSERT (executemany) para los que faltan.
+# Los links que no cambian no se reescriben, así que editar un curso sin tocar
+# sus ciudades no genera escrituras en la tabla intermedia ni en sus índices.
+# ================================================================================
+
+def sincronizar_relacion(
+    session: Session,
+    tabla_link,
+    columna_origen: str,
+    origen_id: int,
+    columna_destino: str,
+    destino_ids: Iterable[int],
+) -> Tuple[set, set]:
+    """
+    Deja los links de `origen_id` en una tabla intermedia iguales a `destino_ids`.
+
+    No hace commit: las operaciones quedan en la transacción de `session`.
+
+    Args:
+        session: Sesión abierta (la transacción del llamador)
+        tabla_link: Modelo o Table de la relación (p. ej. CursoCiudadLink)
+        columna_origen: Columna del lado "dueño" (p. ej. "curso_id")
+        origen_id: ID de la entidad dueña
+        columna_destino: Columna del otro lado (p. ej. "ciudad_id")
+        destino_ids: IDs que deben quedar vinculados
+
+    Returns:
+        Tuple[set, set]: (ids agregados, ids eliminados)
+
+    Utilizado en:
+        - modificar_curso(): ciudades de un curso (curso_ciudad)
+    """
+    tabla = getattr(tabla_link, "__table__", tabla_link)
+    col_origen = tabla.c[columna_origen]
+    col_destino = tabla.c[columna_destino]
+
+    actuales = set(session.exec(select(col_destino).where(col_origen == origen_id)).all())
+    pedidos = set(destino_ids)
+    agregar = pedidos - actuales
+    eliminar = actuales - pedidos
+
+    if eliminar:
+        session.exec(
+            tabla.delete().where(col_origen == origen_id, col_destino.in_(eliminar))
+        )
+    if agregar:
+        session.connection().execute(
+            insert(tabla),
+            [{columna_origen: origen_id, columna_destino: destino_id} for destino_id in sorted(agregar)],
+        )
+    return agregar, eliminar
+
 # ================================================================================
 # OPERACIONES DE ESCRITURA - CRUD DE CURSOS
 # ================================================================================
 
+# === FILAS EN FORMATO DE PANTALLA ===
+# Las escrituras devuelven el registro tal como lo muestra el panel admin
+# (CursoRow o SedeRow, como obtener_cursos_por_institucion() y
+# obtener_sedes_fisicas_por_institucion()), para que state.py actualice solo
+# esa fila en lugar de recargar la lista completa.
+
+def _curso_para_admin(session: Session, curso: Curso) -> CursoRow:
+    """Arma la fila de un curso como la muestra el panel admin."""
+    ciudades = session.exec(
+        select(Ciudad.nombre).join(
+            CursoCiudadLink, Ciudad.id == CursoCiudadLink.ciudad_id
+        ).where(CursoCiudadLink.curso_id == curso.id)
+    ).all()
+    institucion = session.get(Institucion, curso.institucion_id)
+    return CursoRow(
+        curso.id,
+        curso.nombre,
+        curso.nivel or "N/A",
+        curso.requisitos_ingreso or "N/A",
+        curso.duracion_numero,
+        curso.duracion_unidad,
+        curso.informacion,
+        ", ".join(ciudades) if ciudades else "N/A",
+        institucion.nombre if institucion else "N/A",
+    )
+
+def _sede_para_admin(session: Session, sede: Sede, ciudad: str) -> SedeRow:
+    """Arma la fila de una sede como la muestra el panel admin."""
+    institucion = session.get(Institucion, sede.institucion_id)
+    return SedeRow(
+        sede.id,
+        f"Sede en {ciudad}",
+        sede.direccion or "No disponible",
+        sede.telefono or "No disponible",
+        sede.email or "No disponible",
+        sede.web or "No disponible",
+        ciudad,
+        institucion.nombre if institucion else None,
+    )
+
+def _ids_de_ciudades(session: Session, nombres) -> List[int]:
+    """Resuelve nombres de ciudad (lista o string suelto) a sus IDs."""
+    if not isinstance(nombres, list):
+        nombres = [nombres]
+    if not nombres:
+        return []
+    return session.exec(select(Ciudad.id).where(Ciudad.nombre.in_(nombres))).all()
+
 def agregar_curso(datos_curso: dict):
     """
     Agrega un nuevo curso a la base de datos con validaciones completas.
@@ -631,9 +1353,13 @@ def agregar_curso(datos_curso: dict):
                         "duracion_unidad": "años",
                         "requisitos_ingreso": "Bachillerato",
                         "informacion": "Programa con fuerte énfasis...",
-                        "institucion_id": 1
+                        "institucion_id": 1,
+                        "ciudades": ["Salto", "Virtual"]
                     }
     
+    Returns:
+        CursoRow: El curso creado en el formato de obtener_cursos_por_institucion()
+    
     Raises:
         ValueError: Si algún campo no cumple las validaciones
         Exception: Para otros errores de base de datos
@@ -679,15 +1405,26 @@ def agregar_curso(datos_curso: dict):
                 duracion_numero=datos_curso.get("duracion_numero"),
                 duracion_unidad=datos_curso.get("duracion_unidad"),
                 requisitos_ingreso=datos_curso.get("requisitos_ingreso"),
-                lugar=datos_curso.get("lugar"),
                 informacion=datos_curso.get("informacion"),
                 institucion_id=datos_curso.get("institucion_id")  # FK ya validada por constraints
             )
             
             # === PERSISTENCIA ===
             session.add(nuevo_curso)
+            _marcar_version(_incrementar_generacion_catalogo(session), nuevo_curso)
+            session.flush()  # Asigna el id para los links de ciudades
+            
+            # === CIUDADES (relación many-to-many) ===
+            sincronizar_relacion(
+                session, CursoCiudadLink, "curso_id", nuevo_curso.id, "ciudad_id",
+                _ids_de_ciudades(session, datos_curso.get("ciudades") or []),
+            )
+            _sincronizar_curso_catalogo(session, [nuevo_curso.id])
+            
+            fila = _curso_para_admin(session, nuevo_curso)
             session.commit()  # Persistir en base de datos
             print(f"[LOG] Curso agregado exitosamente: {datos_curso.get('nombre')}")
+            return fila
             
     except Exception as e:
         print(f"[ERROR] Error al agregar curso: {e}")
@@ -706,6 +1443,9 @@ def modificar_curso(curso_id: int, datos_curso: dict):
         datos_curso: Diccionario con los campos a actualizar
                     Solo los campos presentes se modificarán
     
+    Returns:
+        CursoRow: El curso modificado en el formato de obtener_cursos_por_institucion()
+    
     Raises:
         ValueError: Si el curso no existe o si algún campo no es válido
         Exception: Para otros errores de base de datos
@@ -765,26 +1505,23 @@ def modificar_curso(curso_id: int, datos_curso: dict):
 
             # === ACTUALIZAR CIUDADES (relación many-to-many) ===
             if "ciudades" in datos_curso:
-                # Eliminar links actuales
-                session.exec(
-                    CursoCiudadLink.__table__.delete().where(CursoCiudadLink.curso_id == curso_id)
+                # Solo se insertan/borran los links que cambiaron
+                agregadas, eliminadas = sincronizar_relacion(
+                    session, CursoCiudadLink, "curso_id", curso_id, "ciudad_id",
+                    _ids_de_ciudades(session, datos_curso["ciudades"]),
                 )
-                # Buscar los IDs de las ciudades seleccionadas
-                ciudades_nombres = datos_curso["ciudades"]
-                if not isinstance(ciudades_nombres, list):
-                    ciudades_nombres = [ciudades_nombres]
-                ciudades_objs = session.exec(
-                    select(Ciudad).where(Ciudad.nombre.in_(ciudades_nombres))
-                ).all()
-                # Crear nuevos links
-                for ciudad in ciudades_objs:
-                    link = CursoCiudadLink(curso_id=curso_id, ciudad_id=ciudad.id)
-                    session.add(link)
+                if agregadas or eliminadas:
+                    print(f"[LOG] Curso {curso_id}: ciudades +{len(agregadas)} -{len(eliminadas)}")
 
             # === PERSISTENCIA ===
             session.add(curso)  # Marca el objeto como modificado
+            # La versión cambia también si solo cambiaron las ciudades
+            _marcar_version(_incrementar_generacion_catalogo(session), curso)
+            _sincronizar_curso_catalogo(session, [curso_id])
+            fila = _curso_para_admin(session, curso)
             session.commit()
-            print(f"[LOG] Curso {curso_id} modificado exitosamente: {curso.nombre}")
+            print(f"[LOG] Curso {curso_id} modificado exitosamente: {fila.nombre}")
+            return fila
             
     except Exception as e:
         print(f"[ERROR] Error al modificar curso: {e}")
@@ -830,6 +1567,8 @@ def eliminar_curso(curso_id: int):
             # Eliminar permanentemente de la base de datos
             nombre_curso = curso.nombre  # Guardar para logging
             session.delete(curso)
+            _registrar_eliminacion(session, _incrementar_generacion_catalogo(session), "curso", curso_id)
+            _sincronizar_curso_catalogo(session, [curso_id])
             session.commit()
             print(f"[LOG] Curso {curso_id} ({nombre_curso}) eliminado exitosamente")
             
@@ -837,12 +1576,174 @@ def eliminar_curso(curso_id: int):
         print(f"[ERROR] Error al eliminar curso: {e}")
         raise e  # Re-raise para manejo en state.py
 
+# ================================================================================
+# OPERACIONES DE ESCRITURA - IMPORTACIÓN MASIVA DE CURSOS
+# ================================================================================
+
+# Cursos insertados por transacción durante una importación
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "200"))
+
+def _validar_fila_curso(fila: Dict[str, str], ciudades_por_nombre: Dict[str, int]) -> Tuple[List[str], List[int]]:
+    """
+    Valida una fila de importación con las mismas reglas que agregar_curso().
+    
+    Args:
+        fila: Columnas normalizadas de la fila (ver importacion.py)
+        ciudades_por_nombre: Mapa nombre → id de todas las ciudades
+    
+    Returns:
+        Tuple: (lista de errores, ids de ciudades resueltas)
+    """
+    errores = []
+    nombre = fila.get("nombre", "")
+    if not nombre:
+        errores.append("El nombre es obligatorio")
+    elif len(nombre) > ValidationConstants.MAX_NOMBRE_CURSO:
+        errores.append(f"Nombre demasiado largo (máximo {ValidationConstants.MAX_NOMBRE_CURSO} caracteres)")
+    if not ValidationConstants.validate_nivel(fila.get("nivel", "")):
+        errores.append(f"Nivel inválido: '{fila.get('nivel', '')}'")
+    if not ValidationConstants.validate_duracion_numero(fila.get("duracion_numero", "")):
+        errores.append(f"Duración número inválido: '{fila.get('duracion_numero', '')}'")
+    if not ValidationConstants.validate_duracion_unidad(fila.get("duracion_unidad", "")):
+        errores.append(f"Duración unidad inválida: '{fila.get('duracion_unidad', '')}'")
+    if not ValidationConstants.validate_requisitos(fila.get("requisitos_ingreso", "")):
+        errores.append(f"Requisito inválido: '{fila.get('requisitos_ingreso', '')}'")
+    if len(fila.get("informacion", "")) > ValidationConstants.MAX_INFORMACION:
+        errores.append(f"Información demasiado larga (máximo {ValidationConstants.MAX_INFORMACION} caracteres)")
+
+    ciudad_ids = []
+    nombres_ciudades = [c.strip() for c in fila.get("ciudades", "").replace(";", ",").split(",") if c.strip()]
+    for nombre_ciudad in nombres_ciudades:
+        ciudad_id = ciudades_por_nombre.get(nombre_ciudad)
+        if ciudad_id is None:
+            errores.append(f"Ciudad desconocida: '{nombre_ciudad}'")
+        elif ciudad_id not in ciudad_ids:
+            ciudad_ids.append(ciudad_id)
+    return errores, ciudad_ids
+
+def _insertar_lote_cursos(lote: List[Tuple[int, Dict[str, str], List[int]]], institucion_id: int, reporte: Dict[str, Any]):
+    """
+    Inserta un lote de filas ya validadas en una única transacción.
+    
+    Los cursos se insertan juntos (flush con RETURNING de ids) y luego todos
+    sus links curso_ciudad en un solo executemany. Si la transacción falla,
+    todas las filas del lote se reportan con el error.
+    """
+    try:
+        with Session(engine) as session:
+            cursos = [
+                Curso(
+                    nombre=fila["nombre"],
+                    nivel=fila["nivel"],
+                    duracion_numero=fila["duracion_numero"],
+                    duracion_unidad=fila["duracion_unidad"],
+                    requisitos_ingreso=fila["requisitos_ingreso"],
+                    informacion=fila.get("informacion") or None,
+                    institucion_id=institucion_id,
+                )
+                for _, fila, _ in lote
+            ]
+            # Versión antes del flush: se inserta en el mismo INSERT
+            _marcar_version(_incrementar_generacion_catalogo(session), *cursos)
+            session.add_all(cursos)
+            session.flush()  # Asigna los ids de todo el lote
+
+            links = [
+                {"curso_id": curso.id, "ciudad_id": ciudad_id}
+                for curso, (_, _, ciudad_ids) in zip(cursos, lote)
+                for ciudad_id in ciudad_ids
+            ]
+            if links:
+                session.connection().execute(insert(CursoCiudadLink.__table__), links)
+            _sincronizar_curso_catalogo(session, [curso.id for curso in cursos])
+
+            session.commit()
+            reporte["insertados"] += len(lote)
+    except Exception as e:
+        print(f"[ERROR] Error al insertar lote de importación: {e}")
+        for numero_fila, fila, _ in lote:
+            reporte["errores"].append({
+                "fila": numero_fila,
+                "nombre": fila.get("nombre", ""),
+                "errores": [f"Error de base de datos: {e}"],
+            })
+
+def importar_cursos(filas: Iterable[Dict[str, str]], institucion_id: int, tamano_lote: int = IMPORT_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Importa cursos en bloque para una institución, con reporte por fila.
+    
+    Recorre las filas una sola vez: cada fila se valida contra
+    ValidationConstants y sus ciudades se resuelven contra un mapa cargado con
+    una única consulta. Las filas válidas se acumulan e insertan por lotes de
+    `tamano_lote` cursos por transacción; las inválidas se reportan sin
+    detener la importación. Si el archivo no se puede seguir leyendo
+    (ValueError del lector), los lotes ya confirmados quedan y el reporte lo
+    indica en "interrumpido".
+    
+    Args:
+        filas: Iterador de diccionarios (ver importacion.leer_filas)
+        institucion_id: Institución del admin que importa (no se lee del archivo)
+        tamano_lote: Cursos por transacción
+    
+    Returns:
+        Dict: {
+            "total": filas procesadas,
+            "insertados": cursos creados,
+            "errores": [{"fila": 3, "nombre": "...", "errores": ["Nivel inválido: ..."]}],
+            "interrumpido": "" o el error de lectura que detuvo la importación
+        }
+    
+    Utilizado en:
+        - state.py: handle_import_cursos() desde el panel /admin
+    """
+    reporte = {"total": 0, "insertados": 0, "errores": [], "interrumpido": ""}
+
+    # === RESOLUCIÓN DE CIUDADES EN UNA SOLA CONSULTA ===
+    with Session(engine) as session:
+        ciudades_por_nombre = {nombre: ciudad_id for ciudad_id, nombre in session.exec(select(Ciudad.id, Ciudad.nombre)).all()}
+
+    lote = []
+    filas = iter(filas)
+    numero_fila = 1  # La fila 1 del archivo son los encabezados
+    while True:
+        try:
+            fila = next(filas)
+        except StopIteration:
+            break
+        except ValueError as e:
+            if numero_fila == 1:
+                raise  # Encabezados inválidos: no se insertó nada
+            # Error de lectura a mitad del archivo: se detiene, se insertan las
+            # filas válidas ya leídas y el reporte dice dónde se cortó
+            reporte["interrumpido"] = f"Lectura detenida después de la fila {numero_fila}: {e}"
+            break
+        numero_fila += 1
+        if not fila:
+            continue  # Fila vacía
+        reporte["total"] += 1
+        errores, ciudad_ids = _validar_fila_curso(fila, ciudades_por_nombre)
+        if errores:
+            reporte["errores"].append({"fila": numero_fila, "nombre": fila.get("nombre", ""), "errores": errores})
+            continue
+        lote.append((numero_fila, fila, ciudad_ids))
+        if len(lote) >= tamano_lote:
+            _insertar_lote_cursos(lote, institucion_id, reporte)
+            lote = []
+    if lote:
+        _insertar_lote_cursos(lote, institucion_id, reporte)
+
+    if reporte["interrumpido"]:
+        print(f"[ERROR] Importación para institución {institucion_id} interrumpida: {reporte['interrumpido']}")
+    print(f"[LOG] Importación para institución {institucion_id}: {reporte['insertados']}/{reporte['total']} cursos, {len(reporte['errores'])} filas con errores")
+    return reporte
+
 # ================================================================================
 # NOTAS IMPORTANTES SOBRE OPERACIONES CRUD
 # ================================================================================
 #
 # TRANSACCIONES:
 # - Cada operación usa su propia sesión y transacción
+# - Toda escritura de cursos/sedes incrementa catalog_generation en la misma transacción
 # - Commit automático al final de operaciones exitosas
 # - Rollback automático en caso de excepción
 #
@@ -866,7 +1767,8 @@ def eliminar_curso(curso_id: int):
 # - Verificación de existencia antes de operaciones
 # - No se revelan detalles internos en mensajes de error públicos
 
-def obtener_sedes_como_tarjetas(ciudad_nombre: str = None) -> List[Dict[str, Any]]:
+@cache_directorio.cachear()
+def obtener_sedes_como_tarjetas(ciudad_nombre: str = None) -> List[TarjetaInstitucion]:
     """
     Obtiene las instituciones que tienen sedes en una ciudad específica como tarjetas.
     
@@ -878,80 +1780,56 @@ def obtener_sedes_como_tarjetas(ciudad_nombre: str = None) -> List[Dict[str, Any
         ciudad_nombre: Nombre de la ciudad para filtrar (opcional)
     
     Returns:
-        List[Dict]: Lista de tarjetas de instituciones
+        List[TarjetaInstitucion]: Lista de tarjetas de instituciones
                    Cada tarjeta representa una institución que tiene sede en la ciudad
     
     Estructura de retorno:
         [
-            {
-                "id": 1,
-                "nombre": "UDELAR – CENUR LN",
-                "logo": "/logos/logo-cenur.png",
-                "institucion_nombre": "UDELAR – CENUR LN",
-                "sede_id": 1,
-                "direccion": "Rivera 1350",
-                "telefono": "47334816",
-                "email": "comunicacion@unorte.edu.uy",
-                "web": "https://www.litoralnorte.udelar.edu.uy/",
-                "ciudad": "Salto"
-            }
+            TarjetaInstitucion(
+                id=1,
+                nombre="UDELAR – CENUR LN",
+                logo="/logos/logo-cenur.png",
+                institucion_id=1,
+                institucion_nombre="UDELAR – CENUR LN",
+                sede_id=1,
+                direccion="Rivera 1350",
+                telefono="47334816",
+                email="comunicacion@unorte.edu.uy",
+                web="https://www.litoralnorte.udelar.edu.uy/",
+                ciudad="Salto",
+            )
         ]
     """
     try:
-        with Session(engine) as session:
-            # Query base que excluye sedes virtuales y agrupa por institución
-            base_query = select(
-                Institucion.id,
-                Institucion.nombre,
-                Institucion.logo,
-                Sede.id,
-                Sede.direccion,
-                Sede.telefono,
-                Sede.email,
-                Sede.web,
-                Ciudad.nombre.label("ciudad_nombre")
-            ).join(
-                Sede, Institucion.id == Sede.institucion_id
-            ).join(
-                Ciudad, Sede.ciudad_id == Ciudad.id
-            ).where(
-                Ciudad.nombre != "Virtual"  # Excluir sedes virtuales
-            )
-            
-            # Aplicar filtro de ciudad si se especifica
+        with read_session() as session:
+            # Sedes no virtuales, con filtro de ciudad si se especifica (consultas.py)
             if ciudad_nombre:
-                base_query = base_query.where(Ciudad.nombre == ciudad_nombre)
+                base_query = consultas.SEDES_TARJETAS_POR_CIUDAD
+            else:
+                base_query = consultas.SEDES_TARJETAS
             
-            result = session.exec(base_query).all()
+            result = session.exec(base_query, params={"ciudad_nombre": ciudad_nombre}).all()
             
             # Agrupar por institución para evitar duplicados
             instituciones_por_id = {}
             for row in result:
-                institucion_id = row[0]
-                institucion_nombre = row[1]
-                logo = row[2] or "/logos/logoutu.png"
-                sede_id = row[3]
-                direccion = row[4]
-                telefono = row[5]
-                email = row[6]
-                web = row[7]
-                ciudad = row[8]
+                institucion_id, institucion_nombre, logo, sede_id, direccion, telefono, email, web, ciudad = row
                 
                 # Si ya tenemos esta institución, usar la primera sede encontrada
                 if institucion_id not in instituciones_por_id:
-                    instituciones_por_id[institucion_id] = {
-                        "id": institucion_id,
-                        "nombre": institucion_nombre,  # Solo nombre de institución
-                        "logo": logo,
-                        "institucion_id": institucion_id,
-                        "institucion_nombre": institucion_nombre,
-                        "sede_id": sede_id,
-                        "direccion": direccion,
-                        "telefono": telefono,
-                        "email": email,
-                        "web": web,
-                        "ciudad": ciudad
-                    }
+                    instituciones_por_id[institucion_id] = TarjetaInstitucion(
+                        institucion_id,
+                        institucion_nombre,  # Solo nombre de institución
+                        logo or "/logos/logoutu.png",
+                        institucion_id,
+                        institucion_nombre,
+                        sede_id,
+                        direccion,
+                        telefono,
+                        email,
+                        web,
+                        ciudad,
+                    )
             
             tarjetas = list(instituciones_por_id.values())
             print(f"[LOG] Tarjetas de instituciones obtenidas: {len(tarjetas)}")
@@ -961,7 +1839,8 @@ def obtener_sedes_como_tarjetas(ciudad_nombre: str = None) -> List[Dict[str, Any
         print(f"[ERROR] Error al obtener sedes como tarjetas: {e}")
         return []
 
-def obtener_instituciones_con_cursos_virtuales() -> List[Dict[str, Any]]:
+@cache_directorio.cachear()
+def obtener_instituciones_con_cursos_virtuales() -> List[TarjetaInstitucion]:
     """
     Obtiene las instituciones que tienen al menos un curso virtual.
     
@@ -970,64 +1849,48 @@ def obtener_instituciones_con_cursos_virtuales() -> List[Dict[str, Any]]:
     como tarjetas individuales.
     
     Returns:
-        List[Dict]: Lista de instituciones con cursos virtuales
+        List[TarjetaInstitucion]: Lista de instituciones con cursos virtuales
                    Cada institución se muestra como una tarjeta
     
     Estructura de retorno:
         [
-            {
-                "id": 1,
-                "nombre": "UDELAR – CENUR LN",
-                "logo": "/logos/logo-cenur.png",
-                "institucion_nombre": "UDELAR – CENUR LN",
-                "direccion": "N/A",
-                "telefono": "N/A",
-                "email": "N/A",
-                "web": "N/A",
-                "ciudad": "Virtual"
-            }
+            TarjetaInstitucion(
+                id=1,
+                nombre="UDELAR – CENUR LN",
+                logo="/logos/logo-cenur.png",
+                institucion_id=1,
+                institucion_nombre="UDELAR – CENUR LN",
+                sede_id=None,
+                direccion="N/A",
+                telefono="N/A",
+                email="N/A",
+                web="N/A",
+                ciudad="Virtual",
+            )
         ]
     """
     try:
-        with Session(engine) as session:
-            # Query para obtener instituciones que tienen cursos virtuales
-            query = select(
-                Institucion.id,
-                Institucion.nombre,
-                Institucion.logo
-            ).join(
-                Curso, Institucion.id == Curso.institucion_id
-            ).join(
-                CursoCiudadLink, Curso.id == CursoCiudadLink.curso_id
-            ).join(
-                Ciudad, CursoCiudadLink.ciudad_id == Ciudad.id
-            ).where(
-                Ciudad.nombre == "Virtual"
-            ).distinct()
-            
-            result = session.exec(query).all()
+        with read_session() as session:
+            # Instituciones que tienen cursos virtuales
+            result = session.exec(consultas.INSTITUCIONES_CON_CURSOS_VIRTUALES).all()
             
             # Convertir cada institución en una tarjeta
-            tarjetas = []
-            for row in result:
-                institucion_id = row[0]
-                institucion_nombre = row[1]
-                logo = row[2] or "/logos/logoutu.png"
-                
-                tarjeta = {
-                    "id": institucion_id,
-                    "nombre": institucion_nombre,  # Solo nombre de institución
-                    "logo": logo,
-                    "institucion_id": institucion_id,
-                    "institucion_nombre": institucion_nombre,
-                    "sede_id": None,  # No es una sede física
-                    "direccion": "N/A",
-                    "telefono": "N/A",
-                    "email": "N/A",
-                    "web": "N/A",
-                    "ciudad": "Virtual"
-                }
-                tarjetas.append(tarjeta)
+            tarjetas = [
+                TarjetaInstitucion(
+                    institucion_id,
+                    institucion_nombre,  # Solo nombre de institución
+                    logo or "/logos/logoutu.png",
+                    institucion_id,
+                    institucion_nombre,
+                    None,  # No es una sede física
+                    "N/A",
+                    "N/A",
+                    "N/A",
+                    "N/A",
+                    "Virtual",
+                )
+                for institucion_id, institucion_nombre, logo in result
+            ]
             
             print(f"[LOG] Instituciones con cursos virtuales obtenidas: {len(tarjetas)}")
             return tarjetas
@@ -1036,71 +1899,121 @@ def obtener_instituciones_con_cursos_virtuales() -> List[Dict[str, Any]]:
         print(f"[ERROR] Error al obtener instituciones con cursos virtuales: {e}")
         return []
 
-def obtener_sedes_fisicas_por_institucion(institucion_id: int) -> List[Dict[str, Any]]:
+def _fila_sede_fisica(row) -> SedeRow:
+    """Convierte una fila de consultas.SEDES_FISICAS* a la fila del modal."""
+    return SedeRow(
+        row[0],
+        f"Sede en {row[5]}",  # Generar nombre basado en la ciudad
+        row[1] or "No disponible",
+        row[2] or "No disponible",
+        row[3] or "No disponible",
+        row[4] or "No disponible",
+        row[5],
+        row[6],  # Nombre de la institución
+    )
+
+@cache_directorio.cachear()
+def obtener_sedes_fisicas_indexadas() -> Dict[int, List[SedeRow]]:
+    """
+    Obtiene las sedes físicas de TODAS las instituciones, agrupadas por institución.
+    
+    Una sola query para todo el directorio: /instituciones la precarga al
+    entrar y después cada diálogo de institución se resuelve con una búsqueda
+    en el diccionario, sin ir a la base. El resultado vive en cache_directorio
+    (compartido entre sesiones, de solo lectura).
+    
+    Returns:
+        Dict[int, List[SedeRow]]: {institucion_id: sedes ordenadas por ciudad}, con
+                               el formato de obtener_sedes_fisicas_por_institucion()
+    
+    Utilizado en:
+        - state.py: cargar_datos_instituciones_page() (precarga)
+        - obtener_sedes_fisicas_por_institucion() (lecturas públicas)
+    """
+    try:
+        with read_session() as session:
+            result = session.exec(consultas.SEDES_FISICAS).all()
+            
+            sedes_por_institucion: Dict[int, List[SedeRow]] = {}
+            for row in result:
+                sedes_por_institucion.setdefault(row[7], []).append(_fila_sede_fisica(row))
+            
+            print(f"[PERFORMANCE] Sedes físicas precargadas: {len(result)} sedes de "
+                  f"{len(sedes_por_institucion)} instituciones en 1 query")
+            return sedes_por_institucion
+            
+    except Exception as e:
+        print(f"[ERROR] Error al precargar sedes físicas: {e}")
+        return {}
+
+def obtener_ciudades_sedes_institucion(institucion_id: int) -> List[str]:
+    """
+    Obtiene las ciudades donde la institución tiene sede, incluida "Virtual".
+    
+    Lee siempre de la base primaria y sin cache: son las opciones de ciudades
+    del formulario de cursos del admin y tienen que incluir una sede recién
+    creada (read-after-write).
+    
+    Args:
+        institucion_id: ID de la institución del admin
+    
+    Returns:
+        List[str]: Nombres de ciudades en orden alfabético (ej. ["Salto", "Virtual"])
+    
+    Utilizado en:
+        - state.py: abrir_dialogo_agregar() y abrir_dialogo_editar()
+    """
+    try:
+        with Session(engine) as session:
+            return list(session.exec(
+                consultas.CIUDADES_SEDES_POR_INSTITUCION, params={"institucion_id": institucion_id}
+            ).all())
+    except Exception as e:
+        print(f"[ERROR] Error al obtener ciudades de sedes de la institución {institucion_id}: {e}")
+        return []
+
+def obtener_sedes_fisicas_por_institucion(institucion_id: int, usar_primaria: bool = False) -> List[SedeRow]:
     """
     Obtiene todas las sedes físicas de una institución específica.
     
     Esta función se usa para mostrar las sedes en el modal desplegable.
-    Solo incluye sedes físicas (excluye "Virtual").
+    Solo incluye sedes físicas (excluye "Virtual"). Las lecturas públicas salen
+    del índice de obtener_sedes_fisicas_indexadas() (sin query si ya está
+    cacheado).
     
     Args:
         institucion_id: ID de la institución
+        usar_primaria: Leer desde la base primaria en lugar de la réplica y sin
+                       cache. El panel admin lo usa para ver sus propios cambios
+                       inmediatamente después de guardarlos (read-after-write).
     
     Returns:
-        List[Dict]: Lista de sedes físicas de la institución
+        List[SedeRow]: Lista de sedes físicas de la institución
     
     Estructura de retorno:
         [
-            {
-                "id": 1,
-                "nombre": "Sede Salto",
-                "direccion": "Rivera 1350",
-                "telefono": "47334816",
-                "email": "comunicacion@unorte.edu.uy",
-                "web": "https://www.litoralnorte.udelar.edu.uy/",
-                "ciudad": "Salto",
-                "institucion_nombre": "UDELAR – CENUR LN"
-            }
+            SedeRow(
+                id=1,
+                nombre="Sede en Salto",
+                direccion="Rivera 1350",
+                telefono="47334816",
+                email="comunicacion@unorte.edu.uy",
+                web="https://www.litoralnorte.udelar.edu.uy/",
+                ciudad="Salto",
+                institucion_nombre="UDELAR – CENUR LN",
+            )
         ]
     """
+    if not usar_primaria:
+        return list(obtener_sedes_fisicas_indexadas().get(institucion_id, []))
+
     try:
         with Session(engine) as session:
-            # Query para obtener todas las sedes físicas de la institución con el nombre de la institución
-            query = select(
-                Sede.id,
-                Sede.direccion,
-                Sede.telefono,
-                Sede.email,
-                Sede.web,
-                Ciudad.nombre.label("ciudad_nombre"),
-                Institucion.nombre.label("institucion_nombre")
-            ).join(
-                Ciudad, Sede.ciudad_id == Ciudad.id
-            ).join(
-                Institucion, Sede.institucion_id == Institucion.id
-            ).where(
-                Sede.institucion_id == institucion_id,
-                Ciudad.nombre != "Virtual"  # Excluir sedes virtuales
-            ).order_by(
-                Ciudad.nombre
-            )
-            
-            result = session.exec(query).all()
+            result = session.exec(
+                consultas.SEDES_FISICAS_POR_INSTITUCION, params={"institucion_id": institucion_id}
+            ).all()
             
-            # Convertir a lista de diccionarios
-            sedes = []
-            for row in result:
-                sede = {
-                    "id": row[0],
-                    "nombre": f"Sede en {row[5]}",  # Generar nombre basado en la ciudad
-                    "direccion": row[1] or "No disponible",
-                    "telefono": row[2] or "No disponible",
-                    "email": row[3] or "No disponible",
-                    "web": row[4] or "No disponible",
-                    "ciudad": row[5],
-                    "institucion_nombre": row[6]  # Nombre de la institución
-                }
-                sedes.append(sede)
+            sedes = [_fila_sede_fisica(row) for row in result]
             
             print(f"[LOG] Sedes físicas obtenidas para institución {institucion_id}: {len(sedes)}")
             return sedes
@@ -1109,6 +2022,197 @@ def obtener_sedes_fisicas_por_institucion(institucion_id: int) -> List[Dict[str,
         print(f"[ERROR] Error al obtener sedes físicas de institución {institucion_id}: {e}")
         return []
 
+# ================================================================================
+# OPERACIONES DE LECTURA - EXPORTACIÓN EN STREAMING
+# ================================================================================
+#
+# Generadores que recorren el catálogo con un cursor del lado del servidor
+# (yield_per activa stream_results en PostgreSQL) y entregan las filas de a
+# lotes de EXPORT_CHUNK_SIZE. La memoria usada no depende del tamaño del
+# catálogo: nunca se arma la lista completa.
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "500"))
+
+def iterar_cursos_exportacion(
+    nivel: str = "",
+    requisito: str = "",
+    institucion: str = "",
+    lugar: str = "",
+    busqueda: str = "",
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Recorre los cursos con su institución y ciudades, aplicando los mismos
+    filtros que la página /cursos.
+    
+    Es un recorrido plano de curso_catalogo: una fila por curso con la
+    institución y las ciudades ya resueltas, sin joins ni agrupar ciudades.
+    
+    Args:
+        nivel: Filtro exacto por nivel ("" = todos)
+        requisito: Filtro exacto por requisitos de ingreso
+        institucion: Filtro exacto por nombre de institución
+        lugar: Cursos que se dictan en esta ciudad
+        busqueda: Texto contenido en el nombre o la información (sin
+                  distinguir mayúsculas ni tildes)
+        chunk_size: Filas pedidas al cursor por vez
+    
+    Yields:
+        Dict: Curso con la misma estructura que obtener_cursos() más
+              "institucion_id" y "ciudades" (lista de nombres)
+    """
+    query = select(*_COLUMNAS_LECTURA_CATALOGO, CursoCatalogo.institucion_id)
+
+    # === FILTROS EQUIVALENTES A State.aplicar_filtros() ===
+    if nivel:
+        query = query.where(CursoCatalogo.nivel == nivel)
+    if requisito:
+        query = query.where(CursoCatalogo.requisitos_ingreso == requisito)
+    if institucion:
+        query = query.where(CursoCatalogo.institucion_nombre == institucion)
+    if lugar:
+        ciudad_id = select(Ciudad.id).where(Ciudad.nombre == lugar).scalar_subquery()
+        query = query.where(CursoCatalogo.ciudad_ids.contains("," + cast(ciudad_id, String) + ","))
+    if busqueda:
+        query = query.where(CursoCatalogo.texto_busqueda.contains(normalizar_busqueda(busqueda), autoescape=True))
+
+    query = query.order_by(CursoCatalogo.curso_id).execution_options(yield_per=chunk_size)
+
+    with read_session() as session:
+        for row in session.exec(query):
+            curso = serializar_fila(_curso_desde_catalogo(row))
+            curso["institucion_id"] = row[9]
+            curso["ciudades"] = row[8].split(", ") if row[8] else []
+            yield curso
+
+def iterar_instituciones_exportacion(chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Recorre las instituciones en streaming.
+    
+    Yields:
+        Dict: {"id", "nombre", "logo"}
+    """
+    query = select(Institucion.id, Institucion.nombre, Institucion.logo).order_by(
+        Institucion.id
+    ).execution_options(yield_per=chunk_size)
+    with read_session() as session:
+        for row in session.exec(query):
+            yield {"id": row[0], "nombre": row[1], "logo": row[2] or "/logos/logoutu.png"}
+
+def iterar_sedes_exportacion(ciudad: str = "", chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Recorre las sedes con su institución y ciudad en streaming.
+    
+    Args:
+        ciudad: Filtro exacto por ciudad ("" = todas)
+    
+    Yields:
+        Dict: {"id", "institucion_id", "institucion", "ciudad", "direccion",
+               "telefono", "email", "web"}
+    """
+    query = select(
+        Sede.id,
+        Sede.institucion_id,
+        Institucion.nombre,
+        Ciudad.nombre,
+        Sede.direccion,
+        Sede.telefono,
+        Sede.email,
+        Sede.web,
+    ).join(
+        Institucion, Sede.institucion_id == Institucion.id
+    ).join(
+        Ciudad, Sede.ciudad_id == Ciudad.id
+    )
+    if ciudad:
+        query = query.where(Ciudad.nombre == ciudad)
+    query = query.order_by(Sede.id).execution_options(yield_per=chunk_size)
+    with read_session() as session:
+        for row in session.exec(query):
+            yield {
+                "id": row[0],
+                "institucion_id": row[1],
+                "institucion": row[2],
+                "ciudad": row[3],
+                "direccion": row[4],
+                "telefono": row[5],
+                "email": row[6],
+                "web": row[7],
+            }
+
+# ================================================================================
+# CIUDADES - OBTENER O CREAR (RESISTENTE A CONCURRENCIA)
+# ================================================================================
+#
+# Las sedes guardan la ciudad por nombre; si no existe se crea. Antes se hacía
+# SELECT + INSERT + commit en una transacción aparte, lo que costaba dos
+# commits y fallaba si dos admins creaban la misma ciudad a la vez
+# (ciudad.nombre es UNIQUE). Ahora:
+# - Cache por proceso nombre -> id (las ciudades no se borran ni renombran)
+# - INSERT ... ON CONFLICT DO NOTHING RETURNING en PostgreSQL y SQLite, dentro
+#   de la transacción de la sede; si hubo conflicto se lee el id existente
+# - En otros motores, INSERT en un SAVEPOINT y SELECT si viola el UNIQUE
+# ================================================================================
+
+_ciudad_ids_por_nombre: Dict[str, int] = {}
+_ciudad_ids_lock = threading.Lock()
+
+def _recordar_ciudad(nombre: str, ciudad_id: int):
+    with _ciudad_ids_lock:
+        _ciudad_ids_por_nombre[nombre] = ciudad_id
+
+def obtener_o_crear_ciudad_id(session: Session, nombre: str) -> int:
+    """
+    Devuelve el ID de la ciudad `nombre`, creándola si no existe.
+
+    No hace commit: la ciudad nueva se confirma junto con la escritura del
+    llamador. Solo se agrega al cache cuando esa transacción se confirma, para
+    no recordar IDs de un rollback.
+
+    Args:
+        session: Sesión abierta del llamador
+        nombre: Nombre de la ciudad
+
+    Returns:
+        int: ID de la ciudad
+
+    Utilizado en:
+        - agregar_sede() y modificar_sede()
+    """
+    ciudad_id = _ciudad_ids_por_nombre.get(nombre)
+    if ciudad_id is not None:
+        return ciudad_id
+
+    ciudad_id = session.exec(consultas.CIUDAD_ID_POR_NOMBRE, params={"nombre": nombre}).first()
+    if ciudad_id is not None:
+        _recordar_ciudad(nombre, ciudad_id)
+        return ciudad_id
+
+    dialecto = session.get_bind().dialect.name
+    if dialecto in ("postgresql", "sqlite"):
+        modulo = postgresql if dialecto == "postgresql" else sqlite
+        ciudad_id = session.exec(
+            modulo.insert(Ciudad)
+            .values(nombre=nombre)
+            .on_conflict_do_nothing(index_elements=["nombre"])
+            .returning(Ciudad.id)
+        ).scalar()
+    else:
+        try:
+            with session.begin_nested():
+                ciudad_id = session.exec(insert(Ciudad).values(nombre=nombre)).inserted_primary_key[0]
+        except IntegrityError:
+            ciudad_id = None
+
+    if ciudad_id is None:
+        # Otra transacción la creó primero (conflicto en el UNIQUE): ya está confirmada
+        ciudad_id = session.exec(select(Ciudad.id).where(Ciudad.nombre == nombre)).one()
+        _recordar_ciudad(nombre, ciudad_id)
+    else:
+        print(f"[LOG] Ciudad creada: {nombre} (ID: {ciudad_id})")
+        event.listen(session, "after_commit", lambda _s: _recordar_ciudad(nombre, ciudad_id), once=True)
+    return ciudad_id
+
 # ================================================================================
 # OPERACIONES DE ESCRITURA - SEDES
 # ================================================================================
@@ -1121,6 +2225,9 @@ def agregar_sede(datos_sede: dict):
         datos_sede: Diccionario con los datos de la sede
                    Debe contener: direccion, telefono, email, web, ciudad, institucion_id
     
+    Returns:
+        SedeRow: La sede creada en el formato de obtener_sedes_fisicas_por_institucion()
+    
     Raises:
         Exception: Si hay error en la validación o inserción
     """
@@ -1134,18 +2241,13 @@ def agregar_sede(datos_sede: dict):
             raise ValueError("El ID de institución es obligatorio")
         
         with Session(engine) as session:
-            # Buscar o crear la ciudad
-            ciudad = session.exec(select(Ciudad).where(Ciudad.nombre == datos_sede["ciudad"])).first()
-            if not ciudad:
-                ciudad = Ciudad(nombre=datos_sede["ciudad"])
-                session.add(ciudad)
-                session.commit()
-                session.refresh(ciudad)
+            # Buscar o crear la ciudad (en la misma transacción que la sede)
+            ciudad_id = obtener_o_crear_ciudad_id(session, datos_sede["ciudad"])
             
             # Crear la sede
             sede = Sede(
                 institucion_id=datos_sede["institucion_id"],
-                ciudad_id=ciudad.id,
+                ciudad_id=ciudad_id,
                 direccion=datos_sede["direccion"],
                 telefono=datos_sede.get("telefono", ""),
                 email=datos_sede.get("email", ""),
@@ -1153,10 +2255,13 @@ def agregar_sede(datos_sede: dict):
             )
             
             session.add(sede)
+            _marcar_version(_incrementar_generacion_catalogo(session), sede)
+            session.flush()  # Asigna el id
+            fila = _sede_para_admin(session, sede, datos_sede["ciudad"])
             session.commit()
-            session.refresh(sede)
             
-            print(f"[LOG] Sede agregada exitosamente: {sede.id}")
+            print(f"[LOG] Sede agregada exitosamente: {fila.id}")
+            return fila
             
     except Exception as e:
         print(f"[ERROR] Error al agregar sede: {e}")
@@ -1170,6 +2275,9 @@ def modificar_sede(sede_id: int, datos_sede: dict):
         sede_id: ID de la sede a modificar
         datos_sede: Diccionario con los datos actualizados de la sede
     
+    Returns:
+        SedeRow: La sede modificada en el formato de obtener_sedes_fisicas_por_institucion()
+    
     Raises:
         Exception: Si hay error en la validación o actualización
     """
@@ -1186,25 +2294,22 @@ def modificar_sede(sede_id: int, datos_sede: dict):
             if not sede:
                 raise ValueError(f"No se encontró la sede con ID {sede_id}")
             
-            # Buscar o crear la ciudad
-            ciudad = session.exec(select(Ciudad).where(Ciudad.nombre == datos_sede["ciudad"])).first()
-            if not ciudad:
-                ciudad = Ciudad(nombre=datos_sede["ciudad"])
-                session.add(ciudad)
-                session.commit()
-                session.refresh(ciudad)
+            # Buscar o crear la ciudad (en la misma transacción que la sede)
+            ciudad_id = obtener_o_crear_ciudad_id(session, datos_sede["ciudad"])
             
             # Actualizar la sede
             sede.direccion = datos_sede["direccion"]
             sede.telefono = datos_sede.get("telefono", "")
             sede.email = datos_sede.get("email", "")
             sede.web = datos_sede.get("web", "")
-            sede.ciudad_id = ciudad.id
+            sede.ciudad_id = ciudad_id
             
+            _marcar_version(_incrementar_generacion_catalogo(session), sede)
+            fila = _sede_para_admin(session, sede, datos_sede["ciudad"])
             session.commit()
-            session.refresh(sede)
             
             print(f"[LOG] Sede modificada exitosamente: {sede_id}")
+            return fila
             
     except Exception as e:
         print(f"[ERROR] Error al modificar sede {sede_id}: {e}")
@@ -1229,6 +2334,7 @@ def eliminar_sede(sede_id: int):
             
             # Eliminar la sede
             session.delete(sede)
+            _registrar_eliminacion(session, _incrementar_generacion_catalogo(session), "sede", sede_id)
             session.commit()
             
             print(f"[LOG] Sede eliminada exitosamente: {sede_id}")
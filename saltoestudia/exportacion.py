@@ -0,0 +1,148 @@
+# ================================================================================
+# EXPORTACIÓN DEL CATÁLOGO EN STREAMING - SALTO ESTUDIA
+# ================================================================================
+#
+# Convierte los generadores de database.py (iterar_*_exportacion) en texto
+# CSV, JSON o NDJSON que se emite por bloques. Ni la consulta ni la salida
+# arman la lista completa en memoria, así que exportar 100 o 100.000 cursos
+# usa la misma memoria.
+#
+# FORMATOS:
+# - csv: Encabezados + una fila por registro (cursos con las mismas columnas
+#        que acepta la importación masiva de /admin)
+# - json: Un array JSON emitido de a bloques
+# - ndjson: Un objeto JSON por línea
+#
+# UTILIZADO EN:
+# - api.py: Endpoints GET /api/export/<entidad>.<formato>
+# - scripts/export_catalog.py: Exportación por línea de comandos
+# ================================================================================
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, List
+
+from .database import (
+    iterar_cursos_exportacion,
+    iterar_instituciones_exportacion,
+    iterar_sedes_exportacion,
+)
+
+# Formatos soportados y su Content-Type
+FORMATOS_EXPORTACION = {
+    "csv": "text/csv; charset=utf-8",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+# Columnas por entidad (orden de las columnas en CSV)
+COLUMNAS_EXPORTACION = {
+    "cursos": [
+        "id", "nombre", "nivel", "duracion_numero", "duracion_unidad",
+        "requisitos_ingreso", "ciudades", "informacion", "institucion_id", "institucion",
+    ],
+    "instituciones": ["id", "nombre", "logo"],
+    "sedes": ["id", "institucion_id", "institucion", "ciudad", "direccion", "telefono", "email", "web"],
+}
+
+# Filtros aceptados por entidad (mismos nombres que los filtros de /cursos)
+FILTROS_EXPORTACION = {
+    "cursos": ["nivel", "requisito", "institucion", "lugar", "busqueda"],
+    "instituciones": [],
+    "sedes": ["ciudad"],
+}
+
+# Registros agrupados por cada bloque de texto emitido
+FILAS_POR_BLOQUE = 200
+
+def iterar_entidad(entidad: str, filtros: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    """
+    Devuelve el generador de registros de la entidad pedida.
+
+    Args:
+        entidad: "cursos", "instituciones" o "sedes"
+        filtros: Filtros de la entidad (los desconocidos se ignoran)
+
+    Raises:
+        ValueError: Si la entidad no existe
+    """
+    if entidad not in COLUMNAS_EXPORTACION:
+        raise ValueError(f"Entidad desconocida: '{entidad}'. Opciones: {', '.join(COLUMNAS_EXPORTACION)}")
+    filtros = {k: v for k, v in filtros.items() if k in FILTROS_EXPORTACION[entidad] and v}
+    if entidad == "cursos":
+        return iterar_cursos_exportacion(**filtros)
+    if entidad == "instituciones":
+        return iterar_instituciones_exportacion()
+    return iterar_sedes_exportacion(**filtros)
+
+def _bloques(registros: Iterable[Dict[str, Any]], tamano: int = FILAS_POR_BLOQUE) -> Iterator[List[Dict[str, Any]]]:
+    """Agrupa los registros en listas de a `tamano`."""
+    bloque = []
+    for registro in registros:
+        bloque.append(registro)
+        if len(bloque) >= tamano:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+def _como_csv(registros: Iterable[Dict[str, Any]], columnas: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columnas)
+    for bloque in _bloques(registros):
+        for registro in bloque:
+            writer.writerow([
+                ", ".join(registro[c]) if isinstance(registro.get(c), list) else registro.get(c)
+                for c in columnas
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    # Encabezados de una exportación sin resultados
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def _como_ndjson(registros: Iterable[Dict[str, Any]], columnas: List[str]) -> Iterator[str]:
+    for bloque in _bloques(registros):
+        yield "".join(
+            json.dumps({c: registro.get(c) for c in columnas}, ensure_ascii=False) + "\n"
+            for registro in bloque
+        )
+
+def _como_json(registros: Iterable[Dict[str, Any]], columnas: List[str]) -> Iterator[str]:
+    yield "["
+    separador = ""
+    for bloque in _bloques(registros):
+        partes = []
+        for registro in bloque:
+            partes.append(separador + json.dumps({c: registro.get(c) for c in columnas}, ensure_ascii=False))
+            separador = ","
+        yield "".join(partes)
+    yield "]"
+
+def exportar(entidad: str, formato: str, filtros: Dict[str, str] = None) -> Iterator[str]:
+    """
+    Genera la exportación de una entidad como bloques de texto.
+
+    Args:
+        entidad: "cursos", "instituciones" o "sedes"
+        formato: "csv", "json" o "ndjson"
+        filtros: Filtros opcionales (ver FILTROS_EXPORTACION)
+
+    Returns:
+        Iterator[str]: Bloques de texto listos para escribir o enviar
+
+    Raises:
+        ValueError: Si la entidad o el formato no son válidos
+    """
+    if formato not in FORMATOS_EXPORTACION:
+        raise ValueError(f"Formato desconocido: '{formato}'. Opciones: {', '.join(FORMATOS_EXPORTACION)}")
+    registros = iterar_entidad(entidad, filtros or {})
+    columnas = COLUMNAS_EXPORTACION[entidad]
+    if formato == "csv":
+        return _como_csv(registros, columnas)
+    if formato == "ndjson":
+        return _como_ndjson(registros, columnas)
+    return _como_json(registros, columnas)
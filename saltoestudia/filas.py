@@ -0,0 +1,169 @@
+# ================================================================================
+# FILAS TIPADAS (CURSOS, SEDES, TARJETAS Y SUGERENCIAS) - SALTO ESTUDIA
+# ================================================================================
+#
+# Clases livianas para las filas que viajan de la base al estado y a la UI.
+# Reemplazan los Dict[str, Any] de nueve u once claves por fila:
+#
+# - dataclass(slots=True): sin __dict__ por instancia (~60% menos memoria por
+#   fila que un diccionario) y construcción directa desde la fila de la query
+# - Pickle por lista (empaquetar_filas, desde State.__getstate__): cada lista
+#   de filas del estado (Redis en modo multi-worker) se guarda en una pasada
+#   como clase + tuplas de valores, sin llamada Python por fila al serializar
+#   ni el nombre de cada campo repetido
+# - __reduce__ por fila: el mismo formato compacto para filas sueltas
+# - Serializer JSON registrado en Reflex (serializar_fila): dict(zip()) de los
+#   campos en vez del camino genérico de dataclasses, que recorre
+#   dataclasses.fields() por cada fila
+#
+# PENDIENTE: el objetivo de bajar el costo de serialización por fila respecto
+# de los diccionarios no se cumple del todo (scripts/benchmark_filas.py lo
+# informa en cada corrida):
+# - Pickle: menos bytes, pero la ida y vuelta queda a la par de los
+#   diccionarios (al leer, cada fila pasa por su __init__)
+# - JSON: sigue siendo más lento que con diccionarios. El json de Reflex
+#   recorre las listas en C y llama al serializer una vez por fila; un dict
+#   ya es JSON nativo. Solo lo bajaría enviar menos filas (var cursos sin
+#   paginar) o que el estado guarde diccionarios, perdiendo la memoria.
+#
+# NO se usa rx.Base (pydantic): medido en scripts/benchmark_filas.py, una fila
+# rx.Base ocupa ~4 veces más que un diccionario y serializa mucho más lento.
+#
+# Los argumentos de eventos que llegan del navegador (selected_institution,
+# curso_a_editar, sede_a_editar) siguen siendo diccionarios.
+#
+# UTILIZADO EN:
+# - database.py y catalogo.py: producen las filas desde las queries
+# - state.py: vars cursos, admin_cursos, admin_sedes, instituciones_info,
+#   selected_institution_sedes y sugerencias_busqueda
+# - state.py: State.__getstate__ (empaquetar_filas)
+# - catalogo.py: sugerencias de autocompletado (Sugerencia)
+# ================================================================================
+
+from dataclasses import dataclass
+from itertools import starmap
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional
+
+import reflex as rx
+
+# Por clase de fila, creada en el primer uso: tupla de valores en orden de campos
+_VALORES: Dict[type, Callable[[Any], tuple]] = {}
+
+def _valores_de(clase: type) -> Callable[[Any], tuple]:
+    """attrgetter de todos los campos de `clase` (devuelve la tupla en C)."""
+    valores = _VALORES.get(clase)
+    if valores is None:
+        campos = clase.__slots__
+        # Con un solo campo attrgetter devuelve el valor suelto, no una tupla
+        valores = attrgetter(*campos) if len(campos) > 1 else (lambda fila: (getattr(fila, campos[0]),))
+        _VALORES[clase] = valores
+    return valores
+
+class _Fila:
+    """Base de las filas: pickle y JSON compactos (solo los valores)."""
+    __slots__ = ()
+
+    def __reduce__(self):
+        # Solo los valores, en el orden de los campos (el nombre lo da la clase)
+        return self.__class__, _valores_de(self.__class__)(self)
+
+@rx.serializer(to=dict)
+def serializar_fila(fila: _Fila) -> dict:
+    """JSON de una fila: el mismo diccionario que el camino genérico de dataclasses."""
+    clase = fila.__class__
+    return dict(zip(clase.__slots__, _valores_de(clase)(fila)))
+
+def _filas_desde_valores(clase: type, valores: List[tuple]) -> list:
+    """Inversa de _ListaEmpaquetada: filas `clase` desde sus tuplas de valores."""
+    return list(starmap(clase, valores))
+
+class _ListaEmpaquetada(list):
+    """Lista de filas de una sola clase que se pickea en una pasada."""
+    __slots__ = ()
+
+    def __reduce__(self):
+        # map(attrgetter) corre en C: ninguna llamada Python por fila
+        clase = self[0].__class__
+        return _filas_desde_valores, (clase, list(map(_valores_de(clase), self)))
+
+def empaquetar_filas(estado: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Marca las listas de filas de `estado` para pickearlas en una pasada.
+
+    Al leer el estado vuelven como listas comunes de filas.
+
+    Args:
+        estado: Diccionario de vars a pickear (se modifica y se devuelve)
+
+    Returns:
+        Dict: El mismo `estado`
+
+    Utilizado en:
+        - state.py: State.__getstate__ (estado en Redis)
+    """
+    for nombre, valor in estado.items():
+        if type(valor) is list and valor and isinstance(valor[0], _Fila):
+            # Solo listas de una sola clase (las vars tipadas del estado)
+            if len(set(map(type, valor))) == 1:
+                estado[nombre] = _ListaEmpaquetada(valor)
+    return estado
+
+@dataclass(slots=True)
+class CursoRow(_Fila):
+    """
+    Curso tal como se muestra en /cursos y en el panel admin.
+
+    Producido por CatalogoCursos.materializar(), obtener_cursos(),
+    obtener_cursos_por_institucion(), obtener_pagina_cursos_institucion() y
+    las escrituras de cursos (fila actualizada para el admin).
+    """
+    id: int
+    nombre: str
+    nivel: str                   # "N/A" si no tiene
+    requisitos_ingreso: str      # "N/A" si no tiene
+    duracion_numero: str
+    duracion_unidad: str
+    informacion: Optional[str]
+    lugar: str                   # Ciudades separadas por coma ("N/A" si no tiene)
+    institucion: str             # Nombre de la institución
+
+@dataclass(slots=True)
+class SedeRow(_Fila):
+    """
+    Sede física de una institución (modal de /instituciones y panel admin).
+
+    La sede especial "Cursos Virtuales" del modal no tiene id.
+    """
+    id: Optional[int]
+    nombre: str                  # "Sede en {ciudad}"
+    direccion: str
+    telefono: str
+    email: str
+    web: str
+    ciudad: str
+    institucion_nombre: Optional[str]
+
+@dataclass(slots=True)
+class TarjetaInstitucion(_Fila):
+    """
+    Tarjeta de la galería de /instituciones: una por institución, con los
+    datos de la primera sede en la ciudad filtrada (o "Virtual").
+    """
+    id: int
+    nombre: str
+    logo: str
+    institucion_id: int
+    institucion_nombre: str
+    sede_id: Optional[int]       # None en las tarjetas de cursos virtuales
+    direccion: Optional[str]
+    telefono: Optional[str]
+    email: Optional[str]
+    web: Optional[str]
+    ciudad: str
+
+@dataclass(slots=True)
+class Sugerencia(_Fila):
+    """Sugerencia de autocompletado de la búsqueda de /cursos."""
+    texto: str                   # Nombre tal como está en el catálogo
+    tipo: str                    # "curso" o "institucion"
@@ -0,0 +1,191 @@
+# ================================================================================
+# LECTURA DE ARCHIVOS DE IMPORTACIÓN MASIVA - SALTO ESTUDIA
+# ================================================================================
+#
+# Convierte un archivo CSV o XLSX subido desde /admin en un iterador de filas
+# (diccionarios con las columnas normalizadas). Las filas se leen de a una, sin
+# cargar la planilla completa en listas, y se pasan directamente a
+# database.importar_cursos(), que valida e inserta por lotes.
+#
+# FORMATO ESPERADO (primera fila = encabezados):
+#   nombre, nivel, duracion_numero, duracion_unidad, requisitos_ingreso,
+#   ciudades, informacion
+#
+# - ciudades: nombres separados por coma o punto y coma ("Salto, Virtual")
+# - Se aceptan "lugar" y "requisitos" como alias de "ciudades" y
+#   "requisitos_ingreso" (mismo formato que muestra el buscador)
+# - Los encabezados no distinguen mayúsculas, espacios ni tildes
+#
+# UTILIZADO EN:
+# - state.py: handle_import_cursos() en el panel de administración
+# ================================================================================
+
+import codecs
+import csv
+import io
+import os
+import unicodedata
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+# Columnas que entiende database.importar_cursos()
+COLUMNAS_IMPORTACION = [
+    "nombre",
+    "nivel",
+    "duracion_numero",
+    "duracion_unidad",
+    "requisitos_ingreso",
+    "ciudades",
+    "informacion",
+]
+
+# Nombres alternativos aceptados en los encabezados
+ALIAS_COLUMNAS = {
+    "lugar": "ciudades",
+    "lugares": "ciudades",
+    "requisitos": "requisitos_ingreso",
+    "duracion": "duracion_numero",
+    "unidad": "duracion_unidad",
+}
+
+EXTENSIONES_SOPORTADAS = (".csv", ".xlsx")
+
+# Bytes por bloque al verificar la codificación de un CSV
+BLOQUE_VERIFICACION_CSV = 64 * 1024
+
+def _normalizar_encabezado(encabezado: Any) -> str:
+    """Convierte 'Duración número' en 'duracion_numero'."""
+    texto = str(encabezado or "").strip().lower()
+    texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    texto = "_".join(texto.replace("-", " ").split())
+    return ALIAS_COLUMNAS.get(texto, texto)
+
+def _valor_celda(valor: Any) -> str:
+    """Convierte una celda (str, int, float, None) a texto limpio."""
+    if valor is None:
+        return ""
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)  # Excel guarda 4 como 4.0
+    return str(valor).strip()
+
+def _filas_como_diccionarios(filas: Iterator[List[Any]]) -> Iterator[Dict[str, str]]:
+    """Usa la primera fila como encabezados y emite el resto como diccionarios."""
+    encabezados: Optional[List[str]] = None
+    for fila in filas:
+        if encabezados is None:
+            encabezados = [_normalizar_encabezado(c) for c in fila]
+            if "nombre" not in encabezados:
+                raise ValueError("El archivo debe tener una fila de encabezados con la columna 'nombre'")
+            continue
+        valores = [_valor_celda(v) for v in fila]
+        if not any(valores):
+            # Fila vacía: se emite igual para que la numeración siga coincidiendo
+            yield {}
+            continue
+        yield {
+            columna: valor
+            for columna, valor in zip(encabezados, valores)
+            if columna in COLUMNAS_IMPORTACION
+        }
+
+def verificar_codificacion_csv(archivo: BinaryIO) -> None:
+    """
+    Verifica que el CSV completo sea UTF-8 antes de insertar la primera fila.
+
+    Las filas se leen de a una mientras se insertan por lotes: un byte
+    inválido a mitad del archivo (un CSV guardado como ANSI/cp1252) dejaría
+    importada solo la primera parte. Se decodifica por bloques, sin cargar el
+    archivo en memoria, y se vuelve al inicio.
+
+    Args:
+        archivo: Archivo binario abierto y con seek()
+
+    Raises:
+        ValueError: Si el archivo no es UTF-8 (con la posición del byte inválido)
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8-sig")()
+    posicion = 0
+    try:
+        while True:
+            bloque = archivo.read(BLOQUE_VERIFICACION_CSV)
+            if not bloque:
+                decodificador.decode(b"", final=True)
+                break
+            decodificador.decode(bloque)
+            posicion += len(bloque)
+    except UnicodeDecodeError as e:
+        raise ValueError(
+            f"El archivo no está en UTF-8 (byte inválido cerca de la posición {posicion + e.start}). "
+            "Guárdelo como 'CSV UTF-8' y vuelva a importarlo."
+        )
+    finally:
+        archivo.seek(0)
+
+def leer_filas_csv(archivo: BinaryIO) -> Iterator[Dict[str, str]]:
+    """
+    Lee un CSV fila por fila.
+
+    Detecta el separador (coma o punto y coma, el que usa Excel en español)
+    mirando la línea de encabezados.
+
+    Args:
+        archivo: Archivo binario abierto (UTF-8, con o sin BOM)
+
+    Yields:
+        Dict[str, str]: Una fila con las columnas normalizadas
+    """
+    texto = io.TextIOWrapper(archivo, encoding="utf-8-sig", newline="")
+    primera_linea = texto.readline()
+    separador = ";" if primera_linea.count(";") > primera_linea.count(",") else ","
+
+    def lineas():
+        yield primera_linea
+        yield from texto
+
+    lector = csv.reader(lineas(), delimiter=separador)
+    try:
+        yield from _filas_como_diccionarios(lector)
+    except csv.Error as e:
+        raise ValueError(f"CSV inválido en la línea {lector.line_num}: {e}")
+
+def leer_filas_xlsx(archivo: BinaryIO) -> Iterator[Dict[str, str]]:
+    """
+    Lee la primera hoja de un XLSX fila por fila (modo read_only de openpyxl).
+
+    Args:
+        archivo: Archivo binario abierto
+
+    Yields:
+        Dict[str, str]: Una fila con las columnas normalizadas
+
+    Raises:
+        ValueError: Si openpyxl no está instalado
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Para importar archivos .xlsx se necesita openpyxl (pip install openpyxl). Puede exportar la planilla como CSV.")
+
+    libro = load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        yield from _filas_como_diccionarios(libro.active.iter_rows(values_only=True))
+    finally:
+        libro.close()
+
+def leer_filas(archivo: BinaryIO, nombre_archivo: str) -> Iterator[Dict[str, str]]:
+    """
+    Devuelve el lector adecuado según la extensión del archivo.
+
+    Args:
+        archivo: Archivo binario abierto
+        nombre_archivo: Nombre original (para detectar .csv / .xlsx)
+
+    Raises:
+        ValueError: Si la extensión no es soportada o el CSV no es UTF-8
+    """
+    extension = os.path.splitext(nombre_archivo or "")[1].lower()
+    if extension == ".csv":
+        verificar_codificacion_csv(archivo)
+        return leer_filas_csv(archivo)
+    if extension == ".xlsx":
+        return leer_filas_xlsx(archivo)
+    raise ValueError(f"Formato no soportado: '{extension or nombre_archivo}'. Use CSV o XLSX.")
@@ -0,0 +1,235 @@
+# ================================================================================
+# INSTRUMENTACIÓN DEL ESTADO Y DEL TRÁFICO WEBSOCKET - SALTO ESTUDIA
+# ================================================================================
+#
+# Mide, por sesión y por handler, cuánto pesa el State y cuánto viaja por el
+# websocket. Reflex reenvía completa cada var que queda "sucia" después de un
+# evento, así que un handler que toca una lista grande manda la lista entera.
+#
+# QUÉ SE REGISTRA (solo con INSTRUMENTAR_ESTADO=true):
+# - Bytes del delta que se envía al navegador por cada handler (total,
+#   promedio, p95, máximo) y qué vars lo componen
+# - Tamaño serializado del estado de cada sesión (lo que se guarda en Redis en
+#   modo multi-worker), con el desglose por var de la sesión más grande
+#
+# Serializar el estado en cada evento cuesta CPU: INSTRUMENTAR_ESTADO_MUESTREO
+# (0-1, por defecto 1) controla qué fracción de eventos lo mide. El delta se
+# mide siempre que la instrumentación está activa.
+#
+# EXPOSICIÓN:
+# - GET /api/metrics/estado → formato de texto de Prometheus
+# - GET /api/debug/estado   → reporte JSON (handlers y vars más pesados)
+# Ambos requieren DIAGNOSTICO_TOKEN (ver api.py): nombres y tamaños de vars no
+# son públicos.
+#
+# UTILIZADO EN:
+# - saltoestudia.py: app.add_middleware(MiddlewareInstrumentacion())
+# - api.py: endpoints de métricas y reporte
+# ================================================================================
+
+import os
+import random
+import threading
+from collections import OrderedDict, defaultdict, deque
+from typing import Any, Dict, List
+
+from reflex.middleware import Middleware
+from reflex.utils import format
+
+INSTRUMENTAR_ESTADO = os.getenv("INSTRUMENTAR_ESTADO", "false").lower() == "true"
+INSTRUMENTAR_ESTADO_MUESTREO = float(os.getenv("INSTRUMENTAR_ESTADO_MUESTREO", "1"))
+
+# Límites para que la instrumentación no crezca sin control
+MAX_SESIONES_REGISTRADAS = 1000
+MUESTRAS_POR_HANDLER = 500
+
+def _percentil(valores, fraccion: float) -> int:
+    """Percentil por rango más cercano (0 si no hay valores)."""
+    if not valores:
+        return 0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(fraccion * len(ordenados)))]
+
+def _nombre_corto(nombre_substate: str) -> str:
+    """'reflex___state____state.saltoestudia___state____state' → 'state'."""
+    return nombre_substate.rsplit(".", 1)[-1].split("____")[-1]
+
+def _nombre_handler(nombre_evento: str) -> str:
+    """Nombre del evento sin el prefijo de estados: 'state.aplicar_filtros'."""
+    substate, _, handler = nombre_evento.rpartition(".")
+    return f"{_nombre_corto(substate)}.{handler}" if substate else handler
+
+def tamano_estado(state) -> Dict[str, int]:
+    """
+    Tamaño serializado de cada substate cargado de una sesión.
+
+    Es lo que StateManagerRedis guarda por sesión: cada substate se serializa
+    por separado, sin padre ni hijos.
+
+    Returns:
+        Dict[str, int]: {nombre del substate: bytes}
+    """
+    tamanos = {}
+    pendientes = [state]
+    while pendientes:
+        actual = pendientes.pop()
+        tamanos[_nombre_corto(actual.get_full_name())] = len(actual._serialize())
+        pendientes.extend(actual.substates.values())
+    return tamanos
+
+def tamano_por_var(state) -> Dict[str, int]:
+    """Bytes (JSON) de cada var de un substate, de mayor a menor."""
+    tamanos = {}
+    for nombre in state.base_vars:
+        try:
+            tamanos[nombre] = len(format.json_dumps(getattr(state, nombre)))
+        except Exception:
+            continue
+    return dict(sorted(tamanos.items(), key=lambda item: -item[1]))
+
+class MetricasEstado:
+    """Acumulador de métricas por handler y por sesión (seguro entre hilos)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta todo lo registrado."""
+        with self._lock:
+            self.eventos: Dict[str, int] = defaultdict(int)
+            self.bytes_delta: Dict[str, int] = defaultdict(int)
+            self.maximo_delta: Dict[str, int] = defaultdict(int)
+            self.muestras_delta: Dict[str, deque] = defaultdict(lambda: deque(maxlen=MUESTRAS_POR_HANDLER))
+            self.bytes_por_var: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+            # token de sesión → bytes del estado (orden de último uso)
+            self.sesiones: "OrderedDict[str, int]" = OrderedDict()
+            self.sesion_mayor: Dict[str, Any] = {"token": None, "bytes": 0, "substates": {}, "vars": {}}
+
+    def registrar_delta(self, handler: str, bytes_totales: int, bytes_vars: Dict[str, int], final: bool):
+        """Registra una actualización enviada por `handler` (un evento puede mandar varias)."""
+        with self._lock:
+            if final:
+                self.eventos[handler] += 1
+            self.bytes_delta[handler] += bytes_totales
+            self.maximo_delta[handler] = max(self.maximo_delta[handler], bytes_totales)
+            self.muestras_delta[handler].append(bytes_totales)
+            for var, tamano in bytes_vars.items():
+                self.bytes_por_var[handler][var] += tamano
+
+    def registrar_estado(self, token: str, substates: Dict[str, int], vars_mayor: Any = None):
+        """Registra el tamaño del estado de una sesión; `vars_mayor()` da el desglose si es la más grande."""
+        total = sum(substates.values())
+        with self._lock:
+            self.sesiones[token] = total
+            self.sesiones.move_to_end(token)
+            while len(self.sesiones) > MAX_SESIONES_REGISTRADAS:
+                self.sesiones.popitem(last=False)
+            es_mayor = total >= self.sesion_mayor["bytes"]
+        if es_mayor:
+            desglose = vars_mayor() if vars_mayor else {}
+            with self._lock:
+                self.sesion_mayor = {"token": token[:8], "bytes": total, "substates": substates, "vars": desglose}
+
+    def reporte(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Reporte de depuración: handlers ordenados por bytes enviados y estado por sesión.
+
+        Returns:
+            Dict con "handlers", "sesiones" y "sesion_mayor"
+        """
+        with self._lock:
+            handlers = []
+            for handler, total in sorted(self.bytes_delta.items(), key=lambda item: -item[1]):
+                eventos = self.eventos[handler] or 1
+                vars_mas_pesadas = sorted(self.bytes_por_var[handler].items(), key=lambda item: -item[1])[:5]
+                handlers.append({
+                    "handler": handler,
+                    "eventos": self.eventos[handler],
+                    "bytes_totales": total,
+                    "bytes_promedio": total // eventos,
+                    "bytes_p95": _percentil(self.muestras_delta[handler], 0.95),
+                    "bytes_maximo": self.maximo_delta[handler],
+                    "vars": dict(vars_mas_pesadas),
+                })
+            tamanos = list(self.sesiones.values())
+            return {
+                "handlers": handlers[:top],
+                "sesiones": {
+                    "registradas": len(tamanos),
+                    "bytes_promedio": sum(tamanos) // len(tamanos) if tamanos else 0,
+                    "bytes_p95": _percentil(tamanos, 0.95),
+                    "bytes_maximo": max(tamanos, default=0),
+                },
+                "sesion_mayor": dict(self.sesion_mayor, vars=dict(list(self.sesion_mayor["vars"].items())[:top])),
+            }
+
+    def prometheus(self) -> str:
+        """Métricas en el formato de texto de Prometheus."""
+        with self._lock:
+            lineas = [
+                "# HELP saltoestudia_eventos_total Eventos procesados por handler",
+                "# TYPE saltoestudia_eventos_total counter",
+            ]
+            lineas += [f'saltoestudia_eventos_total{{handler="{h}"}} {n}' for h, n in self.eventos.items()]
+            lineas += [
+                "# HELP saltoestudia_delta_bytes_total Bytes de delta enviados por websocket por handler",
+                "# TYPE saltoestudia_delta_bytes_total counter",
+            ]
+            lineas += [f'saltoestudia_delta_bytes_total{{handler="{h}"}} {n}' for h, n in self.bytes_delta.items()]
+            lineas += [
+                "# HELP saltoestudia_delta_bytes_max Delta más grande enviado por handler",
+                "# TYPE saltoestudia_delta_bytes_max gauge",
+            ]
+            lineas += [f'saltoestudia_delta_bytes_max{{handler="{h}"}} {n}' for h, n in self.maximo_delta.items()]
+            tamanos = list(self.sesiones.values())
+            lineas += [
+                "# HELP saltoestudia_estado_sesion_bytes Tamaño serializado del estado por sesión",
+                "# TYPE saltoestudia_estado_sesion_bytes gauge",
+                f'saltoestudia_estado_sesion_bytes{{estadistica="promedio"}} {sum(tamanos) // len(tamanos) if tamanos else 0}',
+                f'saltoestudia_estado_sesion_bytes{{estadistica="p95"}} {_percentil(tamanos, 0.95)}',
+                f'saltoestudia_estado_sesion_bytes{{estadistica="maximo"}} {max(tamanos, default=0)}',
+                f"saltoestudia_sesiones_registradas {len(tamanos)}",
+            ]
+        return "\n".join(lineas) + "\n"
+
+# Instancia única por worker
+metricas_estado = MetricasEstado()
+
+class MiddlewareInstrumentacion(Middleware):
+    """Middleware de Reflex que mide cada actualización enviada al navegador."""
+
+    async def preprocess(self, app, state, event):
+        return None
+
+    async def postprocess(self, app, state, event, update):
+        try:
+            handler = _nombre_handler(event.name)
+            bytes_vars: Dict[str, int] = {}
+            for substate, cambios in update.delta.items():
+                nombre_substate = _nombre_corto(substate)
+                for var, valor in cambios.items():
+                    # Reflex agrega el sufijo "_rx_state_" a los nombres del delta
+                    var = var.removesuffix("_rx_state_")
+                    bytes_vars[f"{nombre_substate}.{var}"] = len(format.json_dumps(valor))
+            metricas_estado.registrar_delta(handler, len(update.json()), bytes_vars, update.final)
+
+            if update.final and random.random() < INSTRUMENTAR_ESTADO_MUESTREO:
+                substates = tamano_estado(state)
+
+                def desglose_vars():
+                    resultado: Dict[str, int] = {}
+                    pendientes: List[Any] = [state]
+                    while pendientes:
+                        actual = pendientes.pop()
+                        nombre = _nombre_corto(actual.get_name())
+                        for var, tamano in tamano_por_var(actual).items():
+                            resultado[f"{nombre}.{var}"] = tamano
+                        pendientes.extend(actual.substates.values())
+                    return dict(sorted(resultado.items(), key=lambda item: -item[1]))
+
+                metricas_estado.registrar_estado(event.token, substates, desglose_vars)
+        except Exception as e:
+            # La instrumentación nunca debe romper un evento
+            print(f"[ERROR] Instrumentación de estado: {e}")
+        return update
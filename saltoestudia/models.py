@@ -12,6 +12,9 @@
 # - Sede: Representa una institución en una ciudad específica
 # - Usuario: Administradores por institución para gestionar cursos
 # - Curso: Oferta educativa de cada institución
+# - CatalogGeneration: Contador de cambios del catálogo para invalidar caches
+# - CatalogoEliminacion: Registro de cursos y sedes borrados (tombstones)
+# - CursoCatalogo: Modelo de lectura desnormalizado (una fila por curso)
 #
 # RELACIONES:
 # - Institucion 1:N Sede (una institución puede tener múltiples sedes)
@@ -28,6 +31,7 @@
 # - Foreign keys para integridad referencial
 # ================================================================================
 
+from datetime import datetime
 from typing import List, Optional
 from sqlmodel import SQLModel, Field, Relationship
 from sqlalchemy import Column, Integer, String, ForeignKey, Table
@@ -96,6 +100,8 @@ class Sede(SQLModel, table=True):
     - telefono: Teléfono de contacto de esta sede
     - email: Email de contacto de esta sede
     - web: Sitio web específico de esta sede (opcional)
+    - updated_at: Fecha de la última escritura
+    - version: Generación del catálogo en la última escritura
     
     RELACIONES:
     - institucion: Institución a la que pertenece esta sede
@@ -117,6 +123,10 @@ class Sede(SQLModel, table=True):
     email: str                                                   # Email específico
     web: Optional[str] = None                                    # Web específica (opcional)
     
+    # === SEGUIMIENTO DE CAMBIOS ===
+    updated_at: Optional[datetime] = None                        # Última escritura
+    version: int = Field(default=0, nullable=False, index=True)  # Generación del catálogo
+    
     # === RELACIONES ===
     # Relación muchos-a-uno: Múltiples sedes pueden pertenecer a una institución
     institucion: Institucion = Relationship(back_populates="sedes")
@@ -206,6 +216,8 @@ class Curso(SQLModel, table=True):
     - requisitos_ingreso: Requisitos previos necesarios
     - informacion: Información adicional, enlaces, descripción detallada
     - institucion_id: Foreign key hacia la institución que lo ofrece
+    - updated_at: Fecha de la última escritura (incluye cambios de ciudades)
+    - version: Generación del catálogo en la última escritura
     
     RELACIONES:
     - ciudades: Ciudades donde se dicta el curso (many-to-many)
@@ -233,6 +245,10 @@ class Curso(SQLModel, table=True):
     informacion: Optional[str] = None               # Información adicional
     institucion_id: int = Field(foreign_key="instituciones.id")  # FK a institución
     
+    # === SEGUIMIENTO DE CAMBIOS ===
+    updated_at: Optional[datetime] = None          # Última escritura
+    version: int = Field(default=0, nullable=False, index=True)  # Generación del catálogo
+    
     # === RELACIONES ===
     # Relación many-to-many: Un curso se puede dictar en múltiples ciudades
     ciudades: List["Ciudad"] = Relationship(back_populates="cursos", link_model=CursoCiudadLink)
@@ -240,6 +256,115 @@ class Curso(SQLModel, table=True):
     # Relación muchos-a-uno: Múltiples cursos pueden pertenecer a una institución
     institucion: Institucion = Relationship(back_populates="cursos")
 
+# ================================================================================
+# MODELO CATALOG_GENERATION - Canal de invalidación entre workers
+# ================================================================================
+class CatalogGeneration(SQLModel, table=True):
+    """
+    Contador de generación del catálogo (cursos, sedes y ciudades).
+    
+    Tabla de una sola fila (id=1). Cada escritura de cursos o sedes incrementa
+    `generation` en la misma transacción, de modo que cualquier worker o
+    contenedor puede saber si sus caches en memoria quedaron obsoletos
+    comparando un único entero.
+    
+    CAMPOS:
+    - id: Siempre 1 (fila única)
+    - generation: Número de generación, crece con cada escritura del catálogo
+    
+    UTILIZADO EN:
+    - database.py: _incrementar_generacion_catalogo() y obtener_generacion_catalogo()
+    - state.py: Invalidación de los caches de cursos, instituciones y ciudades
+    """
+    __tablename__ = "catalog_generation"
+    
+    id: Optional[int] = Field(default=1, primary_key=True)
+    generation: int = Field(default=0, nullable=False)
+
+# ================================================================================
+# MODELO CATALOGO_ELIMINACION - Tombstones de cursos y sedes borrados
+# ================================================================================
+class CatalogoEliminacion(SQLModel, table=True):
+    """
+    Registro de un curso o sede eliminado.
+    
+    Los borrados siguen siendo físicos; esta tabla guarda qué se borró y en
+    qué generación, para que un cache que tiene la generación N pueda pedir
+    solo lo que cambió desde N (altas y ediciones por `version`, bajas por
+    esta tabla) en lugar de recargar el catálogo completo.
+    
+    CAMPOS:
+    - id: Clave primaria autoincremental
+    - entidad: "curso" o "sede"
+    - entidad_id: ID que tenía el registro borrado
+    - version: Generación del catálogo en la que se borró
+    - eliminado_en: Fecha del borrado
+    
+    UTILIZADO EN:
+    - database.py: eliminar_curso(), eliminar_sede(), cursos_cambiados_desde()
+      y sedes_cambiadas_desde()
+    """
+    __tablename__ = "catalogo_eliminacion"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    entidad: str = Field(nullable=False)
+    entidad_id: int = Field(nullable=False)
+    version: int = Field(nullable=False, index=True)
+    eliminado_en: Optional[datetime] = None
+
+# ================================================================================
+# MODELO CURSO_CATALOGO - Modelo de lectura desnormalizado del catálogo público
+# ================================================================================
+class CursoCatalogo(SQLModel, table=True):
+    """
+    Copia desnormalizada de un curso tal como lo lee el catálogo público.
+    
+    Una fila por curso con todo lo que /cursos y la exportación necesitan
+    (institución, ciudades y texto de búsqueda ya resueltos), así la lectura
+    pública es un recorrido plano de una sola tabla sin joins.
+    
+    No es la fuente de verdad: la escriben agregar_curso(), modificar_curso(),
+    eliminar_curso() e importar_cursos() en la MISMA transacción que la
+    escritura del curso, y se reconstruye completa con
+    reconstruir_curso_catalogo() (scripts/rebuild_catalog.py).
+    
+    CAMPOS:
+    - curso_id: ID del curso (clave primaria, orden de lectura)
+    - nombre, nivel, requisitos_ingreso, duracion_numero, duracion_unidad,
+      informacion: Copia de los campos del curso
+    - institucion_id, institucion_nombre, institucion_logo: Institución del curso
+    - ciudad_ids: IDs de ciudades entre comas (",1,3,") para filtrar con LIKE
+    - lugar: Nombres de las ciudades en orden de ID ("Salto, Virtual")
+    - texto_busqueda: Nombre + información en minúsculas y sin tildes
+    - version: Generación del catálogo de la última escritura de la fila
+    
+    UTILIZADO EN:
+    - database.py: _sincronizar_curso_catalogo(), reconstruir_curso_catalogo(),
+      _cargar_catalogo_cursos(), cursos_cambiados_desde() e
+      iterar_cursos_exportacion()
+    """
+    __tablename__ = "curso_catalogo"
+    
+    # === CAMPOS DEL CURSO ===
+    curso_id: int = Field(primary_key=True)
+    nombre: str
+    nivel: Optional[str] = Field(default=None, index=True)
+    requisitos_ingreso: Optional[str] = None
+    duracion_numero: Optional[str] = None
+    duracion_unidad: Optional[str] = None
+    informacion: Optional[str] = None
+    
+    # === INSTITUCIÓN Y CIUDADES RESUELTAS ===
+    institucion_id: Optional[int] = Field(default=None, index=True)
+    institucion_nombre: Optional[str] = None
+    institucion_logo: Optional[str] = None
+    ciudad_ids: str = Field(default=",", nullable=False)
+    lugar: str = Field(default="", nullable=False)
+    
+    # === BÚSQUEDA Y SEGUIMIENTO DE CAMBIOS ===
+    texto_busqueda: str = Field(default="", nullable=False)
+    version: int = Field(default=0, nullable=False, index=True)
+
 # ================================================================================
 # NOTAS IMPORTANTES SOBRE SQLMODEL
 # ================================================================================
@@ -4,7 +4,7 @@ import reflex as rx
 from ..state import State
 from ..constants import CursosConstants
 from .. import theme
-from ..theme import ButtonStyle, ComponentStyle, create_course_table_header, create_course_table_cell, create_custom_dropdown_css
+from ..theme import ButtonStyle, ComponentStyle, create_course_table_cell, create_custom_dropdown_css
 from typing import Dict, Any
 
 def admin_layout_desktop(*content) -> rx.Component:
@@ -513,6 +513,113 @@ def delete_alert_dialog() -> rx.Component:
         )
     )
 
+def importar_cursos_dialog() -> rx.Component:
+    """Diálogo para importar cursos en bloque desde un archivo CSV o XLSX."""
+    return rx.cond(
+        State.show_import_dialog,
+        rx.box(
+            rx.box(
+                rx.vstack(
+                    rx.heading(
+                        "Importar cursos",
+                        size="4",
+                        font_family=theme.Typography.FONT_FAMILY,
+                        font_weight=theme.Typography.FONT_WEIGHTS["semibold"],
+                        color=theme.Color.GRAY_900,
+                    ),
+                    rx.text(
+                        "Columnas: nombre, nivel, duracion_numero, duracion_unidad, "
+                        "requisitos_ingreso, ciudades (separadas por coma), informacion.",
+                        color=theme.Color.GRAY_700,
+                        font_family=theme.Typography.FONT_FAMILY,
+                        font_size="0.9em",
+                    ),
+                    rx.divider(border_color=theme.Color.GRAY_500),
+                    rx.upload(
+                        rx.vstack(
+                            rx.text(
+                                "Arrastre un archivo aquí o haga clic para seleccionarlo",
+                                color=theme.Color.GRAY_900,
+                                font_family=theme.Typography.FONT_FAMILY,
+                            ),
+                            rx.foreach(
+                                rx.selected_files("import_cursos"),
+                                lambda archivo: rx.text(archivo, color=theme.Color.BLUE_300, font_weight="bold"),
+                            ),
+                            align_items="center",
+                        ),
+                        id="import_cursos",
+                        accept={
+                            "text/csv": [".csv"],
+                            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": [".xlsx"],
+                        },
+                        max_files=1,
+                        multiple=False,
+                        border=f"1px dashed {theme.Color.GRAY_500}",
+                        border_radius="8px",
+                        padding="2em",
+                        width="100%",
+                    ),
+                    rx.cond(
+                        State.import_resumen != "",
+                        rx.text(
+                            State.import_resumen,
+                            color=theme.Color.GRAY_900,
+                            font_family=theme.Typography.FONT_FAMILY,
+                            font_weight=theme.Typography.FONT_WEIGHTS["medium"],
+                        ),
+                    ),
+                    rx.cond(
+                        State.import_errores,
+                        rx.box(
+                            rx.foreach(
+                                State.import_errores,
+                                lambda error: rx.text(error, color=theme.Color.DANGER, font_size="0.85em"),
+                            ),
+                            max_height="200px",
+                            overflow_y="auto",
+                            width="100%",
+                        ),
+                    ),
+                    rx.divider(border_color=theme.Color.GRAY_500),
+                    rx.hstack(
+                        rx.button(
+                            "Cerrar",
+                            on_click=[State.cerrar_dialogo_importar, rx.clear_selected_files("import_cursos")],
+                            **ButtonStyle.secondary(),
+                            font_family=theme.Typography.FONT_FAMILY,
+                        ),
+                        rx.button(
+                            "Importar",
+                            on_click=State.handle_import_cursos(rx.upload_files(upload_id="import_cursos")),
+                            **ButtonStyle.primary(),
+                            font_family=theme.Typography.FONT_FAMILY,
+                        ),
+                        spacing="3",
+                        justify="end",
+                        width="100%",
+                    ),
+                    spacing="4",
+                    width="100%",
+                ),
+                **ComponentStyle.MODAL,
+                padding="20px",
+                max_width="600px",
+                width="95%",
+            ),
+            position="fixed",
+            top="0",
+            left="0",
+            width="100vw",
+            height="100vh",
+            bg="rgba(0,0,0,0.6)",
+            display="flex",
+            align_items="center",
+            justify_content="center",
+            z_index="1000",
+        )
+    )
+
 def unauthorized_access_page() -> rx.Component:
     """Página que se muestra cuando se intenta acceder al admin sin estar logueado."""
     return rx.vstack(
@@ -723,6 +830,97 @@ def render_curso_card_mobile(curso: Dict[str, Any]) -> rx.Component:
         transition="all 0.2s ease-in-out",
     )
 
+# Columnas de la tabla de cursos: (título, clave de orden en el servidor o None)
+COLUMNAS_TABLA_CURSOS = [
+    ("Nombre", "nombre"),
+    ("Nivel", "nivel"),
+    ("Duración", "duracion"),
+    ("Requisitos", "requisitos_ingreso"),
+    ("Lugar", None),
+    ("Información", None),
+    ("Acciones", None),
+]
+
+def encabezado_ordenable(titulo: str, columna: str) -> rx.Component:
+    """Celda de encabezado que ordena la tabla en el servidor al hacer clic."""
+    return rx.table.column_header_cell(
+        rx.hstack(
+            rx.text(titulo),
+            rx.cond(
+                State.admin_orden == columna,
+                rx.text(rx.cond(State.admin_orden_desc, "▼", "▲")),
+            ),
+            spacing="1",
+            align="center",
+        ),
+        on_click=State.ordenar_cursos_admin(columna),
+        cursor="pointer",
+        **ComponentStyle.COURSE_TABLE_HEADER,
+    )
+
+def encabezado_tabla_cursos() -> rx.Component:
+    """Fila de encabezados de la tabla de cursos del admin."""
+    return rx.table.row(
+        *[
+            encabezado_ordenable(titulo, columna) if columna
+            else rx.table.column_header_cell(titulo, **ComponentStyle.COURSE_TABLE_HEADER)
+            for titulo, columna in COLUMNAS_TABLA_CURSOS
+        ]
+    )
+
+def selector_orden_mobile() -> rx.Component:
+    """Selector de orden para la vista de tarjetas (móvil)."""
+    return rx.hstack(
+        rx.select.root(
+            rx.select.trigger(placeholder="Ordenar por"),
+            rx.select.content(
+                *[
+                    rx.select.item(titulo, value=columna)
+                    for titulo, columna in COLUMNAS_TABLA_CURSOS if columna
+                ]
+            ),
+            value=State.admin_orden,
+            on_change=State.ordenar_cursos_admin,
+        ),
+        rx.button(
+            rx.cond(State.admin_orden_desc, "▼", "▲"),
+            on_click=State.ordenar_cursos_admin(State.admin_orden),
+            **ButtonStyle.secondary(),
+        ),
+        spacing="2",
+        width="100%",
+        margin_bottom="1em",
+    )
+
+def paginacion_cursos_admin() -> rx.Component:
+    """Controles de paginación de los cursos del admin."""
+    return rx.hstack(
+        rx.button(
+            "Anterior",
+            on_click=State.pagina_anterior_admin,
+            disabled=State.admin_pagina <= 1,
+            **ButtonStyle.secondary(),
+            font_family=theme.Typography.FONT_FAMILY,
+        ),
+        rx.text(
+            f"Página {State.admin_pagina} de {State.admin_total_paginas} ({State.admin_total_cursos} cursos)",
+            color=theme.Color.GRAY_900,
+            font_family=theme.Typography.FONT_FAMILY,
+        ),
+        rx.button(
+            "Siguiente",
+            on_click=State.pagina_siguiente_admin,
+            disabled=State.admin_pagina >= State.admin_total_paginas,
+            **ButtonStyle.secondary(),
+            font_family=theme.Typography.FONT_FAMILY,
+        ),
+        spacing="3",
+        align="center",
+        justify="center",
+        width="100%",
+        margin_top="1em",
+    )
+
 def admin_content_desktop() -> rx.Component:
     """Contenido de admin para desktop."""
     return admin_layout_desktop(
@@ -753,6 +951,12 @@ def admin_content_desktop() -> rx.Component:
                     align_items="start",
                 ),
                 rx.spacer(),
+                rx.button(
+                    "Importar CSV/XLSX",
+                    on_click=State.abrir_dialogo_importar,
+                    **ButtonStyle.secondary(),
+                    font_family=theme.Typography.FONT_FAMILY,
+                ),
                 rx.button(
                     "Agregar Nuevo Curso", 
                     on_click=State.abrir_dialogo_agregar,
@@ -766,17 +970,18 @@ def admin_content_desktop() -> rx.Component:
             
             rx.cond(
                 State.admin_cursos,
-                # Tabla tradicional para administración de cursos (con botones funcionales)
-                rx.table.root(
-                    rx.table.header(
-                        create_course_table_header([
-                            "Nombre", "Nivel", "Duración", "Requisitos", "Lugar", "Información", "Acciones"
-                        ])
-                    ),
-                    rx.table.body(
-                        rx.foreach(State.admin_cursos, render_curso_row)
+                # Tabla de cursos: solo la página actual, ordenada en el servidor
+                rx.vstack(
+                    rx.table.root(
+                        rx.table.header(encabezado_tabla_cursos()),
+                        rx.table.body(
+                            rx.foreach(State.admin_cursos, render_curso_row)
+                        ),
+                        **ComponentStyle.COURSE_TABLE,
                     ),
-                    **ComponentStyle.COURSE_TABLE,
+                    paginacion_cursos_admin(),
+                    spacing="0",
+                    width="100%",
                 ),
                 # Mostrar mensaje cuando no hay cursos
                 rx.box(
@@ -841,6 +1046,13 @@ def admin_content_mobile() -> rx.Component:
                     font_family=theme.Typography.FONT_FAMILY,
                     width="100%",
                 ),
+                rx.button(
+                    "Importar CSV/XLSX",
+                    on_click=State.abrir_dialogo_importar,
+                    **ButtonStyle.secondary(),
+                    font_family=theme.Typography.FONT_FAMILY,
+                    width="100%",
+                ),
                 width="100%",
                 spacing="4",
                 margin_bottom="1.5em",
@@ -852,7 +1064,9 @@ def admin_content_mobile() -> rx.Component:
                 State.admin_cursos,
                 # Vista de tarjetas para móvil
                 rx.vstack(
+                    selector_orden_mobile(),
                     rx.foreach(State.admin_cursos, render_curso_card_mobile),
+                    paginacion_cursos_admin(),
                     spacing="0",
                     width="100%",
                 ),
@@ -891,6 +1105,8 @@ def admin_page() -> rx.Component:
         rx.box(
             rx.desktop_only(admin_content_desktop()),
             rx.mobile_and_tablet(admin_content_mobile()),
+            # Fuera de desktop/móvil: el componente de upload debe tener un id único
+            importar_cursos_dialog(),
             width="100%",
         ),
         # Usuario no autenticado - mostrar página de redirección
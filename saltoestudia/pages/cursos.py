@@ -105,18 +105,58 @@ def render_curso_card_mobile_public(curso: dict) -> rx.Component:
         transition="all 0.2s ease-in-out",
     )
 
+def render_sugerencia_busqueda(sugerencia: dict) -> rx.Component:
+    """Una sugerencia del autocompletado: nombre y si es curso o institución."""
+    return rx.hstack(
+        rx.text(sugerencia["texto"], color=theme.Color.GRAY_900, font_size="2"),
+        rx.spacer(),
+        rx.badge(
+            rx.cond(sugerencia["tipo"] == "institucion", "Institución", "Curso"),
+            variant="soft",
+        ),
+        on_click=State.elegir_sugerencia(sugerencia["texto"], sugerencia["tipo"]),
+        cursor="pointer",
+        width="100%",
+        padding="6px 10px",
+        _hover={"bg": theme.Color.GRAY_500},
+    )
+
+def sugerencias_busqueda() -> rx.Component:
+    """Lista de sugerencias flotando debajo del buscador (solo si hay)."""
+    return rx.cond(
+        State.sugerencias_busqueda,
+        rx.vstack(
+            rx.foreach(State.sugerencias_busqueda, render_sugerencia_busqueda),
+            spacing="0",
+            width="100%",
+            bg=theme.Color.GRAY_300,
+            border=f"1px solid {theme.Color.GRAY_500}",
+            border_radius="6px",
+            margin_top="4px",
+            position="absolute",
+            top="100%",
+            left="0",
+            z_index="10",
+        ),
+    )
+
 def cursos_filters_desktop() -> rx.Component:
     """Filtros para versión desktop."""
     return rx.box(
         # Input de búsqueda y botón en la misma línea
         rx.hstack(
-                    rx.input(
-            placeholder="Buscar por nombre o información...",
-            value=State.busqueda_texto,
-            on_change=State.actualizar_busqueda_texto,
-            **ComponentStyle.FORM_INPUT,
-            width="100%",
-        ),
+            rx.box(
+                rx.input(
+                    placeholder="Buscar por nombre o información...",
+                    value=State.busqueda_texto,
+                    on_change=State.actualizar_busqueda_texto,
+                    **ComponentStyle.FORM_INPUT,
+                    width="100%",
+                ),
+                sugerencias_busqueda(),
+                position="relative",
+                width="100%",
+            ),
             rx.button(
                 "Limpiar Filtros",
                 on_click=State.limpiar_filtros,
@@ -227,15 +267,79 @@ def cursos_filters_desktop() -> rx.Component:
         margin_bottom="1em",
     )
 
+# Opciones de orden de resultados: (título, columna)
+OPCIONES_ORDEN_CURSOS = [
+    ("Sin orden", "sin_orden"),
+    ("Nombre", "nombre"),
+    ("Institución", "institucion"),
+    ("Duración", "duracion"),
+    ("Nivel", "nivel"),
+]
+
+def encabezado_ordenable_cursos(titulo: str, columna: str) -> rx.Component:
+    """Encabezado de la tabla pública que ordena los resultados al hacer clic."""
+    return rx.table.cell(
+        rx.hstack(
+            rx.text(titulo),
+            rx.cond(
+                State.orden_cursos == columna,
+                rx.text(rx.cond(State.orden_cursos_desc, "▼", "▲")),
+            ),
+            spacing="1",
+            align="center",
+        ),
+        on_click=State.actualizar_orden_cursos(columna),
+        cursor="pointer",
+    )
+
+def selector_orden_cursos_mobile() -> rx.Component:
+    """Selector de orden de resultados para móvil."""
+    return rx.vstack(
+        rx.text(
+            "Ordenar por:",
+            font_weight=theme.Typography.FONT_WEIGHTS["semibold"],
+            color=theme.Color.GRAY_900,
+            font_family=theme.Typography.FONT_FAMILY,
+            font_size="3",
+            margin_bottom="2px",
+        ),
+        rx.hstack(
+            rx.select.root(
+                rx.select.trigger(placeholder="Sin orden", width="100%"),
+                rx.select.content(
+                    *[rx.select.item(titulo, value=columna) for titulo, columna in OPCIONES_ORDEN_CURSOS]
+                ),
+                value=rx.cond(State.orden_cursos == "", "sin_orden", State.orden_cursos),
+                on_change=State.actualizar_orden_cursos,
+            ),
+            rx.button(
+                rx.cond(State.orden_cursos_desc, "▼", "▲"),
+                on_click=State.actualizar_orden_cursos(State.orden_cursos),
+                disabled=State.orden_cursos == "",
+                **ButtonStyle.secondary(),
+            ),
+            spacing="2",
+            width="100%",
+        ),
+        spacing="1",
+        align="start",
+        width="100%",
+    )
+
 def cursos_filters_mobile() -> rx.Component:
     """Filtros para versión móvil."""
     return rx.vstack(
-        rx.input(
-            placeholder="Buscar por nombre o información...",
-            value=State.busqueda_texto,
-            on_change=State.actualizar_busqueda_texto,
+        rx.box(
+            rx.input(
+                placeholder="Buscar por nombre o información...",
+                value=State.busqueda_texto,
+                on_change=State.actualizar_busqueda_texto,
+                width="100%",
+                **ComponentStyle.FORM_INPUT,
+            ),
+            sugerencias_busqueda(),
+            position="relative",
             width="100%",
-            **ComponentStyle.FORM_INPUT,
             margin_bottom="1.5em",
         ),
         rx.vstack(
@@ -322,6 +426,7 @@ def cursos_filters_mobile() -> rx.Component:
             align="start",
             width="100%",
         ),
+        selector_orden_cursos_mobile(),
         rx.button(
             "Limpiar Filtros",
             on_click=State.limpiar_filtros,
@@ -367,11 +472,11 @@ def cursos_content_desktop() -> rx.Component:
             rx.table.root(
                 rx.table.header(
                     rx.table.row(
-                        rx.table.cell("Nombre"),
-                        rx.table.cell("Nivel"),
-                        rx.table.cell("Duración"),
+                        encabezado_ordenable_cursos("Nombre", "nombre"),
+                        encabezado_ordenable_cursos("Nivel", "nivel"),
+                        encabezado_ordenable_cursos("Duración", "duracion"),
                         rx.table.cell("Requisitos"),
-                        rx.table.cell("Institución"),
+                        encabezado_ordenable_cursos("Institución", "institucion"),
                         rx.table.cell("Información"),
                         rx.table.cell("Lugar"),
                     )
@@ -0,0 +1,315 @@
+# ================================================================================
+# TIEMPOS POR EVENTO Y PERFILADO DE EVENTOS LENTOS - SALTO ESTUDIA
+# ================================================================================
+#
+# Mide cuánto tarda cada handler del State (aplicar_filtros,
+# cargar_datos_cursos_page, handle_login, guardar_curso...) desde que Reflex
+# tiene el estado de la sesión hasta que arma la última actualización (incluye
+# el cálculo del delta). Así se puede diagnosticar una lentitud en producción
+# después de que ocurrió.
+#
+# QUÉ SE REGISTRA:
+# - Histograma de latencia por handler (buckets de BUCKETS_MS) y p50/p95/p99
+#   de las últimas MUESTRAS_POR_HANDLER llamadas
+# - Cada evento que supera EVENTO_LENTO_MS se anota en el log con las queries
+#   que hizo
+# - Con PERFILAR_EVENTOS_LENTOS=true, además se guarda en PERFILES_DIR:
+#     <fecha>_<handler>_<ms>ms.prof → cProfile (pstats / snakeviz)
+#     <fecha>_<handler>_<ms>ms.txt  → SQL emitido con tiempos + funciones top
+#   El directorio rota: se conservan los últimos PERFILES_MAX eventos.
+#
+# MUESTREO DEL PERFIL:
+# cProfile tiene que estar activo ANTES de saber si el evento va a ser lento,
+# así que se perfila una fracción PERFIL_MUESTREO de los eventos. Cuando un
+# handler es lento sin perfil, su próxima llamada se perfila siempre. Solo hay
+# un perfil activo por proceso a la vez (cProfile es uno por hilo); si otro
+# evento se intercala mientras el primero espera, sus funciones pueden
+# aparecer en ese perfil. El SQL sí se captura por evento (contextvars).
+#
+# EXPOSICIÓN:
+# - GET /api/metrics/eventos → histograma en formato de texto de Prometheus
+# - GET /api/debug/eventos   → reporte JSON (handlers más lentos, últimos lentos)
+# Se activa con MEDIR_EVENTOS=true y ambos requieren DIAGNOSTICO_TOKEN (ver
+# api.py).
+#
+# UTILIZADO EN:
+# - saltoestudia.py: app.add_middleware(MiddlewareTiempos()) si MEDIR_EVENTOS
+# - api.py: endpoints de métricas y reporte
+# ================================================================================
+
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from reflex.middleware import Middleware
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .instrumentacion import _nombre_handler, _percentil
+
+MEDIR_EVENTOS = os.getenv("MEDIR_EVENTOS", "false").lower() == "true"
+EVENTO_LENTO_MS = float(os.getenv("EVENTO_LENTO_MS", "500"))
+PERFILAR_EVENTOS_LENTOS = os.getenv("PERFILAR_EVENTOS_LENTOS", "false").lower() == "true"
+PERFIL_MUESTREO = float(os.getenv("PERFIL_MUESTREO", "0.05"))
+PERFILES_DIR = os.getenv("PERFILES_DIR", "logs/perfiles")
+PERFILES_MAX = int(os.getenv("PERFILES_MAX", "50"))
+
+# Límites de buckets (ms) del histograma, como los de Prometheus
+BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+MUESTRAS_POR_HANDLER = 500
+MAX_SQL_POR_EVENTO = 200
+# Un perfil que sigue activo después de esto quedó huérfano (evento sin postprocess)
+PERFIL_HUERFANO_SEGUNDOS = 60
+
+class _Medicion:
+    """Datos de un evento en curso (uno por tarea, ver _medicion_actual)."""
+
+    __slots__ = ("handler", "inicio", "perfil", "sql")
+
+    def __init__(self, handler: str, perfil: Optional[cProfile.Profile]):
+        self.handler = handler
+        self.inicio = time.perf_counter()
+        self.perfil = perfil
+        self.sql: List[tuple] = []  # (ms, sql)
+
+_medicion_actual: contextvars.ContextVar[Optional[_Medicion]] = contextvars.ContextVar(
+    "saltoestudia_medicion_evento", default=None
+)
+
+# === CAPTURA DE SQL POR EVENTO ===
+# Listeners sobre todos los engines (primaria y réplica): solo anotan si la
+# tarea actual está dentro de un evento medido.
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    if _medicion_actual.get() is not None:
+        conn.info.setdefault("saltoestudia_inicio_sql", []).append(time.perf_counter())
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    medicion = _medicion_actual.get()
+    if medicion is None:
+        return
+    inicios = conn.info.get("saltoestudia_inicio_sql")
+    if not inicios:
+        return
+    duracion_ms = (time.perf_counter() - inicios.pop()) * 1000
+    if len(medicion.sql) < MAX_SQL_POR_EVENTO:
+        medicion.sql.append((duracion_ms, " ".join(statement.split())))
+
+def activar_captura_sql():
+    """Registra los listeners de SQL (idempotente)."""
+    if not event.contains(Engine, "before_cursor_execute", _antes_de_ejecutar):
+        event.listen(Engine, "before_cursor_execute", _antes_de_ejecutar)
+        event.listen(Engine, "after_cursor_execute", _despues_de_ejecutar)
+
+# === HISTOGRAMAS ===
+
+class TiemposEventos:
+    """Histograma de latencia por handler y registro de eventos lentos (seguro entre hilos)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta todo lo registrado."""
+        with self._lock:
+            self.buckets: Dict[str, List[int]] = defaultdict(lambda: [0] * (len(BUCKETS_MS) + 1))
+            self.cantidad: Dict[str, int] = defaultdict(int)
+            self.suma_ms: Dict[str, float] = defaultdict(float)
+            self.maximo_ms: Dict[str, float] = defaultdict(float)
+            self.muestras: Dict[str, deque] = defaultdict(lambda: deque(maxlen=MUESTRAS_POR_HANDLER))
+            self.lentos: deque = deque(maxlen=50)
+            # Handlers que fueron lentos sin perfil: su próxima llamada se perfila
+            self.armados: set = set()
+
+    def registrar(self, handler: str, duracion_ms: float):
+        with self._lock:
+            indice = len(BUCKETS_MS)
+            for i, limite in enumerate(BUCKETS_MS):
+                if duracion_ms <= limite:
+                    indice = i
+                    break
+            self.buckets[handler][indice] += 1
+            self.cantidad[handler] += 1
+            self.suma_ms[handler] += duracion_ms
+            self.maximo_ms[handler] = max(self.maximo_ms[handler], duracion_ms)
+            self.muestras[handler].append(duracion_ms)
+
+    def registrar_lento(self, detalle: Dict[str, Any]):
+        with self._lock:
+            self.lentos.append(detalle)
+
+    def reporte(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Reporte de depuración: handlers ordenados por p95 y últimos eventos lentos.
+
+        Returns:
+            Dict con "umbral_ms", "handlers" y "lentos"
+        """
+        with self._lock:
+            handlers = []
+            for handler, cantidad in self.cantidad.items():
+                muestras = self.muestras[handler]
+                handlers.append({
+                    "handler": handler,
+                    "eventos": cantidad,
+                    "promedio_ms": round(self.suma_ms[handler] / cantidad, 2),
+                    "p50_ms": round(_percentil(muestras, 0.50), 2),
+                    "p95_ms": round(_percentil(muestras, 0.95), 2),
+                    "p99_ms": round(_percentil(muestras, 0.99), 2),
+                    "maximo_ms": round(self.maximo_ms[handler], 2),
+                })
+            handlers.sort(key=lambda h: -h["p95_ms"])
+            return {
+                "umbral_ms": EVENTO_LENTO_MS,
+                "handlers": handlers[:top],
+                "lentos": list(self.lentos)[-top:],
+            }
+
+    def prometheus(self) -> str:
+        """Histograma de latencia en el formato de texto de Prometheus."""
+        nombre = "saltoestudia_evento_duracion_segundos"
+        lineas = [
+            f"# HELP {nombre} Duración de los eventos por handler",
+            f"# TYPE {nombre} histogram",
+        ]
+        with self._lock:
+            for handler, buckets in self.buckets.items():
+                acumulado = 0
+                for limite, cantidad in zip(BUCKETS_MS, buckets):
+                    acumulado += cantidad
+                    lineas.append(f'{nombre}_bucket{{handler="{handler}",le="{limite / 1000:g}"}} {acumulado}')
+                lineas.append(f'{nombre}_bucket{{handler="{handler}",le="+Inf"}} {self.cantidad[handler]}')
+                lineas.append(f'{nombre}_sum{{handler="{handler}"}} {self.suma_ms[handler] / 1000:.6f}')
+                lineas.append(f'{nombre}_count{{handler="{handler}"}} {self.cantidad[handler]}')
+        return "\n".join(lineas) + "\n"
+
+# Instancia única por worker
+tiempos_eventos = TiemposEventos()
+
+# === PERFILES EN DISCO ===
+
+_perfil_lock = threading.Lock()
+_perfil_activo: Optional[tuple] = None  # (cProfile.Profile, inicio monotonic)
+
+def _iniciar_perfil(handler: str) -> Optional[cProfile.Profile]:
+    """Activa cProfile para este evento si corresponde y no hay otro activo."""
+    global _perfil_activo
+    if not PERFILAR_EVENTOS_LENTOS:
+        return None
+    if handler not in tiempos_eventos.armados and random.random() >= PERFIL_MUESTREO:
+        return None
+    with _perfil_lock:
+        if _perfil_activo is not None:
+            perfil, inicio = _perfil_activo
+            if time.monotonic() - inicio < PERFIL_HUERFANO_SEGUNDOS:
+                return None
+            perfil.disable()
+        perfil = cProfile.Profile()
+        _perfil_activo = (perfil, time.monotonic())
+    tiempos_eventos.armados.discard(handler)
+    perfil.enable()
+    return perfil
+
+def _detener_perfil(perfil: cProfile.Profile):
+    global _perfil_activo
+    perfil.disable()
+    with _perfil_lock:
+        if _perfil_activo is not None and _perfil_activo[0] is perfil:
+            _perfil_activo = None
+
+def _rotar_perfiles(directorio: str):
+    """Deja solo los archivos de los últimos PERFILES_MAX eventos."""
+    eventos: Dict[str, float] = {}
+    for archivo in os.scandir(directorio):
+        raiz, extension = os.path.splitext(archivo.name)
+        if extension in (".prof", ".txt"):
+            eventos[raiz] = max(eventos.get(raiz, 0), archivo.stat().st_mtime)
+    for raiz in sorted(eventos, key=eventos.get)[:-PERFILES_MAX or None]:
+        for extension in (".prof", ".txt"):
+            try:
+                os.remove(os.path.join(directorio, raiz + extension))
+            except FileNotFoundError:
+                pass
+
+def guardar_perfil(medicion: _Medicion, duracion_ms: float) -> Optional[str]:
+    """
+    Escribe el SQL (y el perfil, si lo hay) de un evento lento en PERFILES_DIR.
+
+    Returns:
+        str: Ruta base de los archivos escritos (sin extensión), None si falló
+    """
+    try:
+        os.makedirs(PERFILES_DIR, exist_ok=True)
+        seguro = re.sub(r"[^A-Za-z0-9_.-]", "_", medicion.handler)
+        base = os.path.join(
+            PERFILES_DIR,
+            f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{seguro}_{int(duracion_ms)}ms",
+        )
+        lineas = [
+            f"Handler: {medicion.handler}",
+            f"Duración: {duracion_ms:.1f} ms (umbral {EVENTO_LENTO_MS:g} ms)",
+            f"Queries: {len(medicion.sql)} ({sum(ms for ms, _ in medicion.sql):.1f} ms en la base)",
+            "",
+            "=== SQL ===",
+        ]
+        lineas += [f"{ms:8.2f} ms  {sql}" for ms, sql in medicion.sql]
+        if medicion.perfil is not None:
+            medicion.perfil.dump_stats(base + ".prof")
+            salida = io.StringIO()
+            pstats.Stats(medicion.perfil, stream=salida).sort_stats("cumulative").print_stats(30)
+            lineas += ["", "=== PERFIL (cumulative, top 30) ===", salida.getvalue()]
+        with open(base + ".txt", "w", encoding="utf-8") as archivo:
+            archivo.write("\n".join(lineas) + "\n")
+        _rotar_perfiles(PERFILES_DIR)
+        return base
+    except Exception as e:
+        print(f"[ERROR] No se pudo guardar el perfil de {medicion.handler}: {e}")
+        return None
+
+# === MIDDLEWARE ===
+
+class MiddlewareTiempos(Middleware):
+    """Middleware de Reflex que mide cada evento y perfila los lentos."""
+
+    async def preprocess(self, app, state, event):
+        handler = _nombre_handler(event.name)
+        _medicion_actual.set(_Medicion(handler, _iniciar_perfil(handler)))
+        return None
+
+    async def postprocess(self, app, state, event, update):
+        medicion = _medicion_actual.get()
+        if medicion is None or not update.final:
+            return update
+        _medicion_actual.set(None)
+        try:
+            if medicion.perfil is not None:
+                _detener_perfil(medicion.perfil)
+            duracion_ms = (time.perf_counter() - medicion.inicio) * 1000
+            tiempos_eventos.registrar(medicion.handler, duracion_ms)
+            if duracion_ms >= EVENTO_LENTO_MS:
+                print(f"[PERFORMANCE] Evento lento: {medicion.handler} {duracion_ms:.0f} ms, "
+                      f"{len(medicion.sql)} queries")
+                archivo = guardar_perfil(medicion, duracion_ms) if PERFILAR_EVENTOS_LENTOS else None
+                if PERFILAR_EVENTOS_LENTOS and medicion.perfil is None:
+                    tiempos_eventos.armados.add(medicion.handler)
+                tiempos_eventos.registrar_lento({
+                    "handler": medicion.handler,
+                    "duracion_ms": round(duracion_ms, 1),
+                    "queries": len(medicion.sql),
+                    "perfil": archivo if medicion.perfil is not None else None,
+                    "fecha": datetime.now().isoformat(timespec="seconds"),
+                })
+        except Exception as e:
+            # La medición nunca debe romper un evento
+            print(f"[ERROR] Medición de tiempos de evento: {e}")
+        return update
@@ -0,0 +1,204 @@
+# ================================================================================
+# REGISTRO DE QUERIES LENTAS CON PLAN DE EJECUCIÓN - SALTO ESTUDIA
+# ================================================================================
+#
+# Opcional (REGISTRAR_QUERIES_LENTAS=true). Se instala sobre el engine
+# primario y el de la réplica (ver database.py) y anota cada statement que
+# tarda más de QUERY_LENTA_MS:
+#
+# - SQL (con placeholders), parámetros redactados, duración y la función de
+#   saltoestudia que lo emitió (ej. "database.py:obtener_cursos:542")
+# - La PRIMERA vez que un SQL es lento se pide su plan en segundo plano (un
+#   hilo, de a un plan por vez) con otra conexión del pool, que se descarta
+#   con ROLLBACK. Ni la transacción ni el tiempo de la request que emitió el
+#   SQL se ven afectados; hasta que el plan está listo figura como null:
+#     SQLite     → EXPLAIN QUERY PLAN
+#     PostgreSQL → EXPLAIN (ANALYZE, BUFFERS) para SELECT (lo vuelve a
+#                  ejecutar: el costo se paga una vez por SQL), EXPLAIN a secas
+#                  para escrituras (ANALYZE las aplicaría dos veces)
+#   El plan queda guardado junto al SQL y se imprime en el log, así un índice
+#   faltante (SCAN en lugar de SEARCH, Seq Scan) aparece sin buscarlo a mano.
+#
+# REDACCIÓN: los parámetros de texto y binarios se reemplazan por su largo
+# (pueden ser correos, hashes o datos personales); números, booleanos y NULL
+# se dejan porque suelen ser IDs y ayudan a reproducir el plan.
+#
+# EXPOSICIÓN:
+# - GET /api/debug/queries → reporte JSON (404 si el registro no está activo;
+#   requiere DIAGNOSTICO_TOKEN, ver api.py)
+#
+# UTILIZADO EN:
+# - database.py: queries_lentas.instalar(engine)
+# - api.py: /api/debug/queries
+# ================================================================================
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+
+REGISTRAR_QUERIES_LENTAS = os.getenv("REGISTRAR_QUERIES_LENTAS", "false").lower() == "true"
+QUERY_LENTA_MS = float(os.getenv("QUERY_LENTA_MS", "100"))
+
+# Cantidad máxima de SQL distintos que se guardan (se descartan los más viejos)
+MAX_QUERIES_REGISTRADAS = 200
+
+_DIRECTORIO_PAQUETE = os.path.dirname(os.path.abspath(__file__))
+
+def redactar_parametros(parametros: Any) -> Any:
+    """Reemplaza los parámetros de texto y binarios por su largo."""
+    if isinstance(parametros, dict):
+        return {clave: redactar_parametros(valor) for clave, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        return [redactar_parametros(valor) for valor in parametros]
+    if isinstance(parametros, str):
+        return f"<texto {len(parametros)}>"
+    if isinstance(parametros, (bytes, bytearray, memoryview)):
+        return f"<binario {len(parametros)}>"
+    if parametros is None or isinstance(parametros, (bool, int, float)):
+        return parametros
+    return f"<{type(parametros).__name__}>"
+
+def funcion_llamadora() -> str:
+    """Primer frame de la pila que pertenece a saltoestudia (fuera de este módulo)."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        archivo = frame.f_code.co_filename
+        if archivo.startswith(_DIRECTORIO_PAQUETE) and archivo != __file__:
+            return f"{os.path.relpath(archivo, _DIRECTORIO_PAQUETE)}:{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "desconocido"
+
+def _plan_de_ejecucion(engine, statement: str, parametros: Any) -> str:
+    """
+    Pide el plan del statement con una conexión DBAPI propia del pool de `engine`.
+
+    Se usa la conexión cruda para no disparar de nuevo los eventos del engine
+    y se hace ROLLBACK al terminar: la conexión vuelve al pool sin cambios.
+    """
+    dialecto = engine.dialect.name
+    es_lectura = statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "WITH")
+    if dialecto == "sqlite":
+        prefijo = "EXPLAIN QUERY PLAN "
+    elif dialecto == "postgresql" and es_lectura:
+        prefijo = "EXPLAIN (ANALYZE, BUFFERS) "
+    else:
+        prefijo = "EXPLAIN "
+
+    conexion = engine.raw_connection()
+    try:
+        cursor_plan = conexion.cursor()
+        try:
+            cursor_plan.execute(prefijo + statement, parametros)
+            filas = cursor_plan.fetchall()
+        finally:
+            cursor_plan.close()
+            conexion.rollback()
+    finally:
+        conexion.close()
+
+    if dialecto == "sqlite":
+        # (id, padre, _, detalle): indentar según la profundidad del nodo
+        profundidad = {0: -1}
+        lineas = []
+        for id_nodo, padre, _, detalle in filas:
+            profundidad[id_nodo] = profundidad.get(padre, -1) + 1
+            lineas.append("  " * profundidad[id_nodo] + detalle)
+        return "\n".join(lineas)
+    return "\n".join(str(fila[0]) for fila in filas)
+
+class RegistroQueriesLentas:
+    """Queries lentas agrupadas por SQL, con su plan (seguro entre hilos)."""
+
+    def __init__(self, umbral_ms: float = QUERY_LENTA_MS):
+        self.umbral_ms = umbral_ms
+        self._lock = threading.Lock()
+        self.queries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Un solo hilo: los planes se piden de a uno, sin cargar la base en ráfagas
+        self._planes = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plan-query-lenta")
+
+    def instalar(self, engine):
+        """Registra los listeners en `engine` (idempotente)."""
+        if not event.contains(engine, "before_cursor_execute", self._antes):
+            event.listen(engine, "before_cursor_execute", self._antes)
+            event.listen(engine, "after_cursor_execute", self._despues)
+
+    def _antes(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("saltoestudia_inicio_query", []).append(time.perf_counter())
+
+    def _despues(self, conn, cursor, statement, parameters, context, executemany):
+        inicios = conn.info.get("saltoestudia_inicio_query")
+        if not inicios:
+            return
+        duracion_ms = (time.perf_counter() - inicios.pop()) * 1000
+        if duracion_ms < self.umbral_ms:
+            return
+        try:
+            self.registrar(conn.engine, statement, parameters, executemany, duracion_ms)
+        except Exception as e:
+            # El registro nunca debe romper la query que se está midiendo
+            print(f"[ERROR] Registro de query lenta: {e}")
+
+    def registrar(self, engine, statement: str, parametros: Any, executemany: bool, duracion_ms: float):
+        """Anota una ejecución lenta; en la primera de este SQL encarga el plan en segundo plano."""
+        llamador = funcion_llamadora()
+        with self._lock:
+            entrada = self.queries.get(statement)
+            primera = entrada is None
+            if primera:
+                entrada = {"sql": statement, "ocurrencias": 0, "total_ms": 0.0, "maximo_ms": 0.0, "plan": None}
+                self.queries[statement] = entrada
+                while len(self.queries) > MAX_QUERIES_REGISTRADAS:
+                    self.queries.popitem(last=False)
+            self.queries.move_to_end(statement)
+            entrada["ocurrencias"] += 1
+            entrada["total_ms"] += duracion_ms
+            entrada["maximo_ms"] = max(entrada["maximo_ms"], duracion_ms)
+            entrada["ultima"] = {
+                "duracion_ms": round(duracion_ms, 2),
+                "parametros": redactar_parametros(parametros),
+                "llamador": llamador,
+                "fecha": datetime.now().isoformat(timespec="seconds"),
+            }
+
+        print(f"[PERFORMANCE] Query lenta ({duracion_ms:.0f} ms) en {llamador}: {' '.join(statement.split())[:300]}")
+        if primera:
+            if executemany:
+                with self._lock:
+                    entrada["plan"] = "(executemany: sin plan)"
+            else:
+                self._planes.submit(self._guardar_plan, engine, entrada, statement, parametros)
+
+    def _guardar_plan(self, engine, entrada: Dict[str, Any], statement: str, parametros: Any):
+        """Obtiene el plan fuera de la request y lo guarda en la entrada del SQL."""
+        try:
+            plan = _plan_de_ejecucion(engine, statement, parametros)
+        except Exception as e:
+            plan = f"(no se pudo obtener el plan: {e})"
+        with self._lock:
+            entrada["plan"] = plan
+        print(f"[PERFORMANCE] Plan de ejecución de: {' '.join(statement.split())[:120]}\n{plan}")
+
+    def reporte(self, top: int = 20) -> Dict[str, Any]:
+        """
+        Reporte de depuración: SQL lentos ordenados por tiempo total.
+
+        Returns:
+            Dict con "umbral_ms" y "queries"
+        """
+        with self._lock:
+            queries = [
+                dict(entrada, total_ms=round(entrada["total_ms"], 2), maximo_ms=round(entrada["maximo_ms"], 2))
+                for entrada in self.queries.values()
+            ]
+        queries.sort(key=lambda q: -q["total_ms"])
+        return {"umbral_ms": self.umbral_ms, "queries": queries[:top]}
+
+# Instancia única por worker
+queries_lentas = RegistroQueriesLentas()
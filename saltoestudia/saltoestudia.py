@@ -34,14 +34,40 @@ from .pages.login import login_page         # Página de inicio de sesión
 # === IMPORTACIONES DE MODELOS ===
 # Importar modelos para que SQLModel los reconozca y cree las tablas
 from . import models
+from .api import api  # Endpoints HTTP adicionales (exportación del catálogo)
+from .instrumentacion import INSTRUMENTAR_ESTADO, MiddlewareInstrumentacion
+from .perfilado import MEDIR_EVENTOS, MiddlewareTiempos, activar_captura_sql
+from .salud import tarea_precarga
 
 # === CONFIGURACIÓN DE LA APLICACIÓN ===
 # Configuración principal de Reflex con Bootstrap CSS para estilos base
 # Bootstrap proporciona componentes responsivos y estilos consistentes
 app = rx.App(
-    stylesheets=["https://maxcdn.bootstrapcdn.com/bootstrap/4.5.2/css/bootstrap.min.css"]
+    stylesheets=["https://maxcdn.bootstrapcdn.com/bootstrap/4.5.2/css/bootstrap.min.css"],
+    api_transformer=api,  # Monta /api/... delante del backend de Reflex
 )
 
+# === PRECARGA DE CACHES AL ARRANCAR ===
+# Cada worker carga el catálogo, las listas de los filtros y el directorio de
+# sedes antes de responder /health/ready (ver salud.py)
+app.register_lifespan_task(tarea_precarga)
+
+# === TIEMPOS POR EVENTO ===
+# Con MEDIR_EVENTOS=true: histograma de latencia por handler y, con
+# PERFILAR_EVENTOS_LENTOS=true, perfil + SQL de los eventos lentos (ver
+# perfilado.py y /api/debug/eventos).
+# Se registra antes que la instrumentación para no medir su costo.
+if MEDIR_EVENTOS:
+    activar_captura_sql()
+    app.add_middleware(MiddlewareTiempos())
+
+# === INSTRUMENTACIÓN OPCIONAL ===
+# Con INSTRUMENTAR_ESTADO=true se mide el tamaño del estado por sesión y los
+# bytes de delta por handler (ver instrumentacion.py y /api/debug/estado)
+if INSTRUMENTAR_ESTADO:
+    app.add_middleware(MiddlewareInstrumentacion())
+    print("[LOG] Instrumentación de estado activa")
+
 # === REGISTRO AUTOMÁTICO DE PÁGINAS ===
 # IMPORTANTE: NO es necesario llamar a app.add_page() para las páginas que usan 
 # el decorador @rx.page. El decorador ya las registra automáticamente.
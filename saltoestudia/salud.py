@@ -0,0 +1,176 @@
+# ================================================================================
+# PRECARGA DE CACHES Y HEALTH CHECKS - SALTO ESTUDIA
+# ================================================================================
+#
+# Al arrancar, cada worker del backend carga en memoria lo que la primera
+# visita necesitaría leer de la base (catálogo de cursos, listas de nombres de
+# los filtros y el directorio de /instituciones). Hasta que termina, el worker
+# responde "no listo", así el proxy solo le manda tráfico cuando ya está
+# caliente y el primer visitante después de un deploy no paga el cold start.
+#
+# ENDPOINTS (ver api.py):
+# - GET /health/live  → 200 si el proceso responde, aunque la base no
+# - GET /health/ready → 200 si la precarga terminó y la base responde, 503 si no
+# Ambos incluyen la latencia de un SELECT 1 contra la base de lecturas.
+#
+# La precarga corre en un hilo (lifespan task de Reflex), así /health/live
+# responde mientras tanto. Un paso solo cuenta si leyó de verdad: las
+# funciones de database.py devuelven [] también ante un error, así que un
+# resultado vacío se confirma repitiendo su consulta. Los pasos que fallan se
+# reintentan cada PRECARGA_REINTENTO_SEGUNDOS y el worker no está listo hasta
+# que todos salen bien. Con PRECARGAR_CACHES=false no se precarga y el worker
+# queda listo apenas la base responde.
+#
+# UTILIZADO EN:
+# - saltoestudia.py: app.register_lifespan_task(tarea_precarga)
+# - api.py: /health/live y /health/ready
+# - docker-compose*.yml: healthcheck de Traefik sobre /health/ready
+# ================================================================================
+
+import asyncio
+import os
+import time
+from typing import Any, Dict
+
+from sqlalchemy import text
+
+from . import consultas
+from .database import (
+    catalogo_cursos_cargado,
+    obtener_ciudades_nombres,
+    obtener_cursos_catalogo,
+    obtener_instituciones_con_cursos_virtuales,
+    obtener_instituciones_nombres,
+    obtener_sedes_como_tarjetas,
+    obtener_sedes_fisicas_indexadas,
+    read_session,
+)
+
+PRECARGAR_CACHES = os.getenv("PRECARGAR_CACHES", "true").lower() == "true"
+PRECARGA_REINTENTO_SEGUNDOS = float(os.getenv("PRECARGA_REINTENTO_SEGUNDOS", "5"))
+
+# Estado de la precarga de este worker
+_precarga: Dict[str, Any] = {
+    "terminada": not PRECARGAR_CACHES,  # True solo cuando todos los pasos salieron bien
+    "intentos": 0,
+    "duracion_ms": None,
+    "pasos": {},
+    "errores": {},  # Paso → último error (pasos pendientes)
+}
+
+def _catalogo_leido():
+    """Catálogo compartido; error si no se pudo leer (no el vacío de arranque)."""
+    catalogo = obtener_cursos_catalogo()
+    if not catalogo_cursos_cargado():
+        raise RuntimeError("no se pudo cargar el catálogo de cursos (ver log)")
+    return catalogo
+
+def _filas_confirmadas(resultado, consulta, **parametros) -> int:
+    """
+    Cantidad de filas de `resultado`; si vino vacío, confirma que no fue un error.
+
+    Las funciones de database.py devuelven [] también cuando la lectura falla:
+    se repite `consulta` sin capturar excepciones para distinguir "sin datos"
+    de "no se pudo leer".
+    """
+    if resultado:
+        return len(resultado)
+    with read_session() as session:
+        if session.exec(consulta, params=parametros).first() is not None:
+            raise RuntimeError("devolvió vacío pero la base tiene filas (error de lectura, ver log)")
+    return 0
+
+# Lo que leen las primeras cargas de /cursos e /instituciones (todos esenciales)
+PASOS_PRECARGA = [
+    ("catalogo_cursos", lambda: len(_catalogo_leido())),
+    ("indice_autocompletado", lambda: len(_catalogo_leido().indice_prefijos())),
+    ("instituciones_nombres", lambda: _filas_confirmadas(
+        obtener_instituciones_nombres(), consultas.INSTITUCIONES_NOMBRES)),
+    ("ciudades_nombres", lambda: _filas_confirmadas(
+        obtener_ciudades_nombres(), consultas.CIUDADES_NOMBRES)),
+    ("sedes_como_tarjetas", lambda: _filas_confirmadas(
+        obtener_sedes_como_tarjetas(), consultas.SEDES_TARJETAS)),
+    ("instituciones_virtuales", lambda: _filas_confirmadas(
+        obtener_instituciones_con_cursos_virtuales(), consultas.INSTITUCIONES_CON_CURSOS_VIRTUALES)),
+    ("sedes_fisicas_indexadas", lambda: _filas_confirmadas(
+        obtener_sedes_fisicas_indexadas(), consultas.SEDES_FISICAS)),
+]
+
+def precargar_caches() -> Dict[str, Any]:
+    """
+    Ejecuta los pasos de la precarga que todavía no salieron bien.
+
+    Un paso que falla no detiene los demás: queda en "errores" hasta que un
+    reintento lo completa. "terminada" pasa a True recién cuando no queda
+    ninguno pendiente.
+
+    Returns:
+        Dict: Estado de la precarga (terminada, intentos, duracion_ms, pasos, errores)
+    """
+    inicio = time.perf_counter()
+    _precarga["intentos"] += 1
+    for nombre, paso in PASOS_PRECARGA:
+        if nombre in _precarga["pasos"]:
+            continue
+        inicio_paso = time.perf_counter()
+        try:
+            filas = paso()
+        except Exception as e:
+            print(f"[ERROR] Precarga de {nombre} (intento {_precarga['intentos']}): {e}")
+            _precarga["errores"][nombre] = str(e)
+            continue
+        _precarga["pasos"][nombre] = {
+            "filas": filas,
+            "ms": round((time.perf_counter() - inicio_paso) * 1000, 1),
+        }
+        _precarga["errores"].pop(nombre, None)
+    _precarga["duracion_ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+    if _precarga["errores"]:
+        print(f"[ERROR] Precarga incompleta, pendientes: {', '.join(_precarga['errores'])}; "
+              f"reintento en {PRECARGA_REINTENTO_SEGUNDOS:g} s")
+    else:
+        _precarga["terminada"] = True
+        print(f"[PERFORMANCE] Precarga de caches completada en {_precarga['duracion_ms']} ms: "
+              + ", ".join(f"{n}={p['filas']}" for n, p in _precarga["pasos"].items()))
+    return _precarga
+
+async def tarea_precarga():
+    """
+    Lifespan task: precarga en un hilo (sin bloquear el event loop) y reintenta
+    los pasos fallidos hasta completarlos. La espera entre intentos es un
+    asyncio.sleep, así el apagado del backend la cancela.
+    """
+    if not PRECARGAR_CACHES:
+        return
+    while not (await asyncio.to_thread(precargar_caches))["terminada"]:
+        await asyncio.sleep(PRECARGA_REINTENTO_SEGUNDOS)
+
+def latencia_base() -> Dict[str, Any]:
+    """
+    Mide un SELECT 1 contra la base de las lecturas públicas.
+
+    Returns:
+        Dict: {"ok": bool, "latencia_ms": float, "error": str (solo si falló)}
+    """
+    inicio = time.perf_counter()
+    try:
+        with read_session() as session:
+            session.exec(text("SELECT 1")).one()
+        return {"ok": True, "latencia_ms": round((time.perf_counter() - inicio) * 1000, 2)}
+    except Exception as e:
+        return {"ok": False, "latencia_ms": round((time.perf_counter() - inicio) * 1000, 2), "error": str(e)}
+
+def estado_listo() -> Dict[str, Any]:
+    """
+    Estado de /health/ready: listo si todos los pasos de la precarga salieron
+    bien y la base responde.
+
+    Returns:
+        Dict: {"listo", "precarga", "base"}
+    """
+    base = latencia_base()
+    return {
+        "listo": _precarga["terminada"] and base["ok"],
+        "precarga": {**_precarga, "pasos": dict(_precarga["pasos"]), "errores": dict(_precarga["errores"])},
+        "base": base,
+    }
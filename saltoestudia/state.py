@@ -31,23 +31,34 @@
 # - pages/*.py: Las páginas consumen y modifican este estado
 # ================================================================================
 
+import asyncio
 import reflex as rx
 import bcrypt
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from .database import (
-    obtener_instituciones,
     obtener_instituciones_nombres,
-    obtener_cursos,
+    obtener_cursos_catalogo,
+    obtener_sugerencias,
     obtener_usuario_por_correo,
-    obtener_cursos_por_institucion,
+    obtener_pagina_cursos_institucion,
+    ADMIN_CURSOS_POR_PAGINA,
     agregar_curso,
     modificar_curso,
     eliminar_curso,
+    importar_cursos,
     obtener_nombre_institucion_por_id,
     obtener_ciudades_nombres,
+    obtener_generacion_catalogo,
+    obtener_sedes_fisicas_indexadas,
+    obtener_sedes_fisicas_por_institucion,
+    obtener_ciudades_sedes_institucion,
 )
 from .models import Usuario
+from .filas import CursoRow, SedeRow, Sugerencia, TarjetaInstitucion, empaquetar_filas
+from .catalogo import COLUMNAS_ORDEN_CATALOGO
+from .consultas import COLUMNAS_ORDEN_ADMIN
 from .constants import CursosConstants
+from .importacion import leer_filas
 
 # ================================================================================
 # MODELO DE USUARIO SEGURO PARA ESTADO
@@ -115,14 +126,16 @@ class State(rx.State):
     # ================================================================================
     
     # === DATOS DE CURSOS ===
-    cursos: List[Dict[str, Any]] = []                    # Cursos filtrados mostrados en UI
-    cursos_originales: List[Dict[str, Any]] = []         # Todos los cursos sin filtrar (cache)
-    tabla_cursos_data: List[List[Any]] = []              # Formato tabla para compatibilidad legacy
+    # El catálogo completo sin filtrar NO vive en el estado: se comparte por
+    # proceso con obtener_cursos_catalogo(). Así el estado serializado de cada
+    # sesión (Redis en modo multi-worker) solo contiene los cursos filtrados.
+    cursos: List[CursoRow] = []                          # Cursos filtrados mostrados en UI
     
     # === CACHE Y PERFORMANCE ===
     cursos_cache_loaded: bool = False                    # Flag de cache de cursos cargado
     instituciones_cache_loaded: bool = False             # Flag de cache de instituciones cargado
     ciudades_cache_loaded: bool = False                  # Flag de cache de ciudades cargado
+    catalogo_generacion: int = -1                        # Generación del catálogo con la que se llenaron los caches
     
     # === FILTROS DE BÚSQUEDA ===
     # Estos filtros se aplican en tiempo real en la página /cursos
@@ -132,6 +145,11 @@ class State(rx.State):
     institucion_seleccionada: str = ""                   # Filtro por institución
     lugar_seleccionado: str = ""                         # Filtro por lugar
     busqueda_texto: str = ""  # Filtro de búsqueda manual
+    sugerencias_busqueda: List[Sugerencia] = []          # Autocompletado de la búsqueda (top-k)
+    
+    # === ORDEN DE RESULTADOS ===
+    orden_cursos: str = ""                               # "" (sin orden), nombre, institucion, duracion, nivel
+    orden_cursos_desc: bool = False                      # Orden descendente
     
     # === CONTROL DE LIMPIEZA DE FILTROS ===
     mantener_filtro_institucion: bool = False            # Flag para mantener filtro de institución al cargar página
@@ -139,7 +157,7 @@ class State(rx.State):
     
     # === DATOS DE INSTITUCIONES ===
     instituciones_nombres: List[str] = []                # Lista de nombres para filtro dropdown
-    instituciones_info: List[Dict[str, Any]] = []        # Datos completos para galería
+    instituciones_info: List[TarjetaInstitucion] = []    # Tarjetas de la galería
     
     # === DATOS DE CIUDADES ===
     ciudades_nombres: List[str] = []                     # Lista de nombres de ciudades para filtro dropdown
@@ -147,7 +165,7 @@ class State(rx.State):
     # === UI CONTROL - MODAL DE INSTITUCIONES ===
     is_dialog_open: bool = False                         # Control modal detalle institución
     selected_institution: Dict[str, Any] = {}           # Institución seleccionada en modal
-    selected_institution_sedes: List[Dict[str, Any]] = [] # Sedes de la institución seleccionada
+    selected_institution_sedes: List[SedeRow] = []       # Sedes de la institución seleccionada
     ciudad_filtro_instituciones: str = ""                # Filtro de ciudad para instituciones
     expanded_sede_id: Optional[int] = None               # ID de la sede expandida en el acordeón
     
@@ -177,14 +195,26 @@ class State(rx.State):
     # ================================================================================
     
     # === DATOS ADMIN ===
-    admin_cursos: List[Dict[str, Any]] = []              # Cursos de la institución del admin
-    admin_sedes: List[Dict[str, Any]] = []               # Sedes de la institución del admin
+    admin_cursos: List[CursoRow] = []                    # Página actual de cursos de la institución
+    admin_sedes: List[SedeRow] = []                      # Sedes de la institución del admin
+    
+    # === TABLA DE CURSOS ADMIN (orden y paginación en el servidor) ===
+    admin_orden: str = "nombre"                          # Columna de orden (ver COLUMNAS_ORDEN_ADMIN)
+    admin_orden_desc: bool = False                       # Orden descendente
+    admin_pagina: int = 1                                # Página actual (desde 1)
+    admin_total_cursos: int = 0                          # Total de cursos de la institución
+    admin_total_paginas: int = 1                         # Total de páginas
     
     # === UI CONTROL - FORMULARIO CURSOS ===
     show_curso_dialog: bool = False                      # Control modal formulario curso
     is_editing: bool = False                             # Modo edición vs creación
     curso_a_editar: Dict[str, Any] = {}                  # Datos del curso en edición
     
+    # === UI CONTROL - IMPORTACIÓN MASIVA DE CURSOS ===
+    show_import_dialog: bool = False                     # Control modal de importación CSV/XLSX
+    import_resumen: str = ""                             # Resultado de la última importación
+    import_errores: List[str] = []                       # Errores por fila ("Fila 3 (...): ...")
+    
     # === UI CONTROL - FORMULARIO SEDES ===
     show_sede_dialog: bool = False                       # Control modal formulario sede
     is_editing_sede: bool = False                        # Modo edición vs creación para sedes
@@ -224,11 +254,33 @@ class State(rx.State):
     opciones_duracion_unidad: List[str] = CursosConstants.DURACIONES_UNIDADES # ["meses", "años"]
     opciones_lugar: List[str] = CursosConstants.LUGARES                    # ["Virtual", "Salto", "Montevideo", ...]
 
+    def __getstate__(self):
+        """Estado para Redis: las listas de filas se pickean en una pasada (filas.py)."""
+        return empaquetar_filas(super().__getstate__())
+
+    def _invalidar_cache_si_cambio_catalogo(self):
+        """
+        Descarta los caches de la sesión si otro worker modificó el catálogo.
+        
+        Compara la generación del catálogo (catalog_generation) con la que se
+        usó para llenar los caches. La lectura de la generación está limitada
+        por proceso, así que llamar esto en cada evento es barato.
+        """
+        generacion = obtener_generacion_catalogo()
+        if generacion != self.catalogo_generacion:
+            if self.catalogo_generacion != -1:
+                print(f"[PERFORMANCE] Catálogo modificado (generación {self.catalogo_generacion} → {generacion}), invalidando cache")
+            self.cursos_cache_loaded = False
+            self.instituciones_cache_loaded = False
+            self.ciudades_cache_loaded = False
+            self.catalogo_generacion = generacion
+
     def cargar_cursos(self):
         """Carga todos los cursos desde la base de datos con cache inteligente."""
+        self._invalidar_cache_si_cambio_catalogo()
         if not self.cursos_cache_loaded:
-            print("[PERFORMANCE] Cargando cursos desde DB (primera vez)")
-            self.cursos_originales = obtener_cursos()
+            print("[PERFORMANCE] Cargando cursos desde catálogo compartido (primera vez)")
+            obtener_cursos_catalogo()
             self.cursos_cache_loaded = True
         else:
             print("[PERFORMANCE] Usando cache de cursos (navegación rápida)")
@@ -243,73 +295,45 @@ class State(rx.State):
         print(f"  - requisito_seleccionado: '{self.requisito_seleccionado}'")
         print(f"  - busqueda_texto: '{self.busqueda_texto}'")
         
-        cursos_filtrados = []
-        total_cursos = len(self.cursos_originales)
-        filtrados_por_institucion = 0
-        filtrados_por_lugar = 0
-        
-        for curso in self.cursos_originales:
-            # Aplicar filtro de nivel
-            if self.nivel_seleccionado and curso['nivel'] != self.nivel_seleccionado:
-                continue
-            
-            # Aplicar filtro de requisitos
-            if self.requisito_seleccionado and curso['requisitos_ingreso'] != self.requisito_seleccionado:
-                continue
-            
-            # Aplicar filtro de institución
-            if self.institucion_seleccionada:
-                if curso['institucion'] != self.institucion_seleccionada:
-                    filtrados_por_institucion += 1
-                    continue
-            
-            # Aplicar filtro de lugar
-            if self.lugar_seleccionado:
-                if self.lugar_seleccionado not in curso['lugar']:
-                    filtrados_por_lugar += 1
-                    continue
-            
-            # Filtro de texto manual
-            if self.busqueda_texto:
-                texto = self.busqueda_texto.lower()
-                if texto not in (curso['nombre'] or '').lower() and texto not in (curso['informacion'] or '').lower():
-                    continue
-            
-            cursos_filtrados.append(curso)
+        # Filtrar sobre las columnas del catálogo compartido (códigos enteros)
+        catalogo = obtener_cursos_catalogo()
+        posiciones = catalogo.filtrar(
+            nivel=self.nivel_seleccionado,
+            requisito=self.requisito_seleccionado,
+            institucion=self.institucion_seleccionada,
+            lugar=self.lugar_seleccionado,
+            busqueda=self.busqueda_texto,
+        )
         
         print(f"[DEBUG] aplicar_filtros - Resultados:")
-        print(f"  - Total cursos: {total_cursos}")
-        print(f"  - Filtrados por institución: {filtrados_por_institucion}")
-        print(f"  - Filtrados por lugar: {filtrados_por_lugar}")
-        print(f"  - Cursos finales: {len(cursos_filtrados)}")
+        print(f"  - Total cursos: {len(catalogo)}")
+        print(f"  - Cursos finales: {len(posiciones)}")
         
-        # Debug: mostrar algunos cursos para verificar nombres de instituciones
+        # Debug: mostrar algunos nombres de instituciones para verificar el filtro
         if self.institucion_seleccionada:
             print(f"[DEBUG] aplicar_filtros - Verificando nombres de instituciones:")
-            instituciones_en_cursos = set()
-            for curso in self.cursos_originales[:5]:  # Solo los primeros 5
-                instituciones_en_cursos.add(curso.get('institucion', 'Sin institución'))
-            print(f"  - Instituciones en cursos: {instituciones_en_cursos}")
+            print(f"  - Instituciones en cursos: {set(catalogo.tabla_instituciones.valores[:5])}")
             print(f"  - Buscando: '{self.institucion_seleccionada}'")
         
-        self.cursos = cursos_filtrados
-        
-        # Actualizar también tabla_cursos_data para compatibilidad
-        self.tabla_cursos_data = [
-            [
-                curso['nombre'],
-                curso['nivel'],
-                f"{curso['duracion_numero']} {curso['duracion_unidad']}" if curso.get('duracion_numero') and curso.get('duracion_unidad') else "N/A",
-                curso['requisitos_ingreso'],
-                curso['institucion'],
-                curso['informacion'],
-                curso['lugar']
-            ]
-            for curso in cursos_filtrados
-        ]
+        # Orden con rangos precalculados por generación del catálogo; las
+        # filas CursoRow se arman solo para los cursos filtrados
+        posiciones = catalogo.ordenar(posiciones, self.orden_cursos, self.orden_cursos_desc)
+        self.cursos = catalogo.materializar(posiciones)
+
+    def actualizar_orden_cursos(self, columna: str):
+        """Ordena los resultados por `columna`; si ya estaban ordenados por ella, invierte el orden."""
+        if columna not in COLUMNAS_ORDEN_CATALOGO:
+            columna = ""  # Sin orden: el del catálogo
+        if self.orden_cursos == columna:
+            self.orden_cursos_desc = not self.orden_cursos_desc
+        else:
+            self.orden_cursos = columna
+            self.orden_cursos_desc = False
+        self.aplicar_filtros()
 
     def cargar_instituciones_nombres(self):
         """Carga nombres de instituciones con cache inteligente."""
+        self._invalidar_cache_si_cambio_catalogo()
         if not self.instituciones_cache_loaded:
             print("[PERFORMANCE] Cargando instituciones desde DB (primera vez)")
             self.instituciones_nombres = ["Todos"] + obtener_instituciones_nombres()
@@ -317,15 +341,6 @@ class State(rx.State):
         else:
             print("[PERFORMANCE] Usando cache de instituciones (navegación rápida)")
 
-    def cargar_instituciones(self):
-        """Carga datos completos de instituciones (solo cuando se necesiten)."""
-        self.instituciones_info = obtener_instituciones()
-
-    def cargar_instituciones_con_sedes(self, ciudad: str = None):
-        """Carga instituciones con sus sedes, opcionalmente filtradas por ciudad."""
-        from .database import obtener_instituciones_con_sedes_por_ciudad
-        self.instituciones_info = obtener_instituciones_con_sedes_por_ciudad(ciudad)
-
     def cargar_sedes_como_tarjetas(self, ciudad: str = None):
         """Carga las sedes como tarjetas individuales, opcionalmente filtradas por ciudad."""
         from .database import obtener_sedes_como_tarjetas
@@ -333,6 +348,7 @@ class State(rx.State):
 
     def cargar_ciudades_nombres(self):
         """Carga nombres de ciudades con cache inteligente."""
+        self._invalidar_cache_si_cambio_catalogo()
         if not self.ciudades_cache_loaded:
             print("[PERFORMANCE] Cargando ciudades desde DB (primera vez)")
             self.ciudades_nombres = ["Todas"] + obtener_ciudades_nombres()
@@ -354,6 +370,7 @@ class State(rx.State):
         self.nivel_seleccionado = ""
         self.requisito_seleccionado = ""
         self.busqueda_texto = ""
+        self.sugerencias_busqueda = []
         
         # Solo limpiar institución si no se debe mantener
         if not self.mantener_filtro_institucion:
@@ -376,6 +393,8 @@ class State(rx.State):
         
         # === PROGRESSIVE LOADING PARA COLD START ===
         # En primera carga: mostrar página inmediatamente, cargar datos en background
+        # (un cambio del catálogo hecho por otro worker cuenta como primera carga)
+        self._invalidar_cache_si_cambio_catalogo()
         if not self.cursos_cache_loaded:
             print("[PERFORMANCE] COLD START - Implementando progressive loading")
             
@@ -387,7 +406,6 @@ class State(rx.State):
             
             # 3. Inicializar con estado vacío para mostrar skeleton
             self.cursos = []
-            self.cursos_originales = []
             
             # 4. Cargar cursos en background (query pesada optimizada)
             self.cargar_cursos()
@@ -400,7 +418,7 @@ class State(rx.State):
             self.cargar_instituciones_nombres()
             self.cargar_ciudades_nombres()
         
-        print(f"[PERFORMANCE] Datos cargados - Cursos: {len(self.cursos_originales)}, Filtrados: {len(self.cursos)}")
+        print(f"[PERFORMANCE] Datos cargados - Cursos: {len(obtener_cursos_catalogo())}, Filtrados: {len(self.cursos)}")
 
     def cargar_datos_instituciones_page(self):
         """Carga los datos iniciales de la página de instituciones."""
@@ -420,9 +438,13 @@ class State(rx.State):
         self.cargar_sedes_como_tarjetas()
         print(f"[DEBUG] Sedes cargadas: {len(self.instituciones_info)}")
         
+        # Precargar las sedes físicas de todas las instituciones (1 query,
+        # cache compartido): los diálogos de las tarjetas abren sin ir a la base
+        obtener_sedes_fisicas_indexadas()
+        
         # Debug: mostrar las primeras 3 sedes
         for i, sede in enumerate(self.instituciones_info[:3]):
-            print(f"[DEBUG] Sede {i+1}: {sede.get('nombre', 'Sin nombre')} - {sede.get('ciudad', 'Sin ciudad')}")
+            print(f"[DEBUG] Sede {i+1}: {sede.nombre} - {sede.ciudad}")
         
         print(f"[DEBUG] Datos de instituciones cargados - Tarjetas de sedes: {len(self.instituciones_info)}")
 
@@ -448,6 +470,23 @@ class State(rx.State):
 
     def actualizar_busqueda_texto(self, texto: str):
         self.busqueda_texto = texto
+        # Sugerencias en memoria (índice de prefijos del catálogo), sin ir a la base
+        self.sugerencias_busqueda = obtener_sugerencias(texto) if texto.strip() else []
+        self.aplicar_filtros()
+
+    def elegir_sugerencia(self, texto: str, tipo: str):
+        """
+        Aplica una sugerencia del autocompletado.
+        
+        Un curso queda como texto de búsqueda; una institución pasa al filtro
+        de institución (y se limpia el texto escrito).
+        """
+        if tipo == "institucion":
+            self.institucion_seleccionada = texto
+            self.busqueda_texto = ""
+        else:
+            self.busqueda_texto = texto
+        self.sugerencias_busqueda = []
         self.aplicar_filtros()
 
     def limpiar_filtros(self):
@@ -458,6 +497,7 @@ class State(rx.State):
         self.institucion_seleccionada = ""
         self.lugar_seleccionado = ""
         self.busqueda_texto = "" # Limpiar texto de búsqueda
+        self.sugerencias_busqueda = []
         self.aplicar_filtros()
         
     def forzar_recarga_cache(self):
@@ -475,20 +515,19 @@ class State(rx.State):
         # Verificar si es una institución virtual (tiene ciudad "Virtual")
         if institution.get("ciudad") == "Virtual":
             # Crear una sede virtual especial
-            sede_virtual = {
-                "id": None,
-                "nombre": "Cursos Virtuales",
-                "direccion": "Modalidad online",
-                "telefono": "N/A",
-                "email": "N/A",
-                "web": "N/A",
-                "ciudad": "Virtual",
-                "institucion_nombre": institution.get("institucion_nombre", institution.get("nombre", ""))
-            }
+            sede_virtual = SedeRow(
+                id=None,
+                nombre="Cursos Virtuales",
+                direccion="Modalidad online",
+                telefono="N/A",
+                email="N/A",
+                web="N/A",
+                ciudad="Virtual",
+                institucion_nombre=institution.get("institucion_nombre", institution.get("nombre", "")),
+            )
             self.selected_institution_sedes = [sede_virtual]
         else:
-            # Cargar las sedes físicas de la institución
-            from .database import obtener_sedes_fisicas_por_institucion
+            # Sedes físicas desde el índice precargado en cargar_datos_instituciones_page
             self.selected_institution_sedes = obtener_sedes_fisicas_por_institucion(institution.get("institucion_id", institution.get("id")))
 
     def set_dialog_open(self, is_open: bool):
@@ -598,7 +637,7 @@ class State(rx.State):
                 id=usuario_db.id,
                 correo=usuario_db.correo,
                 institucion_id=usuario_db.institucion_id,
-                institucion_nombre=usuario_db.institucion.nombre  # Acceso directo gracias a selectinload
+                institucion_nombre=usuario_db.institucion.nombre  # Acceso directo gracias a joinedload
             )
             self.user_authenticated = True
             self.show_login_dialog = False
@@ -645,9 +684,17 @@ class State(rx.State):
         # Limpiar datos del admin
         self.admin_cursos = []
         self.admin_sedes = []
+        self.admin_orden = "nombre"
+        self.admin_orden_desc = False
+        self.admin_pagina = 1
+        self.admin_total_cursos = 0
+        self.admin_total_paginas = 1
         self.show_curso_dialog = False
         self.is_editing = False
         self.curso_a_editar = {}
+        self.show_import_dialog = False
+        self.import_resumen = ""
+        self.import_errores = []
         self.show_sede_dialog = False
         self.is_editing_sede = False
         self.sede_a_editar = {}
@@ -747,19 +794,100 @@ class State(rx.State):
         self.curso_a_editar[field] = value
 
     def cargar_cursos_admin(self):
-        """Carga los cursos para el administrador logueado."""
+        """Carga la página actual de cursos para el administrador logueado."""
         print(f"[DEBUG] cargar_cursos_admin llamado")
         print(f"[DEBUG] logged_in_user: {self.logged_in_user}")
         if self.logged_in_user:
             print(f"[DEBUG] Institución ID: {self.logged_in_user.institucion_id}")
-            self.admin_cursos = obtener_cursos_por_institucion(self.logged_in_user.institucion_id)
-            print(f"[DEBUG] Cursos cargados: {len(self.admin_cursos)}")
-            for curso in self.admin_cursos:
-                print(f"[DEBUG] Curso: {curso['nombre']}")
+            resultado = obtener_pagina_cursos_institucion(
+                self.logged_in_user.institucion_id,
+                orden=self.admin_orden,
+                descendente=self.admin_orden_desc,
+                pagina=self.admin_pagina,
+            )
+            self.admin_total_cursos = resultado["total"]
+            self.admin_total_paginas = max(1, -(-resultado["total"] // ADMIN_CURSOS_POR_PAGINA))
+            if self.admin_pagina > self.admin_total_paginas:
+                # La página quedó fuera de rango (p. ej. tras eliminar cursos)
+                self.admin_pagina = self.admin_total_paginas
+                return self.cargar_cursos_admin()
+            self.admin_cursos = resultado["cursos"]
+            print(f"[DEBUG] Cursos cargados: página {self.admin_pagina}/{self.admin_total_paginas}, "
+                  f"{len(self.admin_cursos)} de {self.admin_total_cursos}")
         else:
             print(f"[DEBUG] No hay usuario logueado")
             self.admin_cursos = []
 
+    def ordenar_cursos_admin(self, columna: str):
+        """Ordena la tabla por `columna`; si ya estaba ordenada por ella, invierte el orden."""
+        if columna not in COLUMNAS_ORDEN_ADMIN:
+            # La base ordenaría por "nombre" y el indicador quedaría en otra columna
+            print(f"[ERROR] Columna de orden desconocida en el admin: {columna!r}")
+            return
+        if self.admin_orden == columna:
+            self.admin_orden_desc = not self.admin_orden_desc
+        else:
+            self.admin_orden = columna
+            self.admin_orden_desc = False
+        self.admin_pagina = 1
+        self.cargar_cursos_admin()
+
+    def pagina_anterior_admin(self):
+        """Muestra la página anterior de cursos."""
+        if self.admin_pagina > 1:
+            self.admin_pagina -= 1
+            self.cargar_cursos_admin()
+
+    def pagina_siguiente_admin(self):
+        """Muestra la página siguiente de cursos."""
+        if self.admin_pagina < self.admin_total_paginas:
+            self.admin_pagina += 1
+            self.cargar_cursos_admin()
+
+    def _parchear_fila_admin(self, lista: str, fila: Optional[Union[CursoRow, SedeRow]] = None, eliminar_id: int = -1):
+        """
+        Actualiza una sola fila de admin_cursos o admin_sedes después de una escritura.
+        
+        Reemplaza la fila con el mismo id (manteniendo su posición), la agrega
+        al final si es nueva, o la quita si se pasa `eliminar_id`. Evita volver
+        a consultar la lista completa de la institución.
+        """
+        filas = list(getattr(self, lista))
+        objetivo = fila.id if fila else eliminar_id
+        indice = next((i for i, f in enumerate(filas) if f.id == objetivo), None)
+        if fila is None:
+            if indice is not None:
+                del filas[indice]
+        elif indice is None:
+            filas.append(fila)
+        else:
+            filas[indice] = fila
+        setattr(self, lista, filas)
+
+    def _parchear_curso_admin(self, fila: Optional[CursoRow] = None, eliminar_id: int = -1):
+        """
+        Aplica una escritura de curso sobre la página actual de admin_cursos.
+        
+        Ediciones y bajas se aplican en la página visible. Un curso nuevo se
+        agrega si entra en la página; si no, solo cambia el total y aparecerá
+        al navegar a su página. Si una baja deja la página vacía, se recarga
+        la página anterior.
+        """
+        nuevo = fila is not None and all(c.id != fila.id for c in self.admin_cursos)
+        if nuevo:
+            self.admin_total_cursos += 1
+            if len(self.admin_cursos) < ADMIN_CURSOS_POR_PAGINA:
+                self._parchear_fila_admin("admin_cursos", fila)
+        elif fila is None:
+            self.admin_total_cursos = max(0, self.admin_total_cursos - 1)
+            self._parchear_fila_admin("admin_cursos", eliminar_id=eliminar_id)
+        else:
+            self._parchear_fila_admin("admin_cursos", fila)
+        self.admin_total_paginas = max(1, -(-self.admin_total_cursos // ADMIN_CURSOS_POR_PAGINA))
+        if not self.admin_cursos and self.admin_total_cursos:
+            self.admin_pagina = min(self.admin_pagina, self.admin_total_paginas)
+            self.cargar_cursos_admin()
+
     def _reset_form_fields(self):
         """Limpia los campos del formulario."""
         self.form_nombre = ""
@@ -774,17 +902,22 @@ class State(rx.State):
         self.curso_a_editar = {}
         self.is_editing = False
 
+    def _ciudades_de_sedes_admin(self) -> List[str]:
+        """
+        Ciudades de las sedes de la institución del admin, incluida "Virtual".
+        
+        Se leen de la primaria y sin cache: una sede recién creada ya aparece
+        como opción del formulario de cursos.
+        """
+        if not self.logged_in_user:
+            return []
+        return obtener_ciudades_sedes_institucion(self.logged_in_user.institucion_id)
+
     def abrir_dialogo_agregar(self):
         self._reset_form_fields()
         self.form_ciudades = []
         # Cargar ciudades válidas para la institución
-        self.form_ciudades_opciones = []
-        if self.logged_in_user:
-            # Buscar la institución y sus sedes
-            for inst in self.instituciones_info:
-                if inst["id"] == self.logged_in_user.institucion_id:
-                    self.form_ciudades_opciones = [sede["ciudad"] for sede in inst.get("sedes", [])]
-                    break
+        self.form_ciudades_opciones = self._ciudades_de_sedes_admin()
         self.show_curso_dialog = True
 
     def abrir_dialogo_editar(self, curso: dict):
@@ -802,12 +935,7 @@ class State(rx.State):
         lugar_str = curso.get("lugar", "")
         self.form_ciudades = [c.strip() for c in lugar_str.split(",") if c.strip()] if lugar_str else []
         # Cargar ciudades válidas para la institución
-        self.form_ciudades_opciones = []
-        if self.logged_in_user:
-            for inst in self.instituciones_info:
-                if inst["id"] == self.logged_in_user.institucion_id:
-                    self.form_ciudades_opciones = [sede["ciudad"] for sede in inst.get("sedes", [])]
-                    break
+        self.form_ciudades_opciones = self._ciudades_de_sedes_admin()
         self.show_curso_dialog = True
 
     def cerrar_dialogo(self):
@@ -840,17 +968,17 @@ class State(rx.State):
                 # Modificar curso existente
                 curso_id = self.curso_a_editar.get("id")
                 if curso_id:
-                    modificar_curso(curso_id, curso_data)
+                    fila = modificar_curso(curso_id, curso_data)
                     print(f"Curso modificado con ID: {curso_id}")
                 else:
                     return rx.window_alert("Error: No se encontró el ID del curso a editar.")
             else:
                 # Agregar nuevo curso
-                agregar_curso(curso_data)
+                fila = agregar_curso(curso_data)
                 print("Nuevo curso agregado.")
             
-            # Recargar la lista de cursos y cerrar el diálogo
-            self.cargar_cursos_admin()
+            # Actualizar solo esa fila de la lista y cerrar el diálogo
+            self._parchear_curso_admin(fila)
             self.cerrar_dialogo()
 
         except Exception as e:
@@ -862,13 +990,69 @@ class State(rx.State):
         Por ahora la dejamos pero la lógica principal estará en guardar_curso."""
         print("Manejando submit de curso:", form_data)
         if self.is_editing:
-            modificar_curso(self.curso_a_editar["id"], form_data)
+            fila = modificar_curso(self.curso_a_editar["id"], form_data)
         else:
-            agregar_curso(form_data)
+            fila = agregar_curso(form_data)
         
-        self.cargar_cursos_admin()
+        self._parchear_curso_admin(fila)
         self.show_curso_dialog = False
 
+    # ================================================================================
+    # IMPORTACIÓN MASIVA DE CURSOS (CSV / XLSX)
+    # ================================================================================
+
+    def abrir_dialogo_importar(self):
+        """Abre el diálogo de importación limpiando el resultado anterior."""
+        self.import_resumen = ""
+        self.import_errores = []
+        self.show_import_dialog = True
+
+    def cerrar_dialogo_importar(self):
+        """Cierra el diálogo de importación."""
+        self.show_import_dialog = False
+        self.import_resumen = ""
+        self.import_errores = []
+
+    async def handle_import_cursos(self, files: List[rx.UploadFile]):
+        """Importa los cursos del archivo subido para la institución del admin."""
+        if not self.logged_in_user:
+            return rx.window_alert("Error: No hay usuario autenticado.")
+        if not files:
+            return rx.window_alert("Seleccione un archivo CSV o XLSX.")
+
+        archivo = files[0]
+        nombre_archivo = archivo.name or ""
+        institucion_id = self.logged_in_user.institucion_id
+
+        def importar():
+            # Las filas se leen y validan de a una; se insertan por lotes
+            return importar_cursos(leer_filas(archivo.file, nombre_archivo), institucion_id)
+
+        try:
+            # Lectura e inserción en un thread: no bloquean el event loop del worker
+            reporte = await asyncio.to_thread(importar)
+        except ValueError as e:
+            # Formato, codificación o encabezados: no se insertó ningún curso
+            self.import_resumen = f"No se pudo leer el archivo: {e}"
+            self.import_errores = []
+            return
+        except Exception as e:
+            print(f"Error al importar cursos: {e}")
+            return rx.window_alert(f"No se pudo importar el archivo: {e}")
+
+        self.import_resumen = (
+            f"{reporte['insertados']} de {reporte['total']} cursos importados"
+            f" desde {nombre_archivo}."
+        )
+        if reporte["interrumpido"]:
+            self.import_resumen += f" {reporte['interrumpido']}"
+        self.import_errores = [
+            f"Fila {error['fila']} ({error['nombre'] or 'sin nombre'}): {'; '.join(error['errores'])}"
+            for error in reporte["errores"]
+        ]
+        if reporte["insertados"]:
+            self.cargar_cursos_admin()
+
     def abrir_alerta_eliminar(self, curso_id: int):
         self.curso_a_eliminar_id = curso_id
         self.show_delete_alert = True
@@ -884,12 +1068,12 @@ class State(rx.State):
     def confirmar_eliminacion(self):
         if self.curso_a_eliminar_id != -1:
             eliminar_curso(self.curso_a_eliminar_id)
-            self.cargar_cursos_admin()
+            self._parchear_curso_admin(eliminar_id=self.curso_a_eliminar_id)
             self.cerrar_alerta_eliminar()
         elif self.sede_a_eliminar_id != -1:
             from .database import eliminar_sede
             eliminar_sede(self.sede_a_eliminar_id)
-            self.cargar_sedes_admin()
+            self._parchear_fila_admin("admin_sedes", eliminar_id=self.sede_a_eliminar_id)
             self.cerrar_alerta_eliminar_sede()
 
     # Funciones para manejar eventos de AG Grid
@@ -925,11 +1109,11 @@ class State(rx.State):
         print(f"[DEBUG] logged_in_user: {self.logged_in_user}")
         if self.logged_in_user:
             print(f"[DEBUG] Institución ID: {self.logged_in_user.institucion_id}")
-            from .database import obtener_sedes_fisicas_por_institucion
-            self.admin_sedes = obtener_sedes_fisicas_por_institucion(self.logged_in_user.institucion_id)
+            # Leer desde la primaria para ver los cambios recién guardados
+            self.admin_sedes = obtener_sedes_fisicas_por_institucion(self.logged_in_user.institucion_id, usar_primaria=True)
             print(f"[DEBUG] Sedes cargadas: {len(self.admin_sedes)}")
             for sede in self.admin_sedes:
-                print(f"[DEBUG] Sede: {sede['nombre']}")
+                print(f"[DEBUG] Sede: {sede.nombre}")
         else:
             print(f"[DEBUG] No hay usuario logueado")
             self.admin_sedes = []
@@ -988,18 +1172,23 @@ class State(rx.State):
                 sede_id = self.sede_a_editar.get("id")
                 if sede_id:
                     from .database import modificar_sede
-                    modificar_sede(sede_id, sede_data)
+                    fila = modificar_sede(sede_id, sede_data)
                     print(f"Sede modificada con ID: {sede_id}")
                 else:
                     return rx.window_alert("Error: No se encontró el ID de la sede a editar.")
             else:
                 # Agregar nueva sede
                 from .database import agregar_sede
-                agregar_sede(sede_data)
+                fila = agregar_sede(sede_data)
                 print("Nueva sede agregada.")
             
-            # Recargar la lista de sedes y cerrar el diálogo
-            self.cargar_sedes_admin()
+            # Actualizar solo esa fila de la lista y cerrar el diálogo.
+            # La lista muestra solo sedes físicas, ordenadas por ciudad.
+            if fila.ciudad == "Virtual":
+                self._parchear_fila_admin("admin_sedes", eliminar_id=fila.id)
+            else:
+                self._parchear_fila_admin("admin_sedes", fila)
+                self.admin_sedes = sorted(self.admin_sedes, key=lambda sede: sede.ciudad)
             self.cerrar_dialogo_sede()
 
         except Exception as e:
@@ -1021,7 +1210,7 @@ class State(rx.State):
         if self.sede_a_eliminar_id != -1:
             from .database import eliminar_sede
             eliminar_sede(self.sede_a_eliminar_id)
-            self.cargar_sedes_admin()
+            self._parchear_fila_admin("admin_sedes", eliminar_id=self.sede_a_eliminar_id)
             self.cerrar_alerta_eliminar_sede()
 
     # Setters para los campos del formulario de sede
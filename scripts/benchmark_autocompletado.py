@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark del autocompletado de la búsqueda (IndicePrefijos en catalogo.py)
+
+Con un catálogo sintético de N cursos mide:
+
+1. CONSTRUCCIÓN: tiempo de armar el índice de prefijos del catálogo (se paga
+   una vez por generación).
+2. CONSULTA: µs por sugerencia (p50, p99 y máximo; mejor de --repeticiones
+   por consulta) para prefijos de una y dos palabras de distinto largo, como
+   los que se van escribiendo en /cursos.
+3. CORRECCIÓN: los resultados de las primeras --verificar consultas se
+   comparan contra recorrer todos los nombres (fuerza bruta) con la misma
+   regla de coincidencia y el mismo orden.
+
+Termina con error si el p99 no queda por debajo de 1 ms.
+
+No usa la base de datos.
+
+Uso:
+    python scripts/benchmark_autocompletado.py
+    python scripts/benchmark_autocompletado.py --cursos 20000 --sugerencias 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mismos cursos sintéticos que el benchmark del catálogo
+from benchmark_catalog import cursos_sinteticos
+
+def consultas_sinteticas(indice, cantidad, semilla=2):
+    """Prefijos de 1 a 6 letras de una o dos palabras de nombres del índice."""
+    from saltoestudia.catalogo import tokens_busqueda
+
+    azar = random.Random(semilla)
+    consultas = []
+    for _ in range(cantidad):
+        palabras = tokens_busqueda(azar.choice(indice.textos))
+        elegidas = azar.sample(palabras, min(len(palabras), azar.randint(1, 2)))
+        consultas.append(" ".join(p[:azar.randint(1, 6)] for p in elegidas))
+    return consultas
+
+def fuerza_bruta(indice, texto, k):
+    """Las k sugerencias recorriendo todos los nombres (referencia de corrección)."""
+    from saltoestudia.catalogo import tokens_busqueda
+
+    palabras = tuple(tokens_busqueda(texto))
+    if not palabras:
+        return []
+    tokens_nombre = [tuple(tokens_busqueda(t)) for t in indice.textos]
+    exactos = [n for n, tokens in enumerate(tokens_nombre) if tokens == palabras]
+    coinciden = [
+        n for n, tokens in enumerate(tokens_nombre)
+        if n not in exactos and all(any(t.startswith(p) for t in tokens) for p in palabras)
+    ]
+    return (exactos + coinciden)[:k]
+
+def percentil(valores, p):
+    """Percentil p (0-100) de una lista ya ordenada."""
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+def main():
+    from saltoestudia.catalogo import CatalogoCursos
+    from saltoestudia.filas import CursoRow
+
+    parser = argparse.ArgumentParser(description="Benchmark del autocompletado de la búsqueda")
+    parser.add_argument("--cursos", type=int, default=5000)
+    parser.add_argument("--consultas", type=int, default=2000)
+    parser.add_argument("--sugerencias", type=int, default=8)
+    parser.add_argument("--verificar", type=int, default=200)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    catalogo = CatalogoCursos()
+    for c in cursos_sinteticos(args.cursos):
+        catalogo.agregar_fila(CursoRow(**c))
+    catalogo.cerrar()
+
+    inicio = time.perf_counter()
+    indice = catalogo.indice_prefijos()
+    ms_construir = (time.perf_counter() - inicio) * 1000
+
+    consultas = consultas_sinteticas(indice, args.consultas)
+    for texto in consultas[:args.verificar]:
+        esperado = fuerza_bruta(indice, texto, args.sugerencias)
+        obtenido = indice.sugerir(texto, args.sugerencias)
+        assert esperado == obtenido, f"'{texto}': el índice no sugiere lo mismo que la fuerza bruta"
+
+    # Mejor de --repeticiones por consulta (como timeit): descarta las pausas
+    # del sistema operativo, que en una máquina compartida duran milisegundos
+    tiempos = []
+    for texto in consultas:
+        mejor = float("inf")
+        for _ in range(args.repeticiones):
+            inicio = time.perf_counter()
+            catalogo.sugerencias(texto, args.sugerencias)
+            mejor = min(mejor, time.perf_counter() - inicio)
+        tiempos.append(mejor * 1e6)
+    tiempos.sort()
+
+    print(f"📊 Autocompletado sobre {args.cursos} cursos ({len(indice)} nombres, "
+          f"{len(indice.tokens)} palabras distintas)")
+    print("=" * 60)
+    print(f"Construcción del índice: {ms_construir:8.1f} ms (una vez por generación)")
+    print(f"\n⚡ {len(consultas)} consultas, top-{args.sugerencias} "
+          f"({min(args.verificar, len(consultas))} verificadas contra fuerza bruta):")
+    print(f"p50:    {percentil(tiempos, 50):8.1f} µs")
+    print(f"p99:    {percentil(tiempos, 99):8.1f} µs")
+    print(f"máximo: {tiempos[-1]:8.1f} µs")
+    return percentil(tiempos, 99) < 1000
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark del catálogo de cursos en memoria
+
+Compara, con un catálogo sintético de N cursos, la lista de diccionarios que
+devuelve obtener_cursos() contra el catálogo columnar (saltoestudia/catalogo.py):
+
+1. MEMORIA: bytes retenidos (tracemalloc) por cada representación, y la
+   reducción alcanzada contra el objetivo de OBJETIVO_REDUCCION veces.
+2. FILTRADO: tiempo de los filtros de /cursos (nivel + lugar + búsqueda) y de
+   materializar las filas resultantes.
+
+No usa la base de datos.
+
+Uso:
+    python scripts/benchmark_catalog.py
+    python scripts/benchmark_catalog.py --cursos 50000 --repeticiones 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+INSTITUCIONES = [f"Institución {i}" for i in range(40)]
+CIUDADES = ["Salto", "Paysandú", "Artigas", "Rivera", "Tacuarembó", "Virtual"]
+# Reducción de memoria pedida para el catálogo columnar respecto de los diccionarios
+OBJETIVO_REDUCCION = 10
+
+PALABRAS = ["Técnico", "Licenciatura", "Taller", "Curso", "Informática", "Mecánica",
+            "Enfermería", "Gastronomía", "Electricidad", "Administración", "Diseño"]
+
+def cursos_sinteticos(cantidad, semilla=1):
+    """Genera cursos con el formato de obtener_cursos()."""
+    from saltoestudia.constants import CursosConstants
+
+    azar = random.Random(semilla)
+    cursos = []
+    for curso_id in range(1, cantidad + 1):
+        ciudades = sorted(azar.sample(CIUDADES, azar.randint(1, 2)), key=CIUDADES.index)
+        cursos.append({
+            "id": curso_id,
+            "nombre": f"{' '.join(azar.sample(PALABRAS, 3))} {curso_id}",
+            "nivel": azar.choice(CursosConstants.NIVELES),
+            "requisitos_ingreso": azar.choice(CursosConstants.REQUISITOS_INGRESO),
+            "duracion_numero": str(azar.randint(1, 6)),
+            "duracion_unidad": azar.choice(["meses", "años"]),
+            "informacion": f"Información del curso {curso_id}",
+            "lugar": ", ".join(ciudades),
+            "institucion": azar.choice(INSTITUCIONES),
+        })
+    return cursos
+
+def memoria_retenida(construir):
+    """Bytes que quedan asignados después de construir() (el resultado se mantiene vivo)."""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = construir()
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultado, despues - antes
+
+def filtrar_diccionarios(cursos, nivel, lugar, busqueda):
+    """Filtro de /cursos sobre la lista de diccionarios (misma regla: sin tildes ni mayúsculas)."""
+    from saltoestudia.catalogo import normalizar_busqueda
+
+    busqueda = normalizar_busqueda(busqueda)
+    return [
+        c for c in cursos
+        if c["nivel"] == nivel
+        and lugar in c["lugar"]
+        and (busqueda in normalizar_busqueda(c["nombre"]) or busqueda in normalizar_busqueda(c["informacion"]))
+    ]
+
+def cronometrar(funcion, repeticiones):
+    """Tiempo medio en ms de funcion()."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) * 1000 / repeticiones
+
+def main():
+    from saltoestudia.catalogo import CatalogoCursos
+    from saltoestudia.filas import CursoRow
+
+    parser = argparse.ArgumentParser(description="Benchmark del catálogo de cursos en memoria")
+    parser.add_argument("--cursos", type=int, default=20000)
+    parser.add_argument("--repeticiones", type=int, default=10)
+    args = parser.parse_args()
+
+    # El texto de origen se genera por separado: la base guarda los str una sola
+    # vez, lo que importa es cuánto agrega cada representación encima
+    origen = cursos_sinteticos(args.cursos)
+
+    diccionarios, bytes_diccionarios = memoria_retenida(
+        lambda: [dict(c, lugar=", ".join(c["lugar"].split(", "))) for c in origen]
+    )
+
+    def construir_columnar():
+        catalogo = CatalogoCursos()
+        for c in origen:
+            catalogo.agregar_fila(CursoRow(**c))
+        return catalogo.cerrar()
+
+    catalogo, bytes_columnar = memoria_retenida(construir_columnar)
+
+    print(f"📊 Catálogo sintético de {args.cursos} cursos")
+    print("=" * 50)
+    print(f"Lista de diccionarios: {bytes_diccionarios / 1024 / 1024:8.2f} MB")
+    print(f"Catálogo columnar:     {bytes_columnar / 1024 / 1024:8.2f} MB "
+          f"({1 - bytes_columnar / bytes_diccionarios:.0%} menos)")
+    bytes_texto = len(catalogo.texto_busqueda) + catalogo.inicios_texto.itemsize * len(catalogo.inicios_texto)
+    print(f"  de los cuales texto de búsqueda normalizado: {bytes_texto / 1024 / 1024:.2f} MB")
+    # El objetivo era un orden de magnitud: informar lo alcanzado, no solo el %
+    reduccion = bytes_diccionarios / bytes_columnar
+    print(f"Reducción alcanzada: {reduccion:.1f}x "
+          f"({'cumple' if reduccion >= OBJETIVO_REDUCCION else 'NO cumple'} el objetivo de {OBJETIVO_REDUCCION}x)")
+
+    nivel, lugar, busqueda = "Terciario", "Salto", "tecnico"
+    esperado = [c["id"] for c in filtrar_diccionarios(diccionarios, nivel, lugar, busqueda)]
+    obtenido = [catalogo.ids[p] for p in catalogo.filtrar(nivel=nivel, lugar=lugar, busqueda=busqueda)]
+    assert esperado == obtenido, "El catálogo columnar no filtra igual que la lista de diccionarios"
+
+    ms_diccionarios = cronometrar(lambda: filtrar_diccionarios(diccionarios, nivel, lugar, busqueda), args.repeticiones)
+    ms_columnar = cronometrar(lambda: catalogo.filtrar(nivel=nivel, lugar=lugar, busqueda=busqueda), args.repeticiones)
+    ms_materializar = cronometrar(lambda: catalogo.materializar(catalogo.filtrar(nivel=nivel, lugar=lugar, busqueda=busqueda)), args.repeticiones)
+    print(f"\n⚡ Filtro nivel + lugar + búsqueda ({len(esperado)} resultados):")
+    print(f"Lista de diccionarios: {ms_diccionarios:8.2f} ms")
+    print(f"Catálogo columnar:     {ms_columnar:8.2f} ms")
+    print(f"  + materializar:      {ms_materializar:8.2f} ms")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark de las filas tipadas (saltoestudia/filas.py)
+
+Compara, para N cursos sintéticos, las tres formas de representar una fila
+del estado:
+
+- dict: Dict[str, Any] con nueve claves (formato anterior)
+- rx.Base: modelo pydantic de Reflex con los mismos campos (referencia)
+- CursoRow: dataclass con __slots__ (formato actual)
+
+Y mide por cada una:
+
+1. MEMORIA: bytes retenidos por fila (tracemalloc), con los valores
+   compartidos entre representaciones (solo cuenta el contenedor).
+2. CONSTRUCCIÓN: tiempo de armar las N filas desde tuplas (filas de query).
+3. PICKLE: bytes y tiempo de ida y vuelta, como el estado que el modo
+   multi-worker guarda en Redis en cada evento (las listas de filas pasan por
+   empaquetar_filas, como en State.__getstate__).
+4. JSON: bytes y tiempo de format.json_dumps, como el delta que Reflex envía
+   al navegador (CursoRow pasa por serializar_fila de filas.py).
+
+Los tiempos son el mejor de --repeticiones llamadas (como timeit), para
+descartar las pausas de una máquina compartida.
+
+No usa la base de datos.
+
+Uso:
+    python scripts/benchmark_filas.py
+    python scripts/benchmark_filas.py --cursos 5000 --repeticiones 20
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+from typing import Optional
+
+import reflex as rx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mismos cursos sintéticos que el benchmark del catálogo
+from benchmark_catalog import cursos_sinteticos
+
+class CursoBase(rx.Base):
+    """Los campos de CursoRow como modelo rx.Base (solo para comparar)."""
+    id: int
+    nombre: str
+    nivel: str
+    requisitos_ingreso: str
+    duracion_numero: str
+    duracion_unidad: str
+    informacion: Optional[str]
+    lugar: str
+    institucion: str
+
+def representaciones():
+    """Nombre → función que arma una fila desde la tupla de valores."""
+    from saltoestudia.filas import CursoRow
+
+    claves = CursoRow.__slots__
+    return {
+        "dict": lambda valores: dict(zip(claves, valores)),
+        "rx.Base": lambda valores: CursoBase(**dict(zip(claves, valores))),
+        "CursoRow": lambda valores: CursoRow(*valores),
+    }
+
+def cronometrar(funcion, repeticiones):
+    """Mejor tiempo de funcion() en ms entre `repeticiones` llamadas (con calentamiento)."""
+    funcion()
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000
+
+def bytes_retenidos(construir):
+    """Bytes que quedan asignados después de construir() (el resultado se mantiene vivo)."""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = construir()
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del resultado
+    return despues - antes
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de las filas tipadas")
+    parser.add_argument("--cursos", type=int, default=1000)
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    from reflex.utils import format
+
+    from saltoestudia.filas import CursoRow, empaquetar_filas
+
+    tuplas = [tuple(c[campo] for campo in CursoRow.__slots__) for c in cursos_sinteticos(args.cursos)]
+    print(f"📊 Filas de curso: dict vs rx.Base vs CursoRow ({args.cursos} cursos, "
+          f"{args.repeticiones} repeticiones)")
+    print("=" * 86)
+    print(f"{'representación':<15} {'B/fila':>8} {'construir':>11} {'pickle':>10} {'ida+vuelta':>12} "
+          f"{'JSON':>10} {'json_dumps':>12}")
+
+    resultados = {}
+    for nombre, armar in representaciones().items():
+        construir = lambda: [armar(valores) for valores in tuplas]
+        filas = construir()
+        memoria = bytes_retenidos(construir) / args.cursos
+        ms_construir = cronometrar(construir, args.repeticiones)
+        # Como una var del estado: {"cursos": filas} (State.__getstate__)
+        estado = lambda: empaquetar_filas({"cursos": filas})
+        blob = pickle.dumps(estado())
+        ms_pickle = cronometrar(lambda: pickle.loads(pickle.dumps(estado())), args.repeticiones)
+        json = format.json_dumps(filas)
+        ms_json = cronometrar(lambda: format.json_dumps(filas), args.repeticiones)
+        resultados[nombre] = (memoria, len(blob), json, ms_pickle, ms_json)
+        print(f"{nombre:<15} {memoria:>8.0f} {ms_construir:>8.2f} ms {len(blob) / 1024:>7.1f} KB "
+              f"{ms_pickle:>9.2f} ms {len(json) / 1024:>7.1f} KB {ms_json:>9.2f} ms")
+
+    # El navegador recibe exactamente lo mismo que con diccionarios, y Redis
+    # devuelve las mismas filas
+    assert resultados["CursoRow"][2] == resultados["dict"][2], "CursoRow no serializa igual que dict"
+    filas = [CursoRow(*valores) for valores in tuplas]
+    assert pickle.loads(pickle.dumps(empaquetar_filas({"cursos": filas})))["cursos"] == filas
+    memoria_dict, pickle_dict, _, ms_pickle_dict, ms_json_dict = resultados["dict"]
+    memoria_fila, pickle_fila, _, ms_pickle_fila, ms_json_fila = resultados["CursoRow"]
+    print("-" * 86)
+    print(f"CursoRow vs dict: {1 - memoria_fila / memoria_dict:.0%} menos memoria por fila, "
+          f"{1 - pickle_fila / pickle_dict:.0%} menos bytes de estado serializado")
+    print(f"Tiempo CursoRow / dict: pickle ida+vuelta {ms_pickle_fila / ms_pickle_dict:.2f}x, "
+          f"json_dumps {ms_json_fila / ms_json_dict:.2f}x")
+    # Objetivo: serializar cada fila más rápido que un diccionario (PENDIENTE en filas.py)
+    pendientes = [nombre for nombre, cociente in (("pickle", ms_pickle_fila / ms_pickle_dict),
+                                                  ("json_dumps", ms_json_fila / ms_json_dict))
+                  if cociente >= 1]
+    if pendientes:
+        print(f"⚠️  NO cumple el objetivo de tiempo por fila menor que dict en: {', '.join(pendientes)}")
+    return memoria_fila < memoria_dict and pickle_fila < pickle_dict
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
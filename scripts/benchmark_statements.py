@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark de las consultas preconstruidas (saltoestudia/consultas.py)
+
+Para las consultas más frecuentes compara, por llamada:
+
+1. DINÁMICA: construir select(...).join(...).where(...) con los valores fijos
+   y ejecutarlo (lo que hacía cada función de database.py).
+2. PRECONSTRUIDA: ejecutar el statement de consultas.py con sus parámetros.
+
+Las dos devuelven las mismas filas (se verifica). La diferencia es el tiempo
+de Python que SQLAlchemy pasa armando la consulta y calculando su clave de
+cache antes de llegar al SQL ya compilado. Corre sobre una base SQLite
+temporal poblada como la de scripts/query_budget.py.
+
+Uso:
+    python scripts/benchmark_statements.py
+    python scripts/benchmark_statements.py --cursos 2000 --repeticiones 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Base temporal y datos sintéticos del presupuesto de queries (configura
+# DATABASE_URL antes de importar saltoestudia)
+from query_budget import CIUDAD_FILTRO, poblar_base
+
+def consultas_comparadas(ejemplo):
+    """Nombre → (construir la consulta dinámica, statement preconstruido, parámetros)."""
+    from sqlalchemy import func
+    from sqlalchemy.orm import joinedload
+    from sqlmodel import select
+
+    from saltoestudia import consultas
+    from saltoestudia.models import CatalogGeneration, Ciudad, Curso, CursoCatalogo, Institucion, Sede, Usuario
+
+    institucion_id, correo = ejemplo["institucion_id"], ejemplo["correo"]
+
+    def tarjetas_por_ciudad():
+        return select(
+            Institucion.id, Institucion.nombre, Institucion.logo,
+            Sede.id, Sede.direccion, Sede.telefono, Sede.email, Sede.web,
+            Ciudad.nombre.label("ciudad_nombre"),
+        ).join(
+            Sede, Institucion.id == Sede.institucion_id
+        ).join(
+            Ciudad, Sede.ciudad_id == Ciudad.id
+        ).where(Ciudad.nombre != "Virtual").where(Ciudad.nombre == CIUDAD_FILTRO)
+
+    def sedes_fisicas_por_institucion():
+        return select(
+            Sede.id, Sede.direccion, Sede.telefono, Sede.email, Sede.web,
+            Ciudad.nombre.label("ciudad_nombre"), Institucion.nombre.label("institucion_nombre"),
+            Sede.institucion_id,
+        ).join(
+            Ciudad, Sede.ciudad_id == Ciudad.id
+        ).join(
+            Institucion, Sede.institucion_id == Institucion.id
+        ).where(Ciudad.nombre != "Virtual").where(
+            Sede.institucion_id == institucion_id
+        ).order_by(Ciudad.nombre)
+
+    def pagina_admin():
+        return select(
+            Curso.id, Curso.nombre, Curso.nivel, Curso.requisitos_ingreso,
+            Curso.duracion_numero, Curso.duracion_unidad, Curso.informacion, Institucion.nombre,
+        ).join(
+            Institucion, Curso.institucion_id == Institucion.id
+        ).where(
+            Curso.institucion_id == institucion_id
+        ).order_by(Curso.nombre.asc(), Curso.id).offset(0).limit(25)
+
+    return {
+        "generación del catálogo": (
+            lambda: select(CatalogGeneration.generation).where(CatalogGeneration.id == 1),
+            consultas.GENERACION_CATALOGO, {},
+        ),
+        "tarjetas de sedes (ciudad)": (
+            tarjetas_por_ciudad, consultas.SEDES_TARJETAS_POR_CIUDAD, {"ciudad_nombre": CIUDAD_FILTRO},
+        ),
+        "sedes físicas de institución": (
+            sedes_fisicas_por_institucion, consultas.SEDES_FISICAS_POR_INSTITUCION,
+            {"institucion_id": institucion_id},
+        ),
+        "usuario por correo": (
+            lambda: select(Usuario).options(joinedload(Usuario.institucion)).where(Usuario.correo == correo),
+            consultas.USUARIO_POR_CORREO, {"correo": correo},
+        ),
+        "total de cursos (admin)": (
+            lambda: select(func.count(Curso.id)).where(Curso.institucion_id == institucion_id),
+            consultas.TOTAL_CURSOS_INSTITUCION, {"institucion_id": institucion_id},
+        ),
+        "página de cursos (admin)": (
+            pagina_admin, consultas.PAGINA_CURSOS_INSTITUCION[("nombre", False)],
+            {"institucion_id": institucion_id, "desde": 0, "por_pagina": 25},
+        ),
+        "cursos cambiados (delta)": (
+            lambda: select(*consultas.COLUMNAS_LECTURA_CATALOGO).where(
+                CursoCatalogo.version > 10 ** 9
+            ).order_by(CursoCatalogo.curso_id),
+            consultas.CATALOGO_CURSOS_CAMBIADOS, {"generacion": 10 ** 9},
+        ),
+    }
+
+def microsegundos_por_llamada(funcion, repeticiones):
+    """Tiempo promedio de funcion() en µs (con una llamada previa de calentamiento)."""
+    funcion()
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) * 1e6 / repeticiones
+
+def filas(resultado):
+    """Filas comparables (los objetos ORM por su id)."""
+    return [getattr(r, "id", r) for r in resultado]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de las consultas preconstruidas")
+    parser.add_argument("--cursos", type=int, default=500)
+    parser.add_argument("--repeticiones", type=int, default=1000)
+    args = parser.parse_args()
+
+    import saltoestudia.state  # noqa: F401  (reflex antes que sqlmodel, ver query_budget.py)
+    from sqlmodel import Session
+
+    from saltoestudia.database import engine
+
+    ejemplo = poblar_base(args.cursos)
+    print(f"📊 Consultas dinámicas vs preconstruidas (base de {args.cursos} cursos, "
+          f"{args.repeticiones} llamadas)")
+    print("=" * 78)
+    print(f"{'consulta':<32} {'dinámica':>12} {'preconstruida':>14} {'ahorro':>14}")
+
+    total_dinamica = total_preconstruida = 0.0
+    with Session(engine) as session:
+        for nombre, (construir, statement, parametros) in consultas_comparadas(ejemplo).items():
+            esperado = filas(session.exec(construir()).all())
+            obtenido = filas(session.exec(statement, params=parametros).all())
+            assert esperado == obtenido, f"{nombre}: la consulta preconstruida no devuelve las mismas filas"
+
+            dinamica = microsegundos_por_llamada(lambda: session.exec(construir()).all(), args.repeticiones)
+            preconstruida = microsegundos_por_llamada(
+                lambda: session.exec(statement, params=parametros).all(), args.repeticiones
+            )
+            total_dinamica += dinamica
+            total_preconstruida += preconstruida
+            print(f"{nombre:<32} {dinamica:>9.1f} µs {preconstruida:>11.1f} µs "
+                  f"{dinamica - preconstruida:>8.1f} µs ({1 - preconstruida / dinamica:.0%})")
+
+    print("-" * 78)
+    print(f"{'total':<32} {total_dinamica:>9.1f} µs {total_preconstruida:>11.1f} µs "
+          f"{total_dinamica - total_preconstruida:>8.1f} µs ({1 - total_preconstruida / total_dinamica:.0%})")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
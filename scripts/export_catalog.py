@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Exportación del catálogo por línea de comandos
+
+Escribe cursos, instituciones o sedes en CSV, JSON o NDJSON usando los mismos
+generadores en streaming que el endpoint /api/export/... (no carga el catálogo
+completo en memoria). El CSV de cursos tiene las columnas que acepta la
+importación masiva de /admin.
+
+Uso:
+    python scripts/export_catalog.py cursos --formato csv -o cursos.csv
+    python scripts/export_catalog.py cursos --formato ndjson --nivel Terciario --lugar Salto
+    python scripts/export_catalog.py sedes --formato json --ciudad Salto
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+def main():
+    from saltoestudia.exportacion import COLUMNAS_EXPORTACION, FORMATOS_EXPORTACION, exportar
+
+    parser = argparse.ArgumentParser(description="Exporta el catálogo de Salto Estudia")
+    parser.add_argument("entidad", choices=list(COLUMNAS_EXPORTACION))
+    parser.add_argument("--formato", choices=list(FORMATOS_EXPORTACION), default="csv")
+    parser.add_argument("-o", "--salida", help="Archivo de salida (por defecto, stdout)")
+    parser.add_argument("--nivel", default="")
+    parser.add_argument("--requisito", default="")
+    parser.add_argument("--institucion", default="")
+    parser.add_argument("--lugar", default="")
+    parser.add_argument("--busqueda", default="")
+    parser.add_argument("--ciudad", default="", help="Solo para sedes")
+    args = parser.parse_args()
+
+    filtros = {
+        "nivel": args.nivel,
+        "requisito": args.requisito,
+        "institucion": args.institucion,
+        "lugar": args.lugar,
+        "busqueda": args.busqueda,
+        "ciudad": args.ciudad,
+    }
+
+    # Los prints de database.py van a stderr para no mezclarse con la exportación
+    with contextlib.redirect_stdout(sys.stderr):
+        contenido = exportar(args.entidad, args.formato, filtros)
+        if args.salida:
+            with open(args.salida, "w", encoding="utf-8", newline="") as archivo:
+                for bloque in contenido:
+                    archivo.write(bloque)
+            print(f"✅ {args.entidad} exportados a {args.salida}")
+        else:
+            for bloque in contenido:
+                sys.__stdout__.write(bloque)
+            sys.__stdout__.flush()
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
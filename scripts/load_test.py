@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga del backend Reflex con usuarios simulados
+
+Lanza N clientes concurrentes que recorren los flujos reales de la app con los
+mismos eventos que manda el navegador (hydrate, on_load_internal y los eventos
+que este devuelve, y los handlers del State con sus argumentos):
+
+- cursos:        entrar a /cursos, filtrar por nivel y lugar, escribir una
+                 búsqueda letra por letra, ordenar y limpiar filtros
+- instituciones: entrar a /instituciones, abrir el diálogo de una sede,
+                 desplegar el acordeón y cerrar el diálogo
+- admin:         iniciar sesión y entrar a /admin (carga de la tabla de cursos)
+
+Cada cliente aplica los deltas que recibe (como el navegador), así los
+argumentos de los eventos salen de datos reales (la sede que se abre, etc.).
+
+MODOS:
+- En proceso (por defecto): procesa los eventos con la app y el state manager
+  configurados (memoria, disco o Redis según rxconfig/REDIS_URL), sin red. Sirve
+  para comparar cambios de escalado contra SQLite o un Postgres local.
+- Socket.IO (--url): se conecta al websocket /_event de un backend corriendo
+  (`reflex run --backend-only`). Requiere el cliente asíncrono de python-socketio
+  (`pip install aiohttp`).
+
+REPORTA: latencia por acción (p50/p95/p99, de enviar el evento a recibir la
+última actualización, incluidos los eventos encadenados), acciones/s y memoria
+del backend (RSS del propio proceso en modo en proceso, o de --pid-backend: el
+PID del worker que atiende el websocket, no el del proceso principal del
+servidor ASGI).
+
+Uso:
+    python scripts/load_test.py --clientes 20 --segundos 30
+    python scripts/load_test.py --mezcla cursos=6,instituciones=3,admin=1
+    python scripts/load_test.py --url http://localhost:8000 --clientes 50 --pid-backend 1234
+
+Credenciales para el flujo admin: LOAD_TEST_CORREO / LOAD_TEST_PASSWORD (por
+defecto, el usuario del seed cenur@cenur.com con CENUR_PASSWORD).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import sys
+import time
+import uuid
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+SUFIJO_VAR = "_rx_state_"
+
+def silencio():
+    """Suprime los prints de depuración de los handlers."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+def percentil(valores, fraccion):
+    """Percentil por rango más cercano (0 si no hay valores)."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(fraccion * len(ordenados)))]
+
+def rss_mb(pid="self"):
+    """Memoria residente actual de un proceso en MB (Linux, /proc)."""
+    try:
+        with open(f"/proc/{pid}/status") as archivo:
+            for linea in archivo:
+                if linea.startswith("VmRSS:"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+# ================================================================================
+# TRANSPORTES: cómo llega un evento al backend
+# ================================================================================
+
+class TransporteEnProceso:
+    """Procesa los eventos con reflex.app.process (mismo camino que el websocket, sin red)."""
+
+    def __init__(self):
+        with silencio():
+            from saltoestudia.saltoestudia import app
+            # Lo que hace `reflex run` al compilar: registrar páginas (on_load) y el state manager
+            app._apply_decorated_pages()
+            app._enable_state()
+        self.app = app
+        print(f"📦 State manager: {type(app.state_manager).__name__}")
+
+    async def conectar(self, token):
+        return None
+
+    async def enviar(self, token, nombre, payload, ruta):
+        """Envía un evento y devuelve las actualizaciones como las recibe el navegador."""
+        from reflex.app import process
+        from reflex.event import Event
+
+        evento = Event(
+            token=token,
+            name=nombre,
+            router_data={"pathname": ruta, "asPath": ruta, "query": {}},
+            payload=payload,
+        )
+        # Ceder el loop: sin red, un cliente nunca se suspendería y acapararía el proceso
+        await asyncio.sleep(0)
+        actualizaciones = []
+        with silencio():
+            async for update in process(self.app, evento, token, {}, "127.0.0.1"):
+                actualizaciones.append(json.loads(update.json()))
+        return actualizaciones
+
+    async def cerrar(self, token):
+        return None
+
+class TransporteSocketIO:
+    """Envía los eventos por el websocket /_event de un backend corriendo."""
+
+    def __init__(self, url, timeout):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.clientes = {}
+
+    async def conectar(self, token):
+        import socketio
+
+        cliente = socketio.AsyncClient(reconnection=False)
+        cola = asyncio.Queue()
+        # Reflex usa /_event como ruta del socket y también como namespace
+        cliente.on("event", cola.put_nowait, namespace="/_event")
+        await cliente.connect(self.url, socketio_path="_event", namespaces=["/_event"], transports=["websocket"])
+        self.clientes[token] = (cliente, cola)
+
+    async def enviar(self, token, nombre, payload, ruta):
+        cliente, cola = self.clientes[token]
+        await cliente.emit("event", {
+            "token": token,
+            "name": nombre,
+            "router_data": {"pathname": ruta, "asPath": ruta, "query": {}},
+            "payload": payload,
+        }, namespace="/_event")
+        actualizaciones = []
+        while True:
+            update = await asyncio.wait_for(cola.get(), self.timeout)
+            if isinstance(update, str):
+                update = json.loads(update)
+            actualizaciones.append(update)
+            if update.get("final", True):
+                return actualizaciones
+
+    async def cerrar(self, token):
+        cliente, _ = self.clientes.pop(token)
+        await cliente.disconnect()
+
+# ================================================================================
+# CLIENTE SIMULADO
+# ================================================================================
+
+class ClienteSimulado:
+    """Un navegador: token propio, ruta actual y copia local de las vars del State."""
+
+    def __init__(self, transporte, metricas, nombres):
+        self.transporte = transporte
+        self.metricas = metricas
+        self.nombres = nombres
+        self.token = str(uuid.uuid4())
+        self.ruta = "/"
+        self.hidratado = False
+        self.vars = {}
+
+    def _aplicar_delta(self, delta):
+        for cambios in delta.values():
+            for var, valor in cambios.items():
+                self.vars[var.removesuffix(SUFIJO_VAR)] = valor
+
+    async def accion(self, etiqueta, handler, payload=None):
+        """Ejecuta un evento y los que encadene; registra la latencia total."""
+        inicio = time.perf_counter()
+        pendientes = [(handler, payload or {})]
+        redireccion = None
+        while pendientes:
+            nombre, argumentos = pendientes.pop(0)
+            for update in await self.transporte.enviar(self.token, nombre, argumentos, self.ruta):
+                self._aplicar_delta(update.get("delta", {}))
+                for evento in update.get("events", []):
+                    if evento["name"] == "_redirect":
+                        redireccion = evento["payload"]["path"]
+                    elif not evento["name"].startswith("_"):
+                        # Eventos de backend encadenados (on_load, set_is_hydrated...)
+                        pendientes.append((evento["name"], evento.get("payload") or {}))
+        self.metricas.registrar(etiqueta, (time.perf_counter() - inicio) * 1000)
+        if redireccion:
+            await self.navegar(redireccion)
+
+    async def navegar(self, ruta):
+        """Cambio de página: hydrate la primera vez y on_load_internal siempre."""
+        self.ruta = ruta
+        if not self.hidratado:
+            await self.accion("hydrate", self.nombres["hydrate"])
+            self.hidratado = True
+        await self.accion(f"cargar {ruta}", self.nombres["on_load"])
+
+    def handler(self, nombre):
+        return f"{self.nombres['state']}.{nombre}"
+
+# === FLUJOS ===
+
+async def flujo_cursos(cliente, azar):
+    from saltoestudia.constants import CursosConstants
+
+    await cliente.navegar("/cursos")
+    await cliente.accion("filtro nivel", cliente.handler("actualizar_nivel_seleccionado"),
+                         {"nivel": azar.choice(CursosConstants.NIVELES)})
+    lugares = cliente.vars.get("opciones_lugar") or ["Salto"]
+    await cliente.accion("filtro lugar", cliente.handler("actualizar_lugar_seleccionado"),
+                         {"lugar": azar.choice(lugares)})
+    # Búsqueda escrita letra por letra (un evento por tecla, como el input)
+    palabra = azar.choice(["tecnico", "licenciatura", "taller", "enfermeria"])
+    for largo in range(1, min(len(palabra), 5) + 1):
+        await cliente.accion("búsqueda (tecla)", cliente.handler("actualizar_busqueda_texto"),
+                             {"texto": palabra[:largo]})
+    await cliente.accion("ordenar", cliente.handler("actualizar_orden_cursos"),
+                         {"columna": azar.choice(["nombre", "duracion", "institucion", "nivel"])})
+    await cliente.accion("limpiar filtros", cliente.handler("limpiar_filtros"))
+
+async def flujo_instituciones(cliente, azar):
+    await cliente.navegar("/instituciones")
+    tarjetas = cliente.vars.get("instituciones_info") or []
+    if not tarjetas:
+        return
+    await cliente.accion("abrir diálogo institución", cliente.handler("open_institution_dialog"),
+                         {"institution": azar.choice(tarjetas)})
+    sedes = [s for s in cliente.vars.get("selected_institution_sedes") or [] if s.get("id") is not None]
+    if sedes:
+        await cliente.accion("acordeón sede", cliente.handler("toggle_sede_acordeon"),
+                             {"sede_id": azar.choice(sedes)["id"]})
+    await cliente.accion("cerrar diálogo", cliente.handler("set_dialog_open"), {"is_open": False})
+
+async def flujo_admin(cliente, azar):
+    correo = os.getenv("LOAD_TEST_CORREO", "cenur@cenur.com")
+    password = os.getenv("LOAD_TEST_PASSWORD", os.getenv("CENUR_PASSWORD", "default_pass"))
+    await cliente.navegar("/login")
+    await cliente.accion("login correo", cliente.handler("set_login_correo"), {"value": correo})
+    await cliente.accion("login password", cliente.handler("set_login_password"), {"value": password})
+    # handle_login redirige a /admin → cargar /admin (cargar_cursos_admin)
+    await cliente.accion("login", cliente.handler("handle_login"))
+    if cliente.vars.get("login_error"):
+        cliente.metricas.errores["login rechazado"] += 1
+        return
+    await cliente.accion("logout", cliente.handler("logout"))
+
+FLUJOS = {
+    "cursos": flujo_cursos,
+    "instituciones": flujo_instituciones,
+    "admin": flujo_admin,
+}
+
+# ================================================================================
+# MÉTRICAS Y EJECUCIÓN
+# ================================================================================
+
+class Metricas:
+    """Latencias por acción (ms) y errores."""
+
+    def __init__(self):
+        self.latencias = defaultdict(list)
+        self.errores = defaultdict(int)
+
+    def registrar(self, etiqueta, ms):
+        self.latencias[etiqueta].append(ms)
+
+async def usuario(transporte, metricas, nombres, mezcla, fin, pausa_ms, semilla):
+    """Un usuario simulado: repite flujos elegidos según la mezcla hasta `fin`."""
+    azar = random.Random(semilla)
+    flujos, pesos = zip(*mezcla.items())
+    cliente = ClienteSimulado(transporte, metricas, nombres)
+    await transporte.conectar(cliente.token)
+    try:
+        while time.perf_counter() < fin:
+            flujo = azar.choices(flujos, weights=pesos)[0]
+            try:
+                await FLUJOS[flujo](cliente, azar)
+            except Exception as e:
+                metricas.errores[f"{flujo}: {type(e).__name__}: {e}"[:120]] += 1
+            if pausa_ms:
+                await asyncio.sleep(azar.uniform(0, pausa_ms) / 1000)
+    finally:
+        await transporte.cerrar(cliente.token)
+
+async def muestrear_memoria(pid, fin, muestras):
+    while time.perf_counter() < fin:
+        muestras.append(rss_mb(pid))
+        await asyncio.sleep(0.5)
+
+async def ejecutar(args, mezcla):
+    from reflex.state import OnLoadInternalState, State as EstadoRaiz
+    from saltoestudia.state import State
+
+    nombres = {
+        "hydrate": f"{EstadoRaiz.get_full_name()}.hydrate",
+        "on_load": f"{OnLoadInternalState.get_full_name()}.on_load_internal",
+        "state": State.get_full_name(),
+    }
+    transporte = TransporteSocketIO(args.url, args.timeout) if args.url else TransporteEnProceso()
+    pid = args.pid_backend or ("self" if not args.url else None)
+
+    metricas = Metricas()
+    memoria = []
+    memoria_inicial = rss_mb(pid) if pid else 0.0
+    inicio = time.perf_counter()
+    fin = inicio + args.segundos
+    tareas = [
+        usuario(transporte, metricas, nombres, mezcla, fin, args.pausa_ms, args.semilla + i)
+        for i in range(args.clientes)
+    ]
+    if pid:
+        tareas.append(muestrear_memoria(pid, fin, memoria))
+    await asyncio.gather(*tareas)
+    duracion = time.perf_counter() - inicio
+    return metricas, duracion, memoria_inicial, memoria
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de Salto Estudia con usuarios simulados")
+    parser.add_argument("--clientes", type=int, default=20)
+    parser.add_argument("--segundos", type=float, default=20.0)
+    parser.add_argument("--mezcla", default="cursos=6,instituciones=3,admin=1",
+                        help="Pesos de cada flujo (cursos, instituciones, admin)")
+    parser.add_argument("--pausa-ms", type=float, default=0.0,
+                        help="Pausa aleatoria máxima entre flujos (tiempo de lectura del usuario)")
+    parser.add_argument("--url", help="Backend corriendo (ej. http://localhost:8000); sin esto, en proceso")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="Segundos máximos de espera por la respuesta de un evento (modo --url)")
+    parser.add_argument("--pid-backend", help="PID del backend para medir su memoria (modo --url)")
+    parser.add_argument("--semilla", type=int, default=1)
+    args = parser.parse_args()
+
+    mezcla = {}
+    for parte in args.mezcla.split(","):
+        flujo, _, peso = parte.partition("=")
+        if flujo.strip() not in FLUJOS:
+            parser.error(f"Flujo desconocido: {flujo} (opciones: {', '.join(FLUJOS)})")
+        mezcla[flujo.strip()] = float(peso or 1)
+
+    print(f"🚀 {args.clientes} clientes durante {args.segundos:.0f}s "
+          f"({'socket.io ' + args.url if args.url else 'en proceso'}) - mezcla {mezcla}")
+    print("=" * 78)
+    metricas, duracion, memoria_inicial, memoria = asyncio.run(ejecutar(args, mezcla))
+
+    total = sum(len(v) for v in metricas.latencias.values())
+    todas = [ms for v in metricas.latencias.values() for ms in v]
+    print(f"{'acción':32} {'n':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'máx ms':>9}")
+    for etiqueta, valores in sorted(metricas.latencias.items(), key=lambda item: -percentil(item[1], 0.95)):
+        print(f"{etiqueta[:32]:32} {len(valores):7} {percentil(valores, 0.5):9.1f} "
+              f"{percentil(valores, 0.95):9.1f} {percentil(valores, 0.99):9.1f} {max(valores):9.1f}")
+    print("-" * 78)
+    print(f"{'TOTAL':32} {total:7} {percentil(todas, 0.5):9.1f} "
+          f"{percentil(todas, 0.95):9.1f} {percentil(todas, 0.99):9.1f} {max(todas, default=0):9.1f}")
+
+    print(f"\n⚡ Throughput: {total / duracion:.1f} acciones/s")
+    if memoria:
+        print(f"🧠 Memoria del backend: inicio {memoria_inicial:.1f} MB, "
+              f"pico {max(memoria):.1f} MB, final {memoria[-1]:.1f} MB")
+    if not args.url:
+        print(f"🧠 Pico de RSS del proceso: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+    if metricas.errores:
+        print("\n❌ Errores:")
+        for error, cantidad in sorted(metricas.errores.items(), key=lambda item: -item[1]):
+            print(f"   {cantidad:5} × {error}")
+    return not metricas.errores
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
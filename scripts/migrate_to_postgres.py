@@ -149,7 +149,8 @@ def main():
         'sedes',
         'usuarios',
         'curso',
-        'curso_ciudad'
+        'curso_ciudad',
+        'curso_catalogo'
     ]
     
     print("\n📋 Tablas a migrar:")
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Presupuesto de queries por función (detector de N+1)
+
+Cuenta las sentencias SQL que ejecuta cada función obtener_* de database.py y
+cada handler on_load de las páginas, con los caches del proceso vacíos (el
+peor caso: primera visita o generación del catálogo nueva), sobre bases
+sintéticas de distintos tamaños. Falla si:
+
+1. PRESUPUESTO: una función ejecuta más sentencias que las de PRESUPUESTOS.
+2. ESCALADO: una función ejecuta más sentencias en la base grande que en la
+   chica. Una cantidad de queries que crece con las filas es un N+1 aunque
+   todavía entre en el presupuesto.
+
+Usa una base SQLite temporal (no toca data/saltoestudia.db). Si una función
+nueva o un cambio necesita otra cantidad de queries, actualizar PRESUPUESTOS
+en el mismo commit, explicando por qué.
+
+Uso:
+    python scripts/query_budget.py
+    python scripts/query_budget.py --tamanos 10 100 1000 --verbose
+
+Dentro de otro script, para medir un bloque:
+    with contar_queries() as contador:
+        obtener_cursos()
+    print(contador.total, contador.sentencias)
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import os
+import random
+import sys
+import tempfile
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Base temporal ANTES de importar saltoestudia: el engine se crea al importar
+_DIRECTORIO_TEMPORAL = tempfile.mkdtemp(prefix="query_budget_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DIRECTORIO_TEMPORAL, 'presupuesto.db')}"
+os.environ.pop("DATABASE_READ_URL", None)
+os.environ["REGISTRAR_QUERIES_LENTAS"] = "false"
+
+CIUDADES = ["Salto", "Paysandú", "Artigas", "Rivera", "Tacuarembó", "Virtual"]
+CIUDAD_FILTRO = "Salto"
+
+# === PRESUPUESTOS (sentencias con caches vacíos) ===
+# Incluyen la lectura de la generación del catálogo que hacen las funciones
+# cacheadas al validar su cache.
+PRESUPUESTOS = {
+    "obtener_generacion_catalogo": 1,
+    "obtener_instituciones": 1,
+    "obtener_instituciones_con_sedes_por_ciudad": 2,
+    "obtener_instituciones_con_sedes_por_ciudad(Salto)": 2,
+    "obtener_instituciones_nombres": 2,
+    "obtener_cursos": 2,
+    "obtener_cursos_catalogo": 2,
+    "obtener_cursos_por_institucion": 3,
+    "obtener_pagina_cursos_institucion": 3,
+    "obtener_niveles": 0,
+    "obtener_requisitos": 0,
+    "obtener_ciudades_nombres": 2,
+    "obtener_nombre_institucion_por_id": 1,
+    "obtener_usuario_por_correo": 1,
+    "obtener_sedes_como_tarjetas": 2,
+    "obtener_sedes_como_tarjetas(Salto)": 2,
+    "obtener_instituciones_con_cursos_virtuales": 2,
+    "obtener_sedes_fisicas_indexadas": 2,
+    "obtener_sedes_fisicas_por_institucion": 2,
+    "obtener_sedes_fisicas_por_institucion(primaria)": 1,
+    "obtener_ciudades_sedes_institucion": 1,
+    "obtener_o_crear_ciudad_id": 1,
+    # Handlers on_load de las páginas
+    "/cursos: cargar_datos_cursos_page": 4,
+    "/instituciones: cargar_datos_instituciones_page": 4,
+    "/admin: cargar_cursos_admin": 3,
+    "/admin/sedes: cargar_sedes_admin": 1,
+}
+
+def silencio():
+    """Suprime los prints de depuración de las funciones medidas."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+# ================================================================================
+# CONTADOR DE SENTENCIAS
+# ================================================================================
+
+class ContadorQueries:
+    """Sentencias ejecutadas dentro de un bloque contar_queries()."""
+
+    def __init__(self):
+        self.sentencias = []
+
+    @property
+    def total(self) -> int:
+        return len(self.sentencias)
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        self.sentencias.append(" ".join(statement.split()))
+
+@contextmanager
+def contar_queries(*engines):
+    """
+    Cuenta las sentencias ejecutadas en `engines` dentro del bloque.
+
+    Sin argumentos cuenta en el engine primario y en los de lectura (réplica
+    o lectores SQLite de solo lectura). Un executemany cuenta como una sentencia (es un round-trip).
+
+    Uso:
+        with contar_queries() as contador:
+            obtener_cursos()
+        assert contador.total <= 2
+    """
+    from sqlalchemy import event
+
+    from saltoestudia.database import engine, read_engine, sqlite_read_engine
+
+    if not engines:
+        engines = tuple(e for e in (engine, read_engine, sqlite_read_engine) if e is not None)
+    contador = ContadorQueries()
+    for e in engines:
+        event.listen(e, "before_cursor_execute", contador._registrar)
+    try:
+        yield contador
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", contador._registrar)
+
+# ================================================================================
+# DATOS SINTÉTICOS
+# ================================================================================
+
+def poblar_base(cursos: int, semilla: int = 1):
+    """
+    Recrea la base temporal con `cursos` cursos y datos proporcionales.
+
+    √cursos instituciones (con su admin), así crecen tanto las instituciones
+    como los cursos de cada una; una o dos sedes físicas por institución, y
+    cada curso en una o dos ciudades ("Virtual" incluida).
+
+    Returns:
+        Dict: IDs y correo de una institución de ejemplo para las funciones con argumentos
+    """
+    from sqlalchemy import insert
+    from sqlmodel import SQLModel
+
+    from saltoestudia import database as db
+    from saltoestudia.constants import CursosConstants
+    from saltoestudia.models import Ciudad, Curso, CursoCiudadLink, Institucion, Sede, Usuario
+
+    azar = random.Random(semilla)
+    SQLModel.metadata.drop_all(db.engine)
+    SQLModel.metadata.create_all(db.engine)
+
+    instituciones = max(2, math.isqrt(cursos))
+    with db.engine.begin() as conn:
+        conn.execute(insert(Ciudad.__table__), [
+            {"id": i, "nombre": nombre} for i, nombre in enumerate(CIUDADES, start=1)
+        ])
+        conn.execute(insert(Institucion.__table__), [
+            {"id": i, "nombre": f"Institución {i}", "logo": f"/logos/logo-{i}.png"}
+            for i in range(1, instituciones + 1)
+        ])
+        conn.execute(insert(Usuario.__table__), [
+            {"correo": f"admin{i}@presupuesto.local", "password_hash": "x", "institucion_id": i}
+            for i in range(1, instituciones + 1)
+        ])
+        sedes = []
+        for i in range(1, instituciones + 1):
+            # Ciudades físicas (sin "Virtual"); la institución 1 siempre está en Salto
+            fisicas = [1] if i == 1 else []
+            fisicas += azar.sample(range(1, len(CIUDADES)), azar.randint(1, 2))
+            for ciudad_id in sorted(set(fisicas)):
+                sedes.append({
+                    "institucion_id": i, "ciudad_id": ciudad_id,
+                    "direccion": f"Calle {i} {ciudad_id}", "telefono": "000",
+                    "email": f"sede{i}@presupuesto.local", "web": None, "version": 0,
+                })
+        conn.execute(insert(Sede.__table__), sedes)
+        conn.execute(insert(Curso.__table__), [
+            {
+                "id": c,
+                "nombre": f"Curso {c}",
+                "nivel": azar.choice(CursosConstants.NIVELES),
+                "requisitos_ingreso": azar.choice(CursosConstants.REQUISITOS_INGRESO),
+                "duracion_numero": str(azar.randint(1, 6)),
+                "duracion_unidad": azar.choice(["meses", "años"]),
+                "informacion": f"Información del curso {c}",
+                "institucion_id": 1 + (c - 1) % instituciones,
+                "version": 0,
+            }
+            for c in range(1, cursos + 1)
+        ])
+        conn.execute(insert(CursoCiudadLink.__table__), [
+            {"curso_id": c, "ciudad_id": ciudad_id}
+            for c in range(1, cursos + 1)
+            for ciudad_id in azar.sample(range(1, len(CIUDADES) + 1), azar.randint(1, 2))
+        ])
+
+    with silencio():
+        db.reconstruir_curso_catalogo()
+    return {"institucion_id": 1, "correo": "admin1@presupuesto.local"}
+
+def vaciar_caches():
+    """Deja el proceso como recién arrancado: sin catálogo, generación ni directorio cacheados."""
+    from saltoestudia import database as db
+
+    db.cache_directorio.invalidar()
+    db._generacion_leida_en = float("-inf")
+    db._catalogo_cursos_generacion = -1
+    db._ciudad_ids_por_nombre.clear()
+
+# ================================================================================
+# FUNCIONES MEDIDAS
+# ================================================================================
+
+def nuevo_estado(ejemplo=None):
+    """State de una sesión nueva (admin logueado si se pasa `ejemplo`)."""
+    from saltoestudia.state import State, User
+
+    state = State(_reflex_internal_init=True)
+    if ejemplo is not None:
+        state.logged_in_user = User(
+            id=1, correo=ejemplo["correo"],
+            institucion_id=ejemplo["institucion_id"], institucion_nombre="Institución 1",
+        )
+    return state
+
+def ejecutar_handler(state, handler):
+    """Ejecuta un handler del State por nombre, como lo haría un on_load."""
+    getattr(type(state), handler).fn(state)
+
+def funciones_medidas(ejemplo):
+    """Nombre → función sin argumentos para cada entrada de PRESUPUESTOS."""
+    from sqlmodel import Session
+
+    from saltoestudia import database as db
+
+    institucion_id, correo = ejemplo["institucion_id"], ejemplo["correo"]
+
+    def crear_ciudad_existente():
+        with Session(db.engine) as session:
+            return db.obtener_o_crear_ciudad_id(session, CIUDAD_FILTRO)
+
+    return {
+        "obtener_generacion_catalogo": db.obtener_generacion_catalogo,
+        "obtener_instituciones": db.obtener_instituciones,
+        "obtener_instituciones_con_sedes_por_ciudad": lambda: db.obtener_instituciones_con_sedes_por_ciudad(),
+        "obtener_instituciones_con_sedes_por_ciudad(Salto)": lambda: db.obtener_instituciones_con_sedes_por_ciudad(CIUDAD_FILTRO),
+        "obtener_instituciones_nombres": db.obtener_instituciones_nombres,
+        "obtener_cursos": db.obtener_cursos,
+        "obtener_cursos_catalogo": db.obtener_cursos_catalogo,
+        "obtener_cursos_por_institucion": lambda: db.obtener_cursos_por_institucion(institucion_id),
+        "obtener_pagina_cursos_institucion": lambda: db.obtener_pagina_cursos_institucion(institucion_id),
+        "obtener_niveles": db.obtener_niveles,
+        "obtener_requisitos": db.obtener_requisitos,
+        "obtener_ciudades_nombres": db.obtener_ciudades_nombres,
+        "obtener_nombre_institucion_por_id": lambda: db.obtener_nombre_institucion_por_id(institucion_id),
+        "obtener_usuario_por_correo": lambda: db.obtener_usuario_por_correo(correo),
+        "obtener_sedes_como_tarjetas": lambda: db.obtener_sedes_como_tarjetas(),
+        "obtener_sedes_como_tarjetas(Salto)": lambda: db.obtener_sedes_como_tarjetas(CIUDAD_FILTRO),
+        "obtener_instituciones_con_cursos_virtuales": db.obtener_instituciones_con_cursos_virtuales,
+        "obtener_sedes_fisicas_indexadas": db.obtener_sedes_fisicas_indexadas,
+        "obtener_sedes_fisicas_por_institucion": lambda: db.obtener_sedes_fisicas_por_institucion(institucion_id),
+        "obtener_sedes_fisicas_por_institucion(primaria)": lambda: db.obtener_sedes_fisicas_por_institucion(institucion_id, usar_primaria=True),
+        "obtener_ciudades_sedes_institucion": lambda: db.obtener_ciudades_sedes_institucion(institucion_id),
+        "obtener_o_crear_ciudad_id": crear_ciudad_existente,
+        "/cursos: cargar_datos_cursos_page": lambda: ejecutar_handler(nuevo_estado(), "cargar_datos_cursos_page"),
+        "/instituciones: cargar_datos_instituciones_page": lambda: ejecutar_handler(nuevo_estado(), "cargar_datos_instituciones_page"),
+        "/admin: cargar_cursos_admin": lambda: ejecutar_handler(nuevo_estado(ejemplo), "cargar_cursos_admin"),
+        "/admin/sedes: cargar_sedes_admin": lambda: ejecutar_handler(nuevo_estado(ejemplo), "cargar_sedes_admin"),
+    }
+
+def medir(funciones):
+    """Ejecuta cada función con los caches vacíos y devuelve nombre → ContadorQueries."""
+    resultados = {}
+    for nombre, funcion in funciones.items():
+        vaciar_caches()
+        with silencio(), contar_queries() as contador:
+            funcion()
+        resultados[nombre] = contador
+    return resultados
+
+def sentencias_repetidas(contador, limite=3):
+    """Las sentencias que más se repiten (la firma de un N+1)."""
+    veces = {}
+    for sentencia in contador.sentencias:
+        veces[sentencia] = veces.get(sentencia, 0) + 1
+    return sorted(((n, s) for s, n in veces.items() if n > 1), reverse=True)[:limite]
+
+def main():
+    parser = argparse.ArgumentParser(description="Presupuesto de queries por función (detector de N+1)")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[20, 200, 2000],
+                        help="Cantidad de cursos de cada base sintética")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar las sentencias de cada función")
+    args = parser.parse_args()
+    tamanos = sorted(set(args.tamanos))
+
+    # Reflex primero: su Model necesita que reflex cargue antes que la app importe sqlmodel
+    import saltoestudia.state  # noqa: F401
+
+    conteos = {}  # nombre → {tamaño: total}
+    detalle = {}  # nombre → ContadorQueries de la base más grande
+    for tamano in tamanos:
+        ejemplo = poblar_base(tamano)
+        for nombre, contador in medir(funciones_medidas(ejemplo)).items():
+            conteos.setdefault(nombre, {})[tamano] = contador.total
+            detalle[nombre] = contador
+
+    print(f"📊 Queries por función con caches vacíos (bases de {', '.join(map(str, tamanos))} cursos)")
+    print("=" * 78)
+    print(f"{'función':<52} {'presupuesto':>11}  conteos")
+    fallas = []
+    for nombre, por_tamano in conteos.items():
+        presupuesto = PRESUPUESTOS.get(nombre)
+        valores = [por_tamano[t] for t in tamanos]
+        problemas = []
+        if presupuesto is None:
+            problemas.append("sin presupuesto en PRESUPUESTOS")
+        elif max(valores) > presupuesto:
+            problemas.append(f"excede el presupuesto ({max(valores)} > {presupuesto})")
+        if valores[-1] > valores[0]:
+            problemas.append(f"crece con las filas ({valores[0]} → {valores[-1]})")
+        estado = "❌" if problemas else "✅"
+        print(f"{estado} {nombre:<50} {presupuesto if presupuesto is not None else '-':>11}  "
+              f"{' / '.join(map(str, valores))}")
+        if problemas:
+            fallas.append((nombre, problemas))
+        if args.verbose or problemas:
+            for n, sentencia in sentencias_repetidas(detalle[nombre]):
+                print(f"     {n}x {sentencia[:110]}")
+        if args.verbose:
+            for sentencia in detalle[nombre].sentencias:
+                print(f"     · {sentencia[:110]}")
+
+    for nombre in PRESUPUESTOS.keys() - conteos.keys():
+        fallas.append((nombre, ["tiene presupuesto pero no se mide"]))
+
+    if fallas:
+        print(f"\n❌ {len(fallas)} función(es) fuera de presupuesto:")
+        for nombre, problemas in fallas:
+            print(f"   - {nombre}: {'; '.join(problemas)}")
+        return False
+    print(f"\n✅ {len(conteos)} funciones dentro de presupuesto y sin crecer con las filas")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Reconstrucción del modelo de lectura curso_catalogo
+
+curso_catalogo (una fila por curso con institución, ciudades y texto de
+búsqueda ya resueltos) se mantiene solo con las escrituras de la aplicación.
+Este script lo regenera completo desde las tablas normalizadas, por ejemplo
+después de cambiar a mano el nombre o el logo de una institución, de cargar
+cursos por SQL o de restaurar un backup.
+
+La reconstrucción es una sola transacción e incrementa la generación del
+catálogo, así los workers en ejecución recargan su catálogo compartido.
+
+Uso:
+    python scripts/rebuild_catalog.py
+    docker compose exec app python scripts/rebuild_catalog.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+def main():
+    from saltoestudia.database import reconstruir_curso_catalogo
+
+    try:
+        cursos = reconstruir_curso_catalogo()
+    except Exception as e:
+        print(f"❌ Error al reconstruir curso_catalogo: {e}")
+        return False
+    print(f"✅ curso_catalogo reconstruido: {cursos} cursos")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Verificación del modo multi-worker (escalado horizontal)
+
+Comprueba las dos condiciones que necesita el backend para correr con varios
+workers, el estado en Redis y sin sticky sessions:
+
+1. TAMAÑO DEL ESTADO: serializa el State de una sesión típica (página /cursos
+   cargada, con y sin filtros, admin logueado) y lo compara con un presupuesto.
+   Es exactamente el blob que Reflex guarda en Redis en cada evento. Falla si
+   el catálogo está vacío (sin base poblada el tamaño medido no sirve).
+2. ESTADO COMPARTIDO: 1..N procesos atienden eventos de LAS MISMAS sesiones a
+   través de StateManagerRedis (el state manager que usa Reflex con
+   REDIS_URL), sobre un único almacén: cada evento toma el lock de la sesión,
+   lee el estado, ejecuta el handler y lo guarda. Cada worker recorre todas
+   las sesiones, así que eventos consecutivos de una sesión caen en workers
+   distintos. Se verifica:
+   - que cada evento ve el resultado del evento anterior de su sesión, aunque
+     lo haya procesado otro worker
+   - que no se pierden actualizaciones: el contador de eventos guardado por
+     sesión coincide con los eventos que procesaron los workers
+   y se reporta eventos/s y eficiencia respecto de un worker.
+
+El almacén es el Redis de REDIS_URL si está definida (usar una base de
+pruebas: se escriben y borran claves propias). Si no, se levanta un servidor
+fakeredis local por TCP (pip install fakeredis). Con fakeredis el servidor
+es un único proceso Python (mucho más lento que Redis) y limita el escalado:
+la eficiencia se informa pero solo se exige contra un Redis real.
+
+Uso:
+    python scripts/verify_multiworker.py
+    python scripts/verify_multiworker.py --workers 4 --segundos 5 --max-kb 200
+    REDIS_URL=redis://localhost:6379/15 python scripts/verify_multiworker.py
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+from saltoestudia.state import State
+
+# Flujo de eventos de un usuario en /cursos: (handler, argumento, var, valor
+# esperado en el estado después del evento)
+FLUJO_EVENTOS = [
+    ("actualizar_nivel_seleccionado", "Universitario", "nivel_seleccionado", "Universitario"),
+    ("actualizar_lugar_seleccionado", "Salto", "lugar_seleccionado", "Salto"),
+    ("actualizar_busqueda_texto", "tec", "busqueda_texto", "tec"),
+    ("actualizar_requisito_seleccionado", "Bachillerato", "requisito_seleccionado", "Bachillerato"),
+    ("limpiar_filtros", None, "nivel_seleccionado", ""),
+]
+
+class VerificacionMultiworker(State):
+    """Substate de la verificación: cuenta los eventos procesados por sesión."""
+    eventos: int = 0
+
+def silencio():
+    """Suprime los prints de depuración de los handlers."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+def nuevo_estado():
+    """Crea un State fuera de la app Reflex, como lo haría el state manager."""
+    return State(_reflex_internal_init=True)
+
+def ejecutar_evento(state, handler, argumento):
+    """Ejecuta un handler del State por nombre."""
+    funcion = getattr(type(state), handler).fn
+    if argumento is None:
+        funcion(state)
+    else:
+        funcion(state, argumento)
+
+def medir_tamanos():
+    """Mide el estado serializado en los escenarios típicos de una sesión."""
+    from saltoestudia.state import User
+
+    tamanos = {}
+    state = nuevo_estado()
+    tamanos["sesión nueva"] = len(state._serialize())
+
+    with silencio():
+        ejecutar_evento(state, "cargar_datos_cursos_page", None)
+    total_cursos = len(state.cursos)
+    tamanos[f"/cursos sin filtros ({total_cursos} cursos)"] = len(state._serialize())
+
+    with silencio():
+        ejecutar_evento(state, "actualizar_nivel_seleccionado", "Universitario")
+    tamanos[f"/cursos filtrado ({len(state.cursos)} cursos)"] = len(state._serialize())
+
+    with silencio():
+        state.logged_in_user = User(id=1, correo="admin@local", institucion_id=1, institucion_nombre="Admin")
+        state.user_authenticated = True
+        ejecutar_evento(state, "cargar_cursos_admin", None)
+    tamanos[f"admin logueado ({len(state.admin_cursos)} cursos propios)"] = len(state._serialize())
+
+    # El blob debe poder reconstruirse (lo que hace cada worker al recibir un evento)
+    restaurado = State._deserialize(state._serialize())
+    assert len(restaurado.cursos) == len(state.cursos), "El estado no sobrevive el round-trip"
+    return tamanos, total_cursos
+
+# ================================================================================
+# ALMACÉN COMPARTIDO
+# ================================================================================
+
+def servir_fakeredis(conexion):
+    """Proceso del servidor fakeredis: informa el puerto y atiende hasta que lo terminen."""
+    from fakeredis import TcpFakeServer
+
+    servidor = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    # Responde cada elemento con un write aparte: sin TCP_NODELAY cada
+    # pipeline espera el ACK retrasado (~40 ms), cosa que Redis no hace
+    servidor.RequestHandlerClass.disable_nagle_algorithm = True
+    conexion.send(servidor.server_address[1])
+    servidor.serve_forever()
+
+@contextlib.contextmanager
+def almacen_compartido():
+    """
+    URL del Redis que comparten todos los workers.
+
+    El servidor fakeredis corre en su propio proceso (con su propio GIL), como
+    un Redis aparte de los workers.
+
+    Yields:
+        (url, descripción, es_redis_real) o None si no hay Redis ni fakeredis
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        yield redis_url, f"Redis de REDIS_URL ({redis_url})", True
+        return
+    try:
+        import fakeredis  # noqa: F401
+    except ImportError:
+        yield None
+        return
+    recibir, enviar = multiprocessing.Pipe(duplex=False)
+    servidor = multiprocessing.get_context("fork").Process(target=servir_fakeredis, args=(enviar,), daemon=True)
+    servidor.start()
+    try:
+        url = f"redis://127.0.0.1:{recibir.recv()}/0"
+        yield url, f"fakeredis local ({url})", False
+    finally:
+        servidor.terminate()
+        servidor.join()
+
+def state_manager(redis_url):
+    """StateManagerRedis del State de la app sobre `redis_url` (como Reflex con REDIS_URL)."""
+    from redis.asyncio import Redis
+    from reflex.istate.manager import StateManagerRedis
+
+    return StateManagerRedis(state=State.get_root_state(), redis=Redis.from_url(redis_url))
+
+def clave_sesion(token):
+    """Clave de la sesión en el state manager ({token}_{substate})."""
+    from reflex.state import _substate_key
+
+    return _substate_key(token, VerificacionMultiworker)
+
+def estados_de(raiz):
+    """State de la app y substate de verificación dentro del árbol de una sesión."""
+    return (
+        raiz.get_substate(State.get_full_name().split(".")),
+        raiz.get_substate(VerificacionMultiworker.get_full_name().split(".")),
+    )
+
+async def preparar_sesiones(redis_url, tokens):
+    """Carga /cursos en cada sesión y la guarda en el almacén."""
+    manager = state_manager(redis_url)
+    try:
+        for token in tokens:
+            async with manager.modify_state(clave_sesion(token)) as raiz:
+                state, _ = estados_de(raiz)
+                with silencio():
+                    ejecutar_evento(state, "cargar_datos_cursos_page", None)
+    finally:
+        await manager.close()
+
+async def eventos_guardados(redis_url, tokens):
+    """Contador de eventos guardado por sesión y estado final."""
+    manager = state_manager(redis_url)
+    try:
+        guardados = {}
+        for token in tokens:
+            _, verificacion = estados_de(await manager.get_state(clave_sesion(token)))
+            guardados[token] = verificacion.eventos
+        return guardados
+    finally:
+        await manager.close()
+
+async def borrar_sesiones(redis_url, tokens):
+    """Borra las claves de las sesiones de la verificación."""
+    from redis.asyncio import Redis
+
+    cliente = Redis.from_url(redis_url)
+    try:
+        for token in tokens:
+            claves = [clave async for clave in cliente.scan_iter(match=f"{token}_*")]
+            if claves:
+                await cliente.delete(*claves)
+    finally:
+        await cliente.aclose()
+
+# ================================================================================
+# WORKERS
+# ================================================================================
+
+async def procesar_eventos(redis_url, tokens, segundos, desfase):
+    """Procesa eventos recorriendo todas las sesiones durante `segundos`."""
+    manager = state_manager(redis_url)
+    procesados = Counter()
+    inconsistencias = 0
+    fin = time.perf_counter() + segundos
+    i = desfase  # Cada worker arranca en otra sesión
+    try:
+        with silencio():
+            while time.perf_counter() < fin:
+                token = tokens[i % len(tokens)]
+                i += 1
+                async with manager.modify_state(clave_sesion(token)) as raiz:
+                    state, verificacion = estados_de(raiz)
+                    paso = verificacion.eventos % len(FLUJO_EVENTOS)
+                    # El estado tiene que reflejar el evento anterior de esta
+                    # sesión, lo haya procesado este worker u otro
+                    if verificacion.eventos:
+                        _, _, var, esperado = FLUJO_EVENTOS[paso - 1]
+                        if getattr(state, var) != esperado:
+                            inconsistencias += 1
+                    handler, argumento, _, _ = FLUJO_EVENTOS[paso]
+                    ejecutar_evento(state, handler, argumento)
+                    verificacion.eventos += 1
+                procesados[token] += 1
+    finally:
+        await manager.close()
+    return procesados, inconsistencias
+
+def worker_eventos(parametros):
+    """Proceso worker: devuelve (eventos por sesión, inconsistencias vistas)."""
+    from saltoestudia.database import engine
+
+    # Conexiones heredadas del proceso padre: cada worker abre las suyas
+    engine.dispose(close=False)
+    return asyncio.run(procesar_eventos(*parametros))
+
+def medir_escalado(redis_url, max_workers, sesiones, segundos):
+    """
+    Mide eventos/s con 1..max_workers procesos sobre las mismas sesiones.
+
+    Returns:
+        Dict: workers → (eventos/s, eventos perdidos, inconsistencias)
+    """
+    # fork: los workers heredan VerificacionMultiworker con el mismo nombre de substate
+    contexto = multiprocessing.get_context("fork")
+    resultados = {}
+    for workers in sorted({1, *range(2, max_workers + 1)}):
+        tokens = [f"verify-multiworker-{uuid.uuid4().hex}" for _ in range(sesiones)]
+        asyncio.run(preparar_sesiones(redis_url, tokens))
+        parametros = [(redis_url, tokens, segundos, w * sesiones // workers) for w in range(workers)]
+        with contexto.Pool(workers) as pool:
+            por_worker = pool.map(worker_eventos, parametros)
+
+        procesados = sum((p for p, _ in por_worker), Counter())
+        inconsistencias = sum(i for _, i in por_worker)
+        guardados = asyncio.run(eventos_guardados(redis_url, tokens))
+        perdidos = sum(procesados[t] - guardados[t] for t in tokens)
+        asyncio.run(borrar_sesiones(redis_url, tokens))
+        resultados[workers] = (sum(procesados.values()) / segundos, perdidos, inconsistencias)
+    return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica el modo multi-worker de Salto Estudia")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--sesiones", type=int, default=8,
+                        help="Sesiones compartidas por todos los workers")
+    parser.add_argument("--segundos", type=float, default=3.0)
+    parser.add_argument("--max-kb", type=float, default=float(os.getenv("REFLEX_STATE_SIZE_LIMIT", "1000")),
+                        help="Presupuesto de estado serializado por sesión (KB)")
+    parser.add_argument("--eficiencia-minima", type=float, default=0.7,
+                        help="Eficiencia mínima de escalado respecto de 1 worker (0-1, solo con Redis real)")
+    args = parser.parse_args()
+
+    ok = True
+    print("🔍 Verificando modo multi-worker...")
+    print("=" * 50)
+
+    print("\n📦 Tamaño del estado serializado por sesión:")
+    tamanos, total_cursos = medir_tamanos()
+    for escenario, tamano in tamanos.items():
+        dentro = tamano / 1024 <= args.max_kb
+        ok = ok and dentro
+        print(f"{'✅' if dentro else '❌'} {escenario:45} {tamano / 1024:8.1f} KB")
+    if not total_cursos:
+        ok = False
+        print("❌ El catálogo está vacío: el tamaño medido no representa una sesión real "
+              "(¿base sin poblar? python seed.py)")
+
+    with almacen_compartido() as almacen:
+        if almacen is None:
+            print("\n❌ Sin almacén compartido: definir REDIS_URL o instalar fakeredis (pip install fakeredis)")
+            return False
+        redis_url, descripcion, es_redis_real = almacen
+
+        print(f"\n⚡ Eventos de {args.sesiones} sesiones compartidas entre workers "
+              f"({args.segundos:.0f}s por medición)")
+        print(f"   Almacén: {descripcion}")
+        resultados = medir_escalado(redis_url, args.workers, args.sesiones, args.segundos)
+
+    base = resultados[1][0]
+    for workers, (eventos_s, perdidos, inconsistencias) in resultados.items():
+        eficiencia = eventos_s / (base * workers) if base else 0
+        consistente = perdidos == 0 and inconsistencias == 0 and eventos_s > 0
+        sin_cpus = workers > (os.cpu_count() or 1)
+        escala = eficiencia >= args.eficiencia_minima or sin_cpus
+        ok = ok and consistente and (escala or not es_redis_real)
+        marca = "❌" if not consistente else "✅" if escala else "❌" if es_redis_real else "⚠️"
+        print(f"{marca} {workers} worker(s): {eventos_s:10.0f} eventos/s  (eficiencia {eficiencia:.0%}, "
+              f"{perdidos} eventos perdidos, {inconsistencias} estados inconsistentes)"
+              + ("  [más workers que CPUs]" if sin_cpus else ""))
+    if not es_redis_real:
+        print("   La eficiencia con fakeredis no se exige: el servidor es un único proceso Python")
+
+    print("\n" + "=" * 50)
+    if ok:
+        print("🎉 El estado y los handlers están listos para varios workers")
+    else:
+        print("⚠️ Revisa los valores marcados con ❌")
+    return ok
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -32,7 +32,7 @@ import bcrypt
 import os
 from sqlmodel import create_engine, Session, select
 from saltoestudia.models import Institucion, Usuario, Curso, Ciudad, CursoCiudadLink, Sede
-from saltoestudia.database import engine
+from saltoestudia.database import engine, reconstruir_curso_catalogo
 
 # ================================================================================
 # FUNCIONES UTILITARIAS DE SEGURIDAD
@@ -94,7 +94,8 @@ def seed_database():
     2. Insertar instituciones educativas de Salto
     3. Crear usuarios administradores con contraseñas individuales
     4. Cargar cursos de ejemplo para cada institución
-    5. Mostrar resumen de seguridad y recomendaciones
+    5. Reconstruir curso_catalogo (modelo de lectura del catálogo público)
+    6. Mostrar resumen de seguridad y recomendaciones
     
     DATOS CARGADOS:
     - 5 instituciones reales de Salto, Uruguay
@@ -598,6 +599,9 @@ def seed_database():
                 print(f"   ✅ {curso.nombre} ({', '.join(ciudades_final)})")
             session.commit()
             
+            # Los cursos se insertan directo con el ORM: regenerar el modelo de lectura
+            reconstruir_curso_catalogo()
+            
             print("\n🎉 ¡Base de datos poblada exitosamente!")
             print(f"📊 Se crearon {len(instituciones_data)} instituciones, {len(usuarios_insertados)} usuarios y {len(cursos_data)} cursos.")
             